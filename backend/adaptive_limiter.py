@@ -0,0 +1,394 @@
+"""
+Adaptive (AIMD) concurrency control and retries for agent LLM calls.
+
+AdaptiveLimiter caps how many chat completions are in flight and tunes the
+cap itself, the way TCP tunes its congestion window:
+- additive increase: every success of a call that started with the limit
+  (nearly) full raises it by 1/limit, so it grows by about one slot per
+  limit's worth of such calls; calls that found spare slots prove nothing
+  about a higher limit and leave it alone (TCP's cwnd-limited check)
+- multiplicative decrease: a 429 or 5xx multiplies it by backoff_factor
+  (at most once per round of in-flight calls, so one burst of 429s counts
+  as one signal)
+
+A Retry-After header on a 429/5xx holds back every new call until it has
+passed. Transient failures (429, 5xx, timeouts, dropped connections) are
+retried with jittered exponential backoff; other errors are raised at once.
+
+One limiter is shared by every agent in the process (see
+get_adaptive_limiter()), since they draw from the same account limits. It
+works from threads and from coroutines on any event loop.
+
+Usage:
+    limiter = get_adaptive_limiter()
+    response = limiter.call(lambda: client.chat.completions.create(...), stage="scriptwriter")
+    response = await limiter.acall(lambda: aclient.chat.completions.create(...), stage="scriptwriter")
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Callable, Awaitable, NamedTuple, Tuple, TypeVar
+
+import openai
+
+from metrics import get_metrics
+
+T = TypeVar("T")
+
+# Starting and bounding values for the in-flight limit
+DEFAULT_INITIAL_LIMIT = float(os.getenv("GLIMPSE_LLM_CONCURRENCY", "4"))
+DEFAULT_MIN_LIMIT = 1.0
+DEFAULT_MAX_LIMIT = float(os.getenv("GLIMPSE_LLM_MAX_CONCURRENCY", "64"))
+# Multiplier applied to the limit on a 429 / 5xx
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+# Retries per call for transient failures, and the backoff curve between them
+DEFAULT_MAX_RETRIES = int(os.getenv("GLIMPSE_LLM_RETRIES", "4"))
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 30.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """
+    Retry reason for a transient OpenAI error, or None if retrying cannot help.
+
+    Returns:
+        "429", "5xx", "timeout", "connection" or None
+    """
+    if isinstance(error, openai.APITimeoutError):
+        return "timeout"
+    if isinstance(error, openai.APIConnectionError):
+        return "connection"
+    if isinstance(error, openai.APIStatusError):
+        if error.status_code == 429:
+            return "429"
+        if error.status_code >= 500:
+            return "5xx"
+    return None
+
+
+def error_retry_after(error: Exception) -> Optional[float]:
+    """Server back-off hint (retry-after-ms or Retry-After) from an OpenAI error, in seconds."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    retry_after_ms = response.headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(float(retry_after_ms) / 1000.0, 0.0)
+        except ValueError:
+            pass
+    return parse_retry_after(response.headers.get("retry-after"))
+
+
+class Slot(NamedTuple):
+    """A held slot, as returned by acquire()."""
+    started: float
+    # The call took one of the last free slots, so its success says the limit can grow
+    at_capacity: bool
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on concurrent LLM calls, with retries for transient failures.
+
+    Args:
+        initial_limit: Calls allowed in flight at the start
+        min_limit: The limit never drops below this
+        max_limit: The limit never grows above this
+        backoff_factor: Multiplier applied to the limit on a 429 / 5xx
+        max_retries: Retries per call for transient failures
+        base_delay: Backoff before the first retry (doubles per retry, full jitter)
+        max_delay: Upper bound on one backoff
+    """
+
+    def __init__(self, initial_limit: float = DEFAULT_INITIAL_LIMIT,
+                 min_limit: float = DEFAULT_MIN_LIMIT,
+                 max_limit: float = DEFAULT_MAX_LIMIT,
+                 backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_factor = backoff_factor
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.metrics = get_metrics()
+        self._lock = threading.Lock()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        # Calls between a transient failure and their final outcome
+        self._retrying = 0
+        self._last_decrease = 0.0
+        # Wake-up callbacks of callers waiting for a slot, oldest first
+        self._waiters = deque()
+        self._stats = {
+            "calls": 0,
+            "retries": 0,
+            "failures": 0,
+            "decreases": 0,
+            "peak_in_flight": 0,
+            "peak_limit": float(initial_limit),
+            "min_limit_reached": float(initial_limit),
+            "wait_seconds": 0.0
+        }
+
+    @property
+    def limit(self) -> int:
+        """Calls currently allowed in flight."""
+        with self._lock:
+            return int(self._limit)
+
+    # --- calls ---------------------------------------------------------------------
+
+    def call(self, fn: Callable[[], T], stage: str = "agent") -> T:
+        """
+        Run a blocking call under the limit, retrying transient failures.
+
+        Args:
+            fn: Makes the request (called once per attempt)
+            stage: Label for retry metrics
+
+        Returns:
+            fn's result; the last error is raised once retries run out
+        """
+        attempt = 0
+        try:
+            while True:
+                slot = self.acquire()
+                try:
+                    result = fn()
+                except Exception as e:
+                    delay = self._failed(e, slot, attempt, stage)
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    time.sleep(delay)
+                    continue
+                self.release(slot, success=True)
+                return result
+        finally:
+            self._done_retrying(attempt)
+
+    async def acall(self, fn: Callable[[], Awaitable[T]], stage: str = "agent") -> T:
+        """Async counterpart of call()."""
+        attempt = 0
+        try:
+            while True:
+                slot = await self.aacquire()
+                try:
+                    result = await fn()
+                except asyncio.CancelledError:
+                    self.release(slot)
+                    raise
+                except Exception as e:
+                    delay = self._failed(e, slot, attempt, stage)
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    await asyncio.sleep(delay)
+                    continue
+                self.release(slot, success=True)
+                return result
+        finally:
+            self._done_retrying(attempt)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff for a retry, never shorter than Retry-After."""
+        delay = random.uniform(0.0, min(self.base_delay * 2 ** attempt, self.max_delay))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _failed(self, error: Exception, slot: Slot, attempt: int, stage: str) -> Optional[float]:
+        # Release the slot and decide whether to retry; returns the backoff or None to give up
+        reason = classify_error(error)
+        retry_after = error_retry_after(error) if reason is not None else None
+        self.release(slot, overloaded=reason in ("429", "5xx"), retry_after=retry_after)
+        if reason is None or attempt >= self.max_retries:
+            with self._lock:
+                self._stats["failures"] += 1
+            return None
+        with self._lock:
+            self._stats["retries"] += 1
+            if attempt == 0:
+                self._retrying += 1
+        self.metrics.inc("glimpse_retries_total", stage=stage, reason=reason)
+        return self.backoff(attempt, retry_after)
+
+    def _done_retrying(self, attempt: int):
+        if attempt:
+            with self._lock:
+                self._retrying -= 1
+
+    # --- slots ---------------------------------------------------------------------
+
+    def acquire(self) -> Slot:
+        """
+        Wait for a free slot.
+
+        Returns:
+            The slot, to pass back to release()
+        """
+        waited_from = time.monotonic()
+        while True:
+            event = threading.Event()
+            wake = event.set
+            with self._lock:
+                slot, wait = self._try_acquire(waited_from)
+                if slot is not None:
+                    return slot
+                self._waiters.append(wake)
+            event.wait(timeout=wait)
+            with self._lock:
+                self._forget(wake)
+
+    async def aacquire(self) -> Slot:
+        """Async counterpart of acquire()."""
+        loop = asyncio.get_running_loop()
+        waited_from = time.monotonic()
+        while True:
+            future = loop.create_future()
+
+            def wake(future=future):
+                loop.call_soon_threadsafe(_resolve, future)
+
+            with self._lock:
+                slot, wait = self._try_acquire(waited_from)
+                if slot is not None:
+                    return slot
+                self._waiters.append(wake)
+            try:
+                await asyncio.wait([future], timeout=wait)
+            except BaseException:
+                with self._lock:
+                    if not self._forget(wake):
+                        # Woken but leaving (e.g. cancelled): pass the wake-up on
+                        self._wake()
+                raise
+            with self._lock:
+                self._forget(wake)
+
+    def release(self, slot: Slot, success: bool = False, overloaded: bool = False,
+                retry_after: Optional[float] = None):
+        """
+        Free a slot and adjust the limit.
+
+        Args:
+            slot: Value returned by acquire()
+            success: The call succeeded (additive increase if it ran at capacity)
+            overloaded: The call got a 429 / 5xx (multiplicative decrease)
+            retry_after: Server back-off hint; no call starts until it has passed
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight -= 1
+            if success and slot.at_capacity:
+                self._limit = min(self._limit + 1.0 / self._limit, self.max_limit)
+                self._stats["peak_limit"] = max(self._stats["peak_limit"], self._limit)
+            elif overloaded and slot.started >= self._last_decrease:
+                # Calls that started before the last decrease were sent at the old limit
+                # and do not count again
+                self._limit = max(self._limit * self.backoff_factor, self.min_limit)
+                self._last_decrease = now
+                self._stats["decreases"] += 1
+                self._stats["min_limit_reached"] = min(self._stats["min_limit_reached"], self._limit)
+                self.metrics.inc("glimpse_llm_concurrency_decreases_total")
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._wake()
+
+    def _try_acquire(self, waited_from: float) -> Tuple[Optional[Slot], Optional[float]]:
+        # Caller holds self._lock. Returns (slot or None, longest wait before trying again);
+        # a wait of None means until woken by a release
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return None, self._blocked_until - now
+        if self._in_flight >= int(self._limit):
+            return None, None
+        slot = Slot(now, self._in_flight >= int(self._limit) - 1)
+        self._in_flight += 1
+        self._stats["calls"] += 1
+        self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._in_flight)
+        self._stats["wait_seconds"] += now - waited_from
+        return slot, None
+
+    def _wake(self):
+        # Caller holds self._lock: wake as many waiters as there are free slots
+        free = int(self._limit) - self._in_flight
+        while free > 0 and self._waiters:
+            self._waiters.popleft()()
+            free -= 1
+
+    def _forget(self, waiter: Callable[[], None]) -> bool:
+        # Caller holds self._lock. True if the waiter was still queued (never woken)
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            return False
+        return True
+
+    def has_headroom(self) -> bool:
+        """
+        True if an extra request would not compete with held-back calls.
+
+        False while a Retry-After hold is in force, a call is waiting for a
+        slot, or a call is backing off to retry a 429 / 5xx / timeout. Hedged
+        requests (hedging.py) are only sent when this is True.
+        """
+        with self._lock:
+            return (time.monotonic() >= self._blocked_until and not self._waiters
+                    and not self._retrying)
+
+    # --- reporting -----------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats, limit=round(self._limit, 2), in_flight=self._in_flight,
+                         waiting=len(self._waiters))
+        for key in ("peak_limit", "min_limit_reached", "wait_seconds"):
+            stats[key] = round(stats[key], 3)
+        return stats
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+_default_limiter = None
+_default_lock = threading.Lock()
+
+
+def get_adaptive_limiter() -> AdaptiveLimiter:
+    """Return the process-wide limiter for agent LLM calls, creating it on first use."""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = AdaptiveLimiter()
+        return _default_limiter
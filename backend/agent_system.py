@@ -7,19 +7,269 @@ Agent 2: Scriptwriter Agent - Narrative and prompt generator
 """
 
 import os
-from typing import Dict, Any, Optional
+import time
+import asyncio
+from collections import deque
+from typing import (
+    Dict, Any, Optional, List, Iterable, Iterator, AsyncIterable, AsyncIterator,
+    Tuple, Union, Callable, Awaitable
+)
 from datetime import datetime
+import copy
 import json
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from prompts import (
     CREATIVE_DIRECTOR_SYSTEM_PROMPT,
     SCRIPTWRITER_SYSTEM_PROMPT,
     CREATIVE_DIRECTOR_USER_PROMPT_TEMPLATE,
-    SCRIPTWRITER_USER_PROMPT_TEMPLATE
+    SCRIPTWRITER_USER_PROMPT_TEMPLATE,
+    FAST_MODE_SYSTEM_PROMPT,
+    FAST_MODE_USER_PROMPT_TEMPLATE
 )
+from response_cache import ResponseCache
+from prompt_budget import DEFAULT_SPEC_TOKEN_BUDGET, serialize_spec, count_tokens
+from prompt_compactor import DEFAULT_MAX_CHARS, DEFAULT_MAX_TOKENS, compact_prompt
+from singleflight import SingleFlight, AsyncSingleFlight, normalize_text
+from checkpoints import CheckpointStore, get_checkpoint_store, new_run_id
+from json_stream import ChatStreamAccumulator
+from http_transport import HTTPTransport, get_transport
+from hedging import HedgePolicy
+from adaptive_limiter import AdaptiveLimiter, get_adaptive_limiter
+from metrics import get_metrics
+
+# Default number of one-liners processed at once by the async pipeline
+DEFAULT_MAX_CONCURRENCY = 8
+
+# "two_stage": Creative Director → Scriptwriter (two calls)
+# "fast": one call producing the creative specification and the script together
+PIPELINE_MODES = ("two_stage", "fast")
+DEFAULT_PIPELINE_MODE = os.getenv("GLIMPSE_PIPELINE_MODE", "two_stage")
+
+# Seconds before an agent's chat completion request is abandoned
+DEFAULT_AGENT_TIMEOUT = float(os.getenv("GLIMPSE_AGENT_TIMEOUT", "120"))
+
+# Send a duplicate of a straggling agent call and keep the first reply (see hedging.py)
+DEFAULT_HEDGING = os.getenv("GLIMPSE_HEDGING", "0").lower() in ("1", "true", "yes")
+
+# Extra attempts for a failed stage before the run fails (earlier stages are not re-run)
+DEFAULT_STAGE_RETRIES = int(os.getenv("GLIMPSE_STAGE_RETRIES", "1"))
+
+# Fields (and JSON types) each stage's response must contain to be used or cached
+CREATIVE_SPEC_FIELDS = {
+    "core_concept": str,
+    "tone": str,
+    "pacing_strategy": str,
+    "camera_approach": dict,
+    "aesthetic_style": dict,
+    "key_moments": list,
+}
+SCRIPT_FIELDS = {
+    "narrative_structure": dict,
+    "shot_breakdown": list,
+    "final_multimodal_prompt": str,
+}
+
+
+def validate_fields(output: Any, required_fields: Dict[str, type], label: str) -> Dict[str, Any]:
+    """
+    Check a parsed response against a stage schema.
+
+    Raises:
+        ValueError: If output is not an object or a required field is missing,
+            has the wrong type or is an empty string
+    """
+    if not isinstance(output, dict):
+        raise ValueError(f"{label} response is not a JSON object")
+    for field, field_type in required_fields.items():
+        value = output.get(field)
+        if value is None:
+            raise ValueError(f"{label} response is missing '{field}'")
+        if not isinstance(value, field_type):
+            raise ValueError(f"{label} response field '{field}' should be a {field_type.__name__}")
+        if field_type is str and not value.strip():
+            raise ValueError(f"{label} response field '{field}' is empty")
+    return output
+
+
+class BaseAgent:
+    """
+    Shared plumbing for agents that make a single JSON-mode chat completion call.
+
+    Handles client construction (on a pooled HTTPTransport, by default the
+    process-wide one from get_transport()), the optional response cache and
+    latency measurement. Subclasses build the messages and shape the result.
+
+    Every request goes through an AdaptiveLimiter (shared by all agents by
+    default), which adapts how many calls are in flight and retries 429s,
+    5xx errors and timeouts with backoff (see adaptive_limiter.py). The SDK's
+    own retries are turned off so the limiter sees every failure.
+    """
+
+    client_class = OpenAI
+
+    # Label for this agent's latency, token and error metrics
+    stage = "agent"
+
+    # Fields the parsed response must contain (see validate_fields)
+    required_fields: Dict[str, type] = {}
+
+    # Seconds before a chat completion request is abandoned
+    request_timeout = DEFAULT_AGENT_TIMEOUT
+
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None,
+                 transport: Optional[HTTPTransport] = None, hedging: bool = DEFAULT_HEDGING,
+                 limiter: Optional[AdaptiveLimiter] = None):
+        # Agents share the pooled client, so one agent's warm connections serve the next
+        self.transport = transport or get_transport()
+        self.client = self.transport.openai_client(
+            api_key=api_key, asynchronous=issubclass(self.client_class, AsyncOpenAI)
+        )
+        self.model = "gpt-5.1"
+        self.reasoning_effort = "none"
+        self.cache = cache
+        self.metrics = get_metrics()
+        self.hedge_policy = HedgePolicy(self.stage, metrics=self.metrics) if hedging else None
+        self.limiter = limiter or get_adaptive_limiter()
+
+    def _complete(self, messages: List[Dict[str, str]], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Run one chat completion (or serve it from the cache).
+
+        Returns:
+            Dictionary with the message content, token usage, latency and cache_hit flag
+        """
+        cache_key, cached = self._cache_lookup(messages, use_cache)
+        if cached is not None:
+            return cached
+
+        kwargs = self._request_kwargs(messages)
+
+        def attempt():
+            request = lambda: self.client.chat.completions.create(**kwargs)
+            if self.hedge_policy is None:
+                return request(), None
+            # Hedge the network request only, inside the slot, and never while the limiter holds back
+            return self.hedge_policy.call(request, allow=self.limiter.has_headroom)
+
+        start_time = time.perf_counter()
+        response, hedge = self.limiter.call(attempt, stage=self.stage)
+        completion = self._completion_from_response(response, time.perf_counter() - start_time, cache_key)
+        completion["hedge"] = hedge
+        return completion
+
+    async def _acomplete(self, messages: List[Dict[str, str]], use_cache: bool = True) -> Dict[str, Any]:
+        """Async counterpart of _complete for agents built on AsyncOpenAI."""
+        cache_key, cached = self._cache_lookup(messages, use_cache)
+        if cached is not None:
+            return cached
+
+        kwargs = self._request_kwargs(messages)
+
+        async def attempt():
+            request = lambda: self.client.chat.completions.create(**kwargs)
+            if self.hedge_policy is None:
+                return await request(), None
+            return await self.hedge_policy.acall(request, allow=self.limiter.has_headroom)
+
+        start_time = time.perf_counter()
+        response, hedge = await self.limiter.acall(attempt, stage=self.stage)
+        completion = self._completion_from_response(response, time.perf_counter() - start_time, cache_key)
+        completion["hedge"] = hedge
+        return completion
+
+    def _request_kwargs(self, messages: List[Dict[str, str]], stream: bool = False) -> Dict[str, Any]:
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "reasoning_effort": self.reasoning_effort,
+            "response_format": {"type": "json_object"},
+            "timeout": self.request_timeout
+        }
+        if stream:
+            kwargs["stream"] = True
+            kwargs["stream_options"] = {"include_usage": True}
+        return kwargs
+
+    def _cache_lookup(self, messages: List[Dict[str, str]], use_cache: bool):
+        if self.cache is None or not use_cache:
+            return None, None
+
+        cache_key = self.cache.make_key(self.model, self.reasoning_effort, messages)
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return cache_key, None
+
+        self.metrics.inc("glimpse_agent_cache_hits_total", stage=self.stage)
+        return cache_key, {
+            "content": cached["content"],
+            "usage": {"total_tokens": 0, "prompt_tokens": 0, "completion_tokens": 0},
+            "cached_usage": cached["usage"],
+            "latency_seconds": 0.0,
+            "cache_hit": True
+        }
+
+    def _completion_from_response(self, response, latency: float,
+                                  cache_key: Optional[str]) -> Dict[str, Any]:
+        usage = {
+            "total_tokens": response.usage.total_tokens,
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens
+        }
+        return self._finish_completion(response.choices[0].message.content, usage, latency, cache_key)
+
+    def _finish_completion(self, content: str, usage: Dict[str, int], latency: float,
+                           cache_key: Optional[str]) -> Dict[str, Any]:
+        self.metrics.observe_stage(self.stage, latency)
+        self.metrics.inc("glimpse_requests_total", stage=self.stage)
+        self.metrics.inc("glimpse_tokens_total", usage["prompt_tokens"], stage=self.stage, kind="prompt")
+        self.metrics.inc("glimpse_tokens_total", usage["completion_tokens"], stage=self.stage, kind="completion")
+
+        # Only cache responses that pass the stage schema so a bad reply is retried next time
+        if cache_key is not None:
+            try:
+                self.validate_output(json.loads(content))
+            except (TypeError, ValueError):
+                pass
+            else:
+                self.cache.set(cache_key, {"content": content, "usage": usage})
+
+        return {
+            "content": content,
+            "usage": usage,
+            "latency_seconds": latency,
+            "cache_hit": False
+        }
+
+    def validate_output(self, output: Any) -> Dict[str, Any]:
+        """Raise ValueError unless a parsed response matches this agent's schema."""
+        return validate_fields(output, self.required_fields, self.stage)
+
+    def _completion_metadata(self, completion: Dict[str, Any]) -> Dict[str, Any]:
+        metadata = {
+            "timestamp": datetime.now().isoformat(),
+            "model": self.model,
+            "tokens_used": completion["usage"]["total_tokens"],
+            "prompt_tokens": completion["usage"]["prompt_tokens"],
+            "completion_tokens": completion["usage"]["completion_tokens"],
+            "latency_seconds": round(completion["latency_seconds"], 3),
+            "cache_hit": completion["cache_hit"]
+        }
+        if completion["cache_hit"]:
+            metadata["cached_tokens"] = completion["cached_usage"]["total_tokens"]
+        if completion.get("hedge") is not None:
+            metadata["hedge"] = completion["hedge"]
+        return metadata
 
+    def _print_usage(self, completion: Dict[str, Any]):
+        if completion["cache_hit"]:
+            print(f"Served from cache (originally {completion['cached_usage']['total_tokens']} tokens)")
+            return
+        print(f"Tokens Used: {completion['usage']['total_tokens']}")
+        print(f"  - Prompt: {completion['usage']['prompt_tokens']}")
+        print(f"  - Completion: {completion['usage']['completion_tokens']}")
 
-class CreativeDirectorAgent:
+
+class CreativeDirectorAgent(BaseAgent):
     """
     Purpose: Acts as the vision setter and planner.
 
@@ -31,85 +281,90 @@ class CreativeDirectorAgent:
       and key moments for the 12-second format
     """
 
-    def __init__(self, api_key: Optional[str] = None):
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
-        self.model = "gpt-5.1"
-        self.reasoning_effort = "none"
+    stage = "creative_director"
+    required_fields = CREATIVE_SPEC_FIELDS
 
-    def process_one_liner(self, product_one_liner: str, verbose: bool = True) -> Dict[str, Any]:
+    def build_messages(self, product_one_liner: str) -> List[Dict[str, str]]:
+        """Build the chat messages sent to the model for a one-liner."""
+        user_prompt = CREATIVE_DIRECTOR_USER_PROMPT_TEMPLATE.format(
+            one_liner=product_one_liner
+        )
+        return [
+            {"role": "system", "content": CREATIVE_DIRECTOR_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def process_one_liner(self, product_one_liner: str, verbose: bool = True,
+                          use_cache: bool = True) -> Dict[str, Any]:
         """
         Process product one-liner and generate creative specification for 12-second video.
 
         Args:
             product_one_liner: Single sentence describing the product
             verbose: If True, prints backend processing details
+            use_cache: If False, bypass the response cache for this call
 
         Returns:
             Creative specification document as a dictionary
         """
         if verbose:
-            print("\n" + "="*80)
-            print("CREATIVE DIRECTOR AGENT - PROCESSING")
-            print("="*80)
-            print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"Model: {self.model}")
-            print(f"Reasoning Effort: {self.reasoning_effort}")
-            print(f"Target Duration: 12 seconds")
-            print(f"\nProduct One-Liner:\n{product_one_liner}")
-            print("\n" + "-"*80)
-            print("Analyzing product and generating creative vision...")
-            print("-"*80 + "\n")
-
-        # Build user prompt from template
-        user_prompt = CREATIVE_DIRECTOR_USER_PROMPT_TEMPLATE.format(
-            one_liner=product_one_liner
-        )
+            self._print_start(product_one_liner)
+
+        messages = self.build_messages(product_one_liner)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": CREATIVE_DIRECTOR_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
-                reasoning_effort=self.reasoning_effort,
-                response_format={"type": "json_object"}
-            )
+            completion = self._complete(messages, use_cache=use_cache)
+            return self._build_result(completion, product_one_liner, verbose)
 
-            creative_spec = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            return self._build_error(e, verbose)
 
-            if verbose:
-                print("CREATIVE SPECIFICATION GENERATED:")
-                print("-"*80)
-                print(json.dumps(creative_spec, indent=2))
-                print("-"*80)
-                print(f"Tokens Used: {response.usage.total_tokens}")
-                print(f"  - Prompt: {response.usage.prompt_tokens}")
-                print(f"  - Completion: {response.usage.completion_tokens}")
-                print("="*80 + "\n")
-
-            return {
-                "status": "success",
-                "creative_specification": creative_spec,
-                "metadata": {
-                    "timestamp": datetime.now().isoformat(),
-                    "model": self.model,
-                    "tokens_used": response.usage.total_tokens,
-                    "input_one_liner": product_one_liner
-                }
-            }
+    def _print_start(self, product_one_liner: str):
+        print("\n" + "="*80)
+        print("CREATIVE DIRECTOR AGENT - PROCESSING")
+        print("="*80)
+        print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Model: {self.model}")
+        print(f"Reasoning Effort: {self.reasoning_effort}")
+        print(f"Target Duration: 12 seconds")
+        print(f"\nProduct One-Liner:\n{product_one_liner}")
+        print("\n" + "-"*80)
+        print("Analyzing product and generating creative vision...")
+        print("-"*80 + "\n")
 
-        except Exception as e:
-            if verbose:
-                print(f"ERROR in Creative Director Agent: {str(e)}")
-                print("="*80 + "\n")
-            return {
-                "status": "error",
-                "error": str(e)
+    def _build_result(self, completion: Dict[str, Any], product_one_liner: str,
+                      verbose: bool) -> Dict[str, Any]:
+        creative_spec = self.validate_output(json.loads(completion["content"]))
+
+        if verbose:
+            print("CREATIVE SPECIFICATION GENERATED:")
+            print("-"*80)
+            print(json.dumps(creative_spec, indent=2))
+            print("-"*80)
+            self._print_usage(completion)
+            print("="*80 + "\n")
+
+        return {
+            "status": "success",
+            "creative_specification": creative_spec,
+            "metadata": {
+                **self._completion_metadata(completion),
+                "input_one_liner": product_one_liner
             }
+        }
+
+    def _build_error(self, error: Exception, verbose: bool) -> Dict[str, Any]:
+        self.metrics.inc("glimpse_errors_total", stage=self.stage)
+        if verbose:
+            print(f"ERROR in Creative Director Agent: {str(error)}")
+            print("="*80 + "\n")
+        return {
+            "status": "error",
+            "error": str(error)
+        }
 
 
-class ScriptwriterAgent:
+class ScriptwriterAgent(BaseAgent):
     """
     Purpose: Turns the Creative Director Agent's vision into a production-ready
     script and shot-ready prompt for a 12-second video.
@@ -121,14 +376,46 @@ class ScriptwriterAgent:
     - Adds optional text overlays and copy elements
     """
 
-    def __init__(self, api_key: Optional[str] = None):
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
-        self.model = "gpt-5.1"
-        self.reasoning_effort = "none"
+    stage = "scriptwriter"
+    required_fields = SCRIPT_FIELDS
+
+    # Token budget for the embedded creative spec (0 = compact JSON, never prune)
+    spec_token_budget = DEFAULT_SPEC_TOKEN_BUDGET
+
+    def build_messages(self, creative_specification: Dict[str, Any],
+                       product_one_liner: str) -> List[Dict[str, str]]:
+        """Build the chat messages sent to the model for a creative spec."""
+        return self.assemble_messages(creative_specification, product_one_liner)[0]
+
+    def assemble_messages(self, creative_specification: Dict[str, Any],
+                          product_one_liner: str) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """
+        Build the chat messages with the spec serialized compactly within spec_token_budget.
+
+        Returns:
+            (messages, report) where report has the spec's token counts before
+            (indent=2) and after assembly, what was pruned, and the estimated
+            prompt tokens of the whole request
+        """
+        spec_text, report = serialize_spec(creative_specification, self.spec_token_budget)
+        user_prompt = SCRIPTWRITER_USER_PROMPT_TEMPLATE.format(
+            creative_specification=spec_text,
+            one_liner=product_one_liner,
+            aspect_ratio="16:9 (landscape)"
+        )
+        messages = [
+            {"role": "system", "content": SCRIPTWRITER_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+        report["prompt_tokens_estimate"] = count_tokens(SCRIPTWRITER_SYSTEM_PROMPT) + count_tokens(user_prompt)
+        report["tokens_saved"] = report["original_tokens"] - report["final_tokens"]
+        return messages, report
 
     def create_script(self, creative_specification: Dict[str, Any],
                      product_one_liner: str,
-                     verbose: bool = True) -> Dict[str, Any]:
+                     verbose: bool = True,
+                     use_cache: bool = True,
+                     on_field: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
         """
         Create production-ready script and final multimodal prompt from creative spec.
 
@@ -136,74 +423,400 @@ class ScriptwriterAgent:
             creative_specification: Output from Creative Director Agent
             product_one_liner: Original product description
             verbose: If True, prints backend processing details
+            use_cache: If False, bypass the response cache for this call
+            on_field: If given, stream the response and call on_field(field, value)
+                      as soon as each top-level script field is complete
 
         Returns:
             Script document with narrative breakdown and final prompt
         """
+        if on_field is not None:
+            result = None
+            for event in self.stream_script(creative_specification, product_one_liner,
+                                            verbose=verbose, use_cache=use_cache):
+                if event["event"] == "field":
+                    on_field(event["field"], event["value"])
+                else:
+                    result = event["result"]
+            return result
+
         if verbose:
-            print("\n" + "="*80)
-            print("SCRIPTWRITER AGENT - PROCESSING")
-            print("="*80)
-            print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"Model: {self.model}")
-            print(f"Reasoning Effort: {self.reasoning_effort}")
-            print(f"Target Duration: 12 seconds")
-            print(f"Format: landscape")
-            print(f"\nProduct: {product_one_liner}")
-            print(f"\nReceived Creative Specification:")
-            print(json.dumps(creative_specification, indent=2))
-            print("\n" + "-"*80)
-            print("Generating production-ready script and final prompt...")
-            print("-"*80 + "\n")
-
-        # Build user prompt from template
-        user_prompt = SCRIPTWRITER_USER_PROMPT_TEMPLATE.format(
-            creative_specification=json.dumps(creative_specification, indent=2),
+            self._print_start(creative_specification, product_one_liner)
+
+        messages, assembly = self.assemble_messages(creative_specification, product_one_liner)
+
+        try:
+            completion = self._complete(messages, use_cache=use_cache)
+            return self._build_result(completion, verbose, assembly)
+
+        except Exception as e:
+            return self._build_error(e, verbose)
+
+    def stream_script(self, creative_specification: Dict[str, Any],
+                      product_one_liner: str,
+                      verbose: bool = False,
+                      use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the script, yielding an event as each top-level field completes.
+
+        Args:
+            creative_specification: Output from Creative Director Agent
+            product_one_liner: Original product description
+            verbose: If True, prints backend processing details
+            use_cache: If False, bypass the response cache for this call
+
+        Yields:
+            {"event": "field", "field": ..., "value": ..., "elapsed_seconds": ...} per field,
+            then a final {"event": "complete", "result": ...} (or "error") whose result
+            matches create_script and carries streaming timings in its metadata
+        """
+        if verbose:
+            self._print_start(creative_specification, product_one_liner)
+
+        messages, assembly = self.assemble_messages(creative_specification, product_one_liner)
+
+        try:
+            cache_key, cached = self._cache_lookup(messages, use_cache)
+            accumulator = ChatStreamAccumulator()
+
+            if cached is not None:
+                yield from accumulator.consume_text(cached["content"])
+                yield self._stream_complete(accumulator, cached, verbose, assembly)
+                return
+
+            # The limiter covers opening the stream, where 429s and 5xx errors arrive
+            kwargs = self._request_kwargs(messages, stream=True)
+            stream = self.limiter.call(lambda: self.client.chat.completions.create(**kwargs), stage=self.stage)
+            for chunk in stream:
+                yield from accumulator.consume(chunk)
+
+            completion = self._finish_completion(
+                accumulator.content, accumulator.usage,
+                time.perf_counter() - accumulator.start_time, cache_key
+            )
+            yield self._stream_complete(accumulator, completion, verbose, assembly)
+
+        except Exception as e:
+            yield {"event": "error", "result": self._build_error(e, verbose)}
+
+    def _stream_complete(self, accumulator: ChatStreamAccumulator,
+                         completion: Dict[str, Any], verbose: bool,
+                         assembly: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        result = self._build_result(completion, verbose, assembly)
+        result["metadata"].update(accumulator.timings())
+        return {"event": "complete", "result": result}
+
+    def _print_start(self, creative_specification: Dict[str, Any], product_one_liner: str):
+        print("\n" + "="*80)
+        print("SCRIPTWRITER AGENT - PROCESSING")
+        print("="*80)
+        print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Model: {self.model}")
+        print(f"Reasoning Effort: {self.reasoning_effort}")
+        print(f"Target Duration: 12 seconds")
+        print(f"Format: landscape")
+        print(f"\nProduct: {product_one_liner}")
+        print(f"\nReceived Creative Specification:")
+        print(json.dumps(creative_specification, indent=2))
+        print("\n" + "-"*80)
+        print("Generating production-ready script and final prompt...")
+        print("-"*80 + "\n")
+
+    def _build_result(self, completion: Dict[str, Any], verbose: bool,
+                      assembly: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        script_output = self.validate_output(json.loads(completion["content"]))
+
+        if verbose:
+            print("SCRIPT AND FINAL PROMPT GENERATED:")
+            print("-"*80)
+            print(json.dumps(script_output, indent=2))
+            print("-"*80)
+            self._print_usage(completion)
+            if assembly is not None:
+                print(f"Creative Spec Tokens: {assembly['original_tokens']} → {assembly['final_tokens']}"
+                      + (f" (dropped {', '.join(assembly['dropped_fields'])})" if assembly["dropped_fields"] else ""))
+            print("="*80 + "\n")
+
+        metadata = self._completion_metadata(completion)
+        if assembly is not None:
+            metadata["prompt_assembly"] = assembly
+        return {
+            "status": "success",
+            "script": script_output,
+            "metadata": metadata
+        }
+
+    def _build_error(self, error: Exception, verbose: bool) -> Dict[str, Any]:
+        self.metrics.inc("glimpse_errors_total", stage=self.stage)
+        if verbose:
+            print(f"ERROR in Scriptwriter Agent: {str(error)}")
+            print("="*80 + "\n")
+        return {
+            "status": "error",
+            "error": str(error)
+        }
+
+
+class FastConceptAgent(BaseAgent):
+    """
+    Purpose: Fast mode - Creative Director and Scriptwriter fused into one call.
+
+    Produces the creative specification and the script from a single structured
+    completion, saving a round trip and the tokens spent re-reading the spec.
+    """
+
+    stage = "fast_concept"
+
+    def validate_output(self, output: Any) -> Dict[str, Any]:
+        validate_fields(output, {"creative_specification": dict, "script": dict}, self.stage)
+        validate_fields(output["creative_specification"], CREATIVE_SPEC_FIELDS, "fast_concept creative_specification")
+        validate_fields(output["script"], SCRIPT_FIELDS, "fast_concept script")
+        return output
+
+    def build_messages(self, product_one_liner: str) -> List[Dict[str, str]]:
+        """Build the chat messages sent to the model for a one-liner."""
+        user_prompt = FAST_MODE_USER_PROMPT_TEMPLATE.format(
             one_liner=product_one_liner,
             aspect_ratio="16:9 (landscape)"
         )
+        return [
+            {"role": "system", "content": FAST_MODE_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def create_concept(self, product_one_liner: str, verbose: bool = True,
+                       use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Generate the creative specification and script in one call.
+
+        Args:
+            product_one_liner: Single sentence describing the product
+            verbose: If True, prints backend processing details
+            use_cache: If False, bypass the response cache for this call
+
+        Returns:
+            Dictionary with creative_specification, script and metadata
+        """
+        if verbose:
+            self._print_start(product_one_liner)
+
+        messages = self.build_messages(product_one_liner)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": SCRIPTWRITER_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
-                reasoning_effort=self.reasoning_effort,
-                response_format={"type": "json_object"}
-            )
+            completion = self._complete(messages, use_cache=use_cache)
+            return self._build_result(completion, product_one_liner, verbose)
 
-            script_output = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            return self._build_error(e, verbose)
 
-            if verbose:
-                print("SCRIPT AND FINAL PROMPT GENERATED:")
-                print("-"*80)
-                print(json.dumps(script_output, indent=2))
-                print("-"*80)
-                print(f"Tokens Used: {response.usage.total_tokens}")
-                print(f"  - Prompt: {response.usage.prompt_tokens}")
-                print(f"  - Completion: {response.usage.completion_tokens}")
-                print("="*80 + "\n")
-
-            return {
-                "status": "success",
-                "script": script_output,
-                "metadata": {
-                    "timestamp": datetime.now().isoformat(),
-                    "model": self.model,
-                    "tokens_used": response.usage.total_tokens
-                }
+    def _print_start(self, product_one_liner: str):
+        print("\n" + "="*80)
+        print("FAST MODE AGENT - PROCESSING")
+        print("="*80)
+        print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Model: {self.model}")
+        print(f"Reasoning Effort: {self.reasoning_effort}")
+        print(f"Target Duration: 12 seconds")
+        print(f"\nProduct One-Liner:\n{product_one_liner}")
+        print("\n" + "-"*80)
+        print("Generating creative specification and script in one pass...")
+        print("-"*80 + "\n")
+
+    def _build_result(self, completion: Dict[str, Any], product_one_liner: str,
+                      verbose: bool) -> Dict[str, Any]:
+        output = self.validate_output(json.loads(completion["content"]))
+
+        if verbose:
+            print("CREATIVE SPECIFICATION AND SCRIPT GENERATED:")
+            print("-"*80)
+            print(json.dumps(output, indent=2))
+            print("-"*80)
+            self._print_usage(completion)
+            print("="*80 + "\n")
+
+        return {
+            "status": "success",
+            "creative_specification": output["creative_specification"],
+            "script": output["script"],
+            "metadata": {
+                **self._completion_metadata(completion),
+                "input_one_liner": product_one_liner
             }
+        }
+
+    def _build_error(self, error: Exception, verbose: bool) -> Dict[str, Any]:
+        self.metrics.inc("glimpse_errors_total", stage=self.stage)
+        if verbose:
+            print(f"ERROR in Fast Mode Agent: {str(error)}")
+            print("="*80 + "\n")
+        return {
+            "status": "error",
+            "error": str(error)
+        }
+
+
+class AsyncCreativeDirectorAgent(CreativeDirectorAgent):
+    """
+    Asyncio variant of the Creative Director Agent.
+
+    Uses the async OpenAI client so many one-liners can be in flight at once.
+    Returns exactly the same result dictionaries as CreativeDirectorAgent.
+    """
+
+    client_class = AsyncOpenAI
+
+    async def process_one_liner(self, product_one_liner: str, verbose: bool = True,
+                                use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Process product one-liner and generate creative specification for 12-second video.
+
+        Args:
+            product_one_liner: Single sentence describing the product
+            verbose: If True, prints backend processing details
+            use_cache: If False, bypass the response cache for this call
+
+        Returns:
+            Creative specification document as a dictionary
+        """
+        if verbose:
+            self._print_start(product_one_liner)
+
+        messages = self.build_messages(product_one_liner)
+
+        try:
+            completion = await self._acomplete(messages, use_cache=use_cache)
+            return self._build_result(completion, product_one_liner, verbose)
 
         except Exception as e:
-            if verbose:
-                print(f"ERROR in Scriptwriter Agent: {str(e)}")
-                print("="*80 + "\n")
-            return {
-                "status": "error",
-                "error": str(e)
-            }
+            return self._build_error(e, verbose)
+
+
+class AsyncScriptwriterAgent(ScriptwriterAgent):
+    """
+    Asyncio variant of the Scriptwriter Agent.
+
+    Uses the async OpenAI client so many scripts can be in flight at once.
+    Returns exactly the same result dictionaries as ScriptwriterAgent.
+    """
+
+    client_class = AsyncOpenAI
+
+    async def create_script(self, creative_specification: Dict[str, Any],
+                            product_one_liner: str,
+                            verbose: bool = True,
+                            use_cache: bool = True,
+                            on_field: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Create production-ready script and final multimodal prompt from creative spec.
+
+        Args:
+            creative_specification: Output from Creative Director Agent
+            product_one_liner: Original product description
+            verbose: If True, prints backend processing details
+            use_cache: If False, bypass the response cache for this call
+            on_field: If given, stream the response and call on_field(field, value)
+                      as soon as each top-level script field is complete
+
+        Returns:
+            Script document with narrative breakdown and final prompt
+        """
+        if on_field is not None:
+            result = None
+            async for event in self.stream_script(creative_specification, product_one_liner,
+                                                  verbose=verbose, use_cache=use_cache):
+                if event["event"] == "field":
+                    on_field(event["field"], event["value"])
+                else:
+                    result = event["result"]
+            return result
+
+        if verbose:
+            self._print_start(creative_specification, product_one_liner)
+
+        messages, assembly = self.assemble_messages(creative_specification, product_one_liner)
+
+        try:
+            completion = await self._acomplete(messages, use_cache=use_cache)
+            return self._build_result(completion, verbose, assembly)
+
+        except Exception as e:
+            return self._build_error(e, verbose)
+
+    async def stream_script(self, creative_specification: Dict[str, Any],
+                            product_one_liner: str,
+                            verbose: bool = False,
+                            use_cache: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the script, yielding an event as each top-level field completes.
+
+        Same events as ScriptwriterAgent.stream_script.
+        """
+        if verbose:
+            self._print_start(creative_specification, product_one_liner)
+
+        messages, assembly = self.assemble_messages(creative_specification, product_one_liner)
+
+        try:
+            cache_key, cached = self._cache_lookup(messages, use_cache)
+            accumulator = ChatStreamAccumulator()
+
+            if cached is not None:
+                for event in accumulator.consume_text(cached["content"]):
+                    yield event
+                yield self._stream_complete(accumulator, cached, verbose, assembly)
+                return
+
+            kwargs = self._request_kwargs(messages, stream=True)
+            stream = await self.limiter.acall(
+                lambda: self.client.chat.completions.create(**kwargs), stage=self.stage
+            )
+            async for chunk in stream:
+                for event in accumulator.consume(chunk):
+                    yield event
+
+            completion = self._finish_completion(
+                accumulator.content, accumulator.usage,
+                time.perf_counter() - accumulator.start_time, cache_key
+            )
+            yield self._stream_complete(accumulator, completion, verbose, assembly)
+
+        except Exception as e:
+            yield {"event": "error", "result": self._build_error(e, verbose)}
+
+
+class AsyncFastConceptAgent(FastConceptAgent):
+    """
+    Asyncio variant of the fast mode agent.
+
+    Returns exactly the same result dictionaries as FastConceptAgent.
+    """
+
+    client_class = AsyncOpenAI
+
+    async def create_concept(self, product_one_liner: str, verbose: bool = True,
+                             use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Generate the creative specification and script in one call.
+
+        Args:
+            product_one_liner: Single sentence describing the product
+            verbose: If True, prints backend processing details
+            use_cache: If False, bypass the response cache for this call
+
+        Returns:
+            Dictionary with creative_specification, script and metadata
+        """
+        if verbose:
+            self._print_start(product_one_liner)
+
+        messages = self.build_messages(product_one_liner)
+
+        try:
+            completion = await self._acomplete(messages, use_cache=use_cache)
+            return self._build_result(completion, product_one_liner, verbose)
+
+        except Exception as e:
+            return self._build_error(e, verbose)
 
 
 class VideoProductionPipeline:
@@ -215,97 +828,398 @@ class VideoProductionPipeline:
     2. Creative Director Agent creates visual concept and creative specification
     3. Scriptwriter Agent turns it into production-ready script and final prompt
     4. Output: Ready-to-ship 12-second video concept
+
+    In "fast" mode steps 2 and 3 are a single call to FastConceptAgent; the
+    output dictionary has the same shape either way.
+
+    The final prompt is compacted to prompt_max_chars / prompt_max_tokens
+    (see prompt_compactor.py); the script keeps the uncompacted original.
+
+    Concurrent calls for the same one-liner (after whitespace normalization),
+    mode and use_cache share one in-flight run (see singleflight.py); the
+    callers that joined get a copy marked pipeline_metadata["coalesced"].
+    Set coalesce_requests = False to give every call its own run.
+
+    With hedging=True a straggling agent call is sent a second time once it
+    passes the stage's latency percentile (see hedging.py); the run's hedge
+    rate and latency saved are reported in pipeline_metadata["hedging"].
+
+    All agent calls share one AdaptiveLimiter (see adaptive_limiter.py), so
+    concurrency backs off together when the account is rate limited, and one
+    HTTPTransport (default: get_transport(), the pool the video calls use).
+
+    Every run has a run_id. Each stage's validated result is checkpointed
+    (see checkpoints.py); a failed stage is retried on its own up to
+    stage_retries times, and a failed run can be resumed from its last good
+    stage with resume_run(run_id) without repeating the stages before it.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
-        self.creative_director = CreativeDirectorAgent(api_key=api_key)
-        self.scriptwriter = ScriptwriterAgent(api_key=api_key)
+    creative_director_class = CreativeDirectorAgent
+    scriptwriter_class = ScriptwriterAgent
+    fast_concept_class = FastConceptAgent
+    prompt_max_chars = DEFAULT_MAX_CHARS
+    prompt_max_tokens = DEFAULT_MAX_TOKENS
+    coalesce_requests = True
+    stage_retries = DEFAULT_STAGE_RETRIES
+
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None,
+                 transport: Optional[HTTPTransport] = None,
+                 mode: str = DEFAULT_PIPELINE_MODE,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 hedging: bool = DEFAULT_HEDGING,
+                 limiter: Optional[AdaptiveLimiter] = None):
+        self.cache = cache
+        self.transport = transport or get_transport()
+        self.mode = self._resolve_mode(mode)
+        self.checkpoints = checkpoints or get_checkpoint_store()
+        self.limiter = limiter or get_adaptive_limiter()
+        self.creative_director = self.creative_director_class(
+            api_key=api_key, cache=cache, transport=self.transport, hedging=hedging, limiter=self.limiter
+        )
+        self.scriptwriter = self.scriptwriter_class(
+            api_key=api_key, cache=cache, transport=self.transport, hedging=hedging, limiter=self.limiter
+        )
+        self.fast_concept = self.fast_concept_class(
+            api_key=api_key, cache=cache, transport=self.transport, hedging=hedging, limiter=self.limiter
+        )
+        self.metrics = get_metrics()
+        self._flights = SingleFlight()
 
     def create_video_concept(self, product_one_liner: str,
-                           verbose: bool = True) -> Dict[str, Any]:
+                           verbose: bool = True,
+                           use_cache: bool = True,
+                           on_script_field: Optional[Callable[[str, Any], None]] = None,
+                           mode: Optional[str] = None,
+                           run_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute the full pipeline: One-liner → Creative Director → Scriptwriter → Video Concept
 
         Args:
             product_one_liner: Single sentence describing the product
             verbose: If True, shows all backend processing
+            use_cache: If False, bypass the response cache for both agents
+            on_script_field: If given, stream the Scriptwriter and call
+                             on_script_field(field, value) as each field completes
+                             (in fast mode, called for every field once the call returns)
+            mode: "two_stage" or "fast" (default: the pipeline's mode)
+            run_id: Existing run to continue (stages it already completed are
+                    restored from their checkpoints); default: a new run
 
         Returns:
-            Complete video concept with final prompt ready for generation
+            Complete video concept with final prompt ready for generation. On
+            failure, an error dictionary with the run_id and failed_stage to
+            pass to resume_run.
+        """
+        mode = self._resolve_mode(mode or self.mode)
+        if not self.coalesce_requests:
+            return self._create_video_concept(product_one_liner, verbose, use_cache, on_script_field,
+                                              mode, run_id)
+
+        output, shared = self._flights.do(
+            self._flight_key(product_one_liner, mode, use_cache, run_id),
+            lambda: self._create_video_concept(product_one_liner, verbose, use_cache, on_script_field,
+                                               mode, run_id)
+        )
+        return self._join_flight(output, verbose, on_script_field) if shared else output
+
+    def resume_run(self, run_id: str, verbose: bool = True, use_cache: bool = True,
+                   on_script_field: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
         """
+        Continue a failed run from its last checkpointed stage.
+
+        Args:
+            run_id: The run_id of a failed result
+            verbose: If True, shows all backend processing
+            use_cache: If False, bypass the response cache for the stages that run
+            on_script_field: See create_video_concept
+
+        Returns:
+            Same as create_video_concept
+        """
+        run = self._get_run(run_id)
+        return self.create_video_concept(run["product"], verbose=verbose, use_cache=use_cache,
+                                         on_script_field=on_script_field, mode=run["mode"], run_id=run_id)
+
+    def _create_video_concept(self, product_one_liner: str, verbose: bool, use_cache: bool,
+                              on_script_field: Optional[Callable[[str, Any], None]],
+                              mode: str, run_id: Optional[str]) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        run_id = self._start_run(run_id, product_one_liner, mode)
         if verbose:
-            print("\n" + "█"*80)
-            print("VIDEO PRODUCTION PIPELINE STARTED")
-            print("█"*80)
-            print(f"Pipeline Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"Product: {product_one_liner}")
-            print(f"Target: 12-second landscape video for landing pages, social media, pitch decks")
-            print("█"*80 + "\n")
+            self._print_start(product_one_liner)
+
+        if mode == "fast":
+            if verbose:
+                print("STAGE 1/1: Fast Mode Agent")
+                print("Task: Creative specification, script and final prompt in one call\n")
+
+            fast_result = self._run_stage(run_id, "fast_concept", verbose, use_cache, lambda use_cache: (
+                self.fast_concept.create_concept(
+                    product_one_liner=product_one_liner,
+                    verbose=verbose,
+                    use_cache=use_cache
+                )
+            ))
+            return self._finish_fast(run_id, product_one_liner, fast_result, verbose, on_script_field, start_time)
 
         # Step 1: Creative Director Agent
         if verbose:
             print("STAGE 1/2: Creative Director Agent")
             print("Task: Transform one-liner into visual concept\n")
 
-        creative_result = self.creative_director.process_one_liner(
-            product_one_liner=product_one_liner,
-            verbose=verbose
-        )
+        creative_result = self._run_stage(run_id, "creative_director", verbose, use_cache, lambda use_cache: (
+            self.creative_director.process_one_liner(
+                product_one_liner=product_one_liner,
+                verbose=verbose,
+                use_cache=use_cache
+            )
+        ))
 
         if creative_result["status"] != "success":
-            return {
-                "status": "error",
-                "error": "Creative Director Agent failed",
-                "details": creative_result
-            }
+            return self._fail_run(run_id, "creative_director", "Creative Director Agent failed", creative_result)
 
         # Step 2: Scriptwriter Agent
         if verbose:
             print("STAGE 2/2: Scriptwriter Agent")
             print("Task: Create production-ready script and final prompt\n")
 
-        script_result = self.scriptwriter.create_script(
-            creative_specification=creative_result["creative_specification"],
-            product_one_liner=product_one_liner,
-            verbose=verbose
-        )
+        script_result = self._run_stage(run_id, "scriptwriter", verbose, use_cache, lambda use_cache: (
+            self.scriptwriter.create_script(
+                creative_specification=creative_result["creative_specification"],
+                product_one_liner=product_one_liner,
+                verbose=verbose,
+                use_cache=use_cache,
+                on_field=on_script_field
+            )
+        ))
+
+        return self._finish_two_stage(run_id, product_one_liner, creative_result, script_result,
+                                      verbose, on_script_field, start_time)
+
+    def _run_stage(self, run_id: str, stage: str, verbose: bool, use_cache: bool,
+                   call: Callable[[bool], Dict[str, Any]]) -> Dict[str, Any]:
+        """Restore a stage from its checkpoint, or run it (retrying only this stage) and checkpoint it."""
+        result = self._load_checkpoint(run_id, stage, verbose)
+        if result is not None:
+            return result
 
+        for attempt in range(1, self.stage_retries + 2):
+            # Retries bypass the cache so they are real new attempts
+            result = call(use_cache and attempt == 1)
+            if result["status"] == "success" or attempt > self.stage_retries:
+                break
+            self._report_stage_retry(stage, attempt, result, verbose)
+
+        self._save_checkpoint(run_id, stage, result, attempt)
+        return result
+
+    def _load_checkpoint(self, run_id: str, stage: str, verbose: bool) -> Optional[Dict[str, Any]]:
+        result = self.checkpoints.load_stage(run_id, stage)
+        if result is None:
+            return None
+        result["metadata"]["from_checkpoint"] = True
+        self.metrics.inc("glimpse_checkpoint_restores_total", stage=stage)
+        if verbose:
+            print(f"✓ {stage} restored from checkpoint (run {run_id})\n")
+        return result
+
+    def _save_checkpoint(self, run_id: str, stage: str, result: Dict[str, Any], attempts: int):
+        if result["status"] == "success":
+            result["metadata"]["attempts"] = attempts
+            self.checkpoints.save_stage(run_id, stage, result, attempts)
+
+    def _report_stage_retry(self, stage: str, attempt: int, result: Dict[str, Any], verbose: bool):
+        self.metrics.inc("glimpse_retries_total", stage=stage, reason="stage_failed")
+        if verbose:
+            print(f"⟳ {stage} failed ({result.get('error')}), retrying "
+                  f"({attempt}/{self.stage_retries})...\n")
+
+    def _get_run(self, run_id: str) -> Dict[str, Any]:
+        run = self.checkpoints.get_run(run_id)
+        if run is None:
+            raise ValueError(f"Unknown run_id '{run_id}'")
+        return run
+
+    def _start_run(self, run_id: Optional[str], product_one_liner: str, mode: str) -> str:
+        if run_id is None:
+            run_id = new_run_id()
+        else:
+            run = self.checkpoints.get_run(run_id)
+            if run is not None and (run["product"] != product_one_liner or run["mode"] != mode):
+                raise ValueError(f"Run '{run_id}' was started for a different one-liner or mode")
+        self.checkpoints.start_run(run_id, product_one_liner, mode)
+        return run_id
+
+    def _fail_run(self, run_id: str, stage: str, error: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        self.checkpoints.finish_run(run_id, "failed", stage, result.get("error"))
+        return {
+            "status": "error",
+            "error": error,
+            "details": result,
+            "run_id": run_id,
+            "failed_stage": stage
+        }
+
+    def _finish_two_stage(self, run_id: str, product_one_liner: str,
+                          creative_result: Dict[str, Any], script_result: Dict[str, Any], verbose: bool,
+                          on_script_field: Optional[Callable[[str, Any], None]],
+                          start_time: float) -> Dict[str, Any]:
         if script_result["status"] != "success":
-            return {
-                "status": "error",
-                "error": "Scriptwriter Agent failed",
-                "details": script_result
-            }
+            return self._fail_run(run_id, "scriptwriter", "Scriptwriter Agent failed", script_result)
+
+        if on_script_field is not None and script_result["metadata"].get("from_checkpoint"):
+            for field, value in script_result["script"].items():
+                on_script_field(field, value)
+
+        output = self._compile_output(
+            product_one_liner,
+            creative_result["creative_specification"],
+            script_result["script"],
+            [("creative_director", creative_result), ("scriptwriter", script_result)],
+            verbose
+        )
+        self._record_concept(output, "two_stage", start_time)
+        return self._complete_run(run_id, output, [creative_result, script_result])
+
+    def _complete_run(self, run_id: str, output: Dict[str, Any],
+                      stage_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        metadata = output["pipeline_metadata"]
+        metadata["run_id"] = run_id
+        metadata["stages_from_checkpoint"] = [
+            stage for stage, result in zip(metadata["stages_completed"], stage_results)
+            if result["metadata"].get("from_checkpoint")
+        ]
+        self.checkpoints.finish_run(run_id, "completed")
+        return output
+
+    @staticmethod
+    def _flight_key(product_one_liner: str, mode: str, use_cache: bool,
+                    run_id: Optional[str]) -> Tuple[str, str, bool, Optional[str]]:
+        # use_cache is part of the key so a use_cache=False caller never gets a cached response
+        return normalize_text(product_one_liner), mode, use_cache, run_id
+
+    def _join_flight(self, output: Dict[str, Any], verbose: bool,
+                     on_script_field: Optional[Callable[[str, Any], None]]) -> Dict[str, Any]:
+        """A caller's own copy of a result computed for an identical concurrent call."""
+        self.metrics.inc("glimpse_coalesced_requests_total")
+        output = copy.deepcopy(output)
+        if output["status"] == "success":
+            output["pipeline_metadata"]["coalesced"] = True
+            if on_script_field is not None:
+                for field, value in output["script"].items():
+                    on_script_field(field, value)
+        if verbose:
+            print(f"↺ Joined an identical in-flight request for: {output.get('product', '')}")
+        return output
+
+    @staticmethod
+    def _resolve_mode(mode: str) -> str:
+        if mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown pipeline mode '{mode}' (expected one of {', '.join(PIPELINE_MODES)})")
+        return mode
+
+    def _finish_fast(self, run_id: str, product_one_liner: str, fast_result: Dict[str, Any], verbose: bool,
+                     on_script_field: Optional[Callable[[str, Any], None]],
+                     start_time: float) -> Dict[str, Any]:
+        if fast_result["status"] != "success":
+            return self._fail_run(run_id, "fast_concept", "Fast Mode Agent failed", fast_result)
+
+        if on_script_field is not None:
+            for field, value in fast_result["script"].items():
+                on_script_field(field, value)
+
+        output = self._compile_output(
+            product_one_liner,
+            fast_result["creative_specification"],
+            fast_result["script"],
+            [("fast_concept", fast_result)],
+            verbose,
+            mode="fast"
+        )
+        self._record_concept(output, "fast", start_time)
+        return self._complete_run(run_id, output, [fast_result])
+
+    def _record_concept(self, output: Dict[str, Any], mode: str, start_time: float):
+        # Overall and per-mode latency plus tokens, to compare the modes per workload
+        latency = time.perf_counter() - start_time
+        output["pipeline_metadata"]["total_latency_seconds"] = round(latency, 3)
+        self.metrics.observe_stage("concept", latency)
+        self.metrics.observe_stage(f"concept_{mode}", latency)
+        self.metrics.inc("glimpse_concept_tokens_total", output["pipeline_metadata"]["total_tokens"], mode=mode)
+
+    def _print_start(self, product_one_liner: str):
+        print("\n" + "█"*80)
+        print("VIDEO PRODUCTION PIPELINE STARTED")
+        print("█"*80)
+        print(f"Pipeline Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Product: {product_one_liner}")
+        print(f"Target: 12-second landscape video for landing pages, social media, pitch decks")
+        print("█"*80 + "\n")
+
+    def _compile_output(self, product_one_liner: str,
+                        creative_specification: Dict[str, Any],
+                        script: Dict[str, Any],
+                        stage_results: List[Tuple[str, Dict[str, Any]]],
+                        verbose: bool,
+                        mode: str = "two_stage") -> Dict[str, Any]:
+        final_prompt, compaction = compact_prompt(
+            script["final_multimodal_prompt"],
+            max_chars=self.prompt_max_chars,
+            max_tokens=self.prompt_max_tokens
+        )
+        self.metrics.inc("glimpse_prompt_chars_saved_total",
+                         compaction["original_chars"] - compaction["final_chars"])
 
-        # Compile final output
         final_output = {
             "status": "success",
             "product": product_one_liner,
-            "creative_specification": creative_result["creative_specification"],
-            "script": script_result["script"],
-            "final_prompt_for_video_generation": script_result["script"]["final_multimodal_prompt"],
+            "creative_specification": creative_specification,
+            "script": script,
+            "final_prompt_for_video_generation": final_prompt,
             "pipeline_metadata": {
                 "completion_time": datetime.now().isoformat(),
-                "stages_completed": ["creative_director", "scriptwriter"],
+                "mode": mode,
+                "stages_completed": [agent for agent, _ in stage_results],
                 "agents_used": [
                     {
-                        "agent": "creative_director",
+                        "agent": agent,
                         "model": "gpt-5.1",
-                        "tokens": creative_result["metadata"]["tokens_used"]
-                    },
-                    {
-                        "agent": "scriptwriter",
-                        "model": "gpt-5.1",
-                        "tokens": script_result["metadata"]["tokens_used"]
+                        "tokens": result["metadata"]["tokens_used"]
                     }
+                    for agent, result in stage_results
                 ],
-                "total_tokens": (
-                    creative_result["metadata"]["tokens_used"] +
-                    script_result["metadata"]["tokens_used"]
-                )
+                "total_tokens": sum(result["metadata"]["tokens_used"] for _, result in stage_results),
+                "stage_latencies": {
+                    agent: result["metadata"]["latency_seconds"] for agent, result in stage_results
+                },
+                "prompt_compaction": compaction
             }
         }
 
+        script_result = stage_results[-1][1]
+        if script_result["metadata"].get("prompt_assembly"):
+            final_output["pipeline_metadata"]["spec_prompt_tokens"] = {
+                key: script_result["metadata"]["prompt_assembly"][key]
+                for key in ("original_tokens", "final_tokens", "tokens_saved")
+            }
+
+        if script_result["metadata"].get("streamed"):
+            final_output["pipeline_metadata"]["script_streaming"] = {
+                "time_to_first_field_seconds": script_result["metadata"]["time_to_first_field_seconds"],
+                "time_to_final_prompt_seconds": script_result["metadata"]["time_to_final_prompt_seconds"]
+            }
+
+        hedges = [result["metadata"]["hedge"] for _, result in stage_results if "hedge" in result["metadata"]]
+        if hedges:
+            hedged = sum(1 for hedge in hedges if hedge["hedged"])
+            final_output["pipeline_metadata"]["hedging"] = {
+                "calls": len(hedges),
+                "hedged": hedged,
+                "hedge_rate": round(hedged / len(hedges), 3),
+                "hedge_wins": sum(1 for hedge in hedges if hedge["winner"] == "hedge"),
+                "latency_saved_seconds": round(sum(hedge["latency_saved_seconds"] for hedge in hedges), 3)
+            }
+
         if verbose:
             print("\n" + "█"*80)
             print("PIPELINE COMPLETED SUCCESSFULLY")
@@ -314,7 +1228,9 @@ class VideoProductionPipeline:
             print("-"*80)
             print(final_output["final_prompt_for_video_generation"])
             print("-"*80)
-            print(f"\nTotal Tokens Used: {final_output['pipeline_metadata']['total_tokens']}")
+            print(f"\nFinal Prompt: {compaction['original_chars']} → {compaction['final_chars']} chars "
+                  f"({compaction['original_tokens']} → {compaction['final_tokens']} tokens)")
+            print(f"Total Tokens Used: {final_output['pipeline_metadata']['total_tokens']}")
             print(f"Completion Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print("█"*80 + "\n")
             print("✓ Your 12-second landscape video concept is ready to ship!")
@@ -323,6 +1239,260 @@ class VideoProductionPipeline:
         return final_output
 
 
+class AsyncVideoProductionPipeline(VideoProductionPipeline):
+    """
+    Asyncio variant of the Creative Director → Scriptwriter pipeline.
+
+    Runs many one-liners concurrently on the async OpenAI client. At most
+    max_concurrency one-liners are in flight at any moment; the rest wait
+    on a semaphore. Each result has exactly the same shape as the output of
+    VideoProductionPipeline.create_video_concept, so save_output works unchanged.
+    """
+
+    creative_director_class = AsyncCreativeDirectorAgent
+    scriptwriter_class = AsyncScriptwriterAgent
+    fast_concept_class = AsyncFastConceptAgent
+
+    def __init__(self, api_key: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 cache: Optional[ResponseCache] = None,
+                 transport: Optional[HTTPTransport] = None,
+                 mode: str = DEFAULT_PIPELINE_MODE,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 hedging: bool = DEFAULT_HEDGING,
+                 limiter: Optional[AdaptiveLimiter] = None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        super().__init__(api_key=api_key, cache=cache, transport=transport, mode=mode,
+                         checkpoints=checkpoints, hedging=hedging, limiter=limiter)
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._flights = AsyncSingleFlight()
+
+    async def create_video_concept(self, product_one_liner: str,
+                                   verbose: bool = True,
+                                   use_cache: bool = True,
+                                   on_script_field: Optional[Callable[[str, Any], None]] = None,
+                                   mode: Optional[str] = None,
+                                   run_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Execute the full pipeline for one one-liner, waiting for a free slot first.
+
+        A call identical to one already in flight waits for that run instead
+        (without taking a slot).
+
+        Args:
+            product_one_liner: Single sentence describing the product
+            verbose: If True, shows all backend processing
+            use_cache: If False, bypass the response cache for both agents
+            on_script_field: If given, stream the Scriptwriter and call
+                             on_script_field(field, value) as each field completes
+            mode: "two_stage" or "fast" (default: the pipeline's mode)
+            run_id: Existing run to continue from its checkpoints (default: a new run)
+
+        Returns:
+            Complete video concept with final prompt ready for generation
+        """
+        mode = self._resolve_mode(mode or self.mode)
+        if not self.coalesce_requests:
+            return await self._run_with_slot(product_one_liner, verbose, use_cache, on_script_field,
+                                             mode, run_id)
+
+        output, shared = await self._flights.do(
+            self._flight_key(product_one_liner, mode, use_cache, run_id),
+            lambda: self._run_with_slot(product_one_liner, verbose, use_cache, on_script_field,
+                                        mode, run_id)
+        )
+        return self._join_flight(output, verbose, on_script_field) if shared else output
+
+    async def resume_run(self, run_id: str, verbose: bool = True, use_cache: bool = True,
+                         on_script_field: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """Continue a failed run from its last checkpointed stage (see VideoProductionPipeline.resume_run)."""
+        run = self._get_run(run_id)
+        return await self.create_video_concept(run["product"], verbose=verbose, use_cache=use_cache,
+                                               on_script_field=on_script_field, mode=run["mode"],
+                                               run_id=run_id)
+
+    async def _run_with_slot(self, product_one_liner: str, verbose: bool, use_cache: bool,
+                             on_script_field: Optional[Callable[[str, Any], None]],
+                             mode: str, run_id: Optional[str]) -> Dict[str, Any]:
+        async with self._semaphore:
+            return await self._run_stages(product_one_liner, verbose, use_cache, on_script_field,
+                                          mode, run_id)
+
+    async def create_video_concepts(self, product_one_liners: Iterable[str],
+                                    verbose: bool = False,
+                                    use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Run the pipeline for many one-liners concurrently.
+
+        Args:
+            product_one_liners: One-liners to turn into video concepts
+            verbose: If True, shows all backend processing (output interleaves)
+            use_cache: If False, bypass the response cache for both agents
+
+        Returns:
+            One result dictionary per one-liner, in input order
+        """
+        return await asyncio.gather(*(
+            self.create_video_concept(one_liner, verbose=verbose, use_cache=use_cache)
+            for one_liner in product_one_liners
+        ))
+
+    async def stream_video_concepts(self,
+                                    product_one_liners: Union[Iterable[str], AsyncIterable[str]],
+                                    ordered: bool = False,
+                                    verbose: bool = False,
+                                    use_cache: bool = True) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Run the pipeline for a stream of one-liners, yielding results as they finish.
+
+        Input is pulled lazily and only a small window of one-liners is held at a
+        time, so memory stays flat no matter how long the input is.
+
+        Args:
+            product_one_liners: One-liners (sync or async iterable) to process
+            ordered: If True, yield results in input order; otherwise in completion order
+            verbose: If True, shows all backend processing (output interleaves)
+            use_cache: If False, bypass the response cache for both agents
+
+        Yields:
+            (input_index, result) tuples
+        """
+        # Keep one extra batch queued so a finished slot never waits on input
+        window = self.max_concurrency * 2
+        source = _as_async_iterator(product_one_liners)
+        pending = deque()
+        exhausted = False
+        next_index = 0
+
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        one_liner = await source.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.ensure_future(self.create_video_concept(
+                        one_liner, verbose=verbose, use_cache=use_cache))
+                    pending.append((next_index, task))
+                    next_index += 1
+
+                if not pending:
+                    return
+
+                if ordered:
+                    index, task = pending.popleft()
+                    result = await task
+                else:
+                    await asyncio.wait([task for _, task in pending],
+                                       return_when=asyncio.FIRST_COMPLETED)
+                    index, task = next(item for item in pending if item[1].done())
+                    pending.remove((index, task))
+                    result = task.result()
+
+                yield index, result
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _run_stages(self, product_one_liner: str, verbose: bool,
+                          use_cache: bool,
+                          on_script_field: Optional[Callable[[str, Any], None]] = None,
+                          mode: str = "two_stage",
+                          run_id: Optional[str] = None) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        run_id = self._start_run(run_id, product_one_liner, mode)
+        if verbose:
+            self._print_start(product_one_liner)
+
+        if mode == "fast":
+            fast_result = await self._arun_stage(run_id, "fast_concept", verbose, use_cache, lambda use_cache: (
+                self.fast_concept.create_concept(
+                    product_one_liner=product_one_liner,
+                    verbose=verbose,
+                    use_cache=use_cache
+                )
+            ))
+            return self._finish_fast(run_id, product_one_liner, fast_result, verbose, on_script_field, start_time)
+
+        creative_result = await self._arun_stage(run_id, "creative_director", verbose, use_cache, lambda use_cache: (
+            self.creative_director.process_one_liner(
+                product_one_liner=product_one_liner,
+                verbose=verbose,
+                use_cache=use_cache
+            )
+        ))
+
+        if creative_result["status"] != "success":
+            return self._fail_run(run_id, "creative_director", "Creative Director Agent failed", creative_result)
+
+        script_result = await self._arun_stage(run_id, "scriptwriter", verbose, use_cache, lambda use_cache: (
+            self.scriptwriter.create_script(
+                creative_specification=creative_result["creative_specification"],
+                product_one_liner=product_one_liner,
+                verbose=verbose,
+                use_cache=use_cache,
+                on_field=on_script_field
+            )
+        ))
+
+        return self._finish_two_stage(run_id, product_one_liner, creative_result, script_result,
+                                      verbose, on_script_field, start_time)
+
+    async def _arun_stage(self, run_id: str, stage: str, verbose: bool, use_cache: bool,
+                          call: Callable[[bool], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Async counterpart of _run_stage."""
+        result = self._load_checkpoint(run_id, stage, verbose)
+        if result is not None:
+            return result
+
+        for attempt in range(1, self.stage_retries + 2):
+            result = await call(use_cache and attempt == 1)
+            if result["status"] == "success" or attempt > self.stage_retries:
+                break
+            self._report_stage_retry(stage, attempt, result, verbose)
+
+        self._save_checkpoint(run_id, stage, result, attempt)
+        return result
+
+
+async def _as_async_iterator(items: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def run_video_concepts(product_one_liners: Iterable[str],
+                       max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                       api_key: Optional[str] = None,
+                       verbose: bool = False,
+                       cache: Optional[ResponseCache] = None) -> List[Dict[str, Any]]:
+    """
+    Synchronous helper that runs many one-liners through the async pipeline.
+
+    Args:
+        product_one_liners: One-liners to turn into video concepts
+        max_concurrency: Maximum number of one-liners in flight at once
+        api_key: Optional OpenAI API key (defaults to OPENAI_API_KEY)
+        verbose: If True, shows all backend processing (output interleaves)
+        cache: Optional response cache shared by both agents
+
+    Returns:
+        One result dictionary per one-liner, in input order
+    """
+    async def _run():
+        pipeline = AsyncVideoProductionPipeline(api_key=api_key, max_concurrency=max_concurrency,
+                                                cache=cache)
+        return await pipeline.create_video_concepts(product_one_liners, verbose=verbose)
+
+    return asyncio.run(_run())
+
+
 def save_output(output: Dict[str, Any], filename: str = None):
     """
     Save the final video prompt to a text file.
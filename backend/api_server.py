@@ -0,0 +1,565 @@
+"""
+Asyncio HTTP service for the web frontend.
+
+Exposes the concept pipeline and Sora rendering as a small JSON API, with
+progress streamed over Server-Sent Events. Everything runs on one event
+loop: each open progress stream is a coroutine, not a thread, so a single
+process can hold hundreds of them.
+
+Endpoints:
+    POST /api/concepts              {"product": "...", "mode"?, "use_cache"?} → 202 {"concept_id", ...}
+    GET  /api/concepts/{id}         concept status, and the pipeline output once finished
+    GET  /api/concepts/{id}/events  SSE: "field" per finished script field, then "complete" or "error"
+    POST /api/renders               {"concept_id": "..."} or {"prompt": "..."}, "model"?, "force"? → 202
+    GET  /api/renders/{id}          render status, video_id, progress and video_path
+    GET  /api/renders/{id}/events   SSE: "status" per status check, then "complete" or "error"
+    GET  /api/videos/{video_id}         last known status of any Sora job (no upstream request)
+    GET  /api/videos/{video_id}/events  SSE for any Sora job; all watchers share one upstream poll
+    GET  /health
+
+Usage:
+    python api_server.py --port 8000
+"""
+
+import os
+import re
+import json
+import uuid
+import asyncio
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+from dotenv import load_dotenv
+
+from agent_system import AsyncVideoProductionPipeline, DEFAULT_PIPELINE_MODE, PIPELINE_MODES
+from checkpoints import new_run_id
+from generate_video import MODELS, get_model_config
+from http_transport import HTTPTransport, get_transport
+from metrics import get_metrics, start_exporter_from_env
+from prompt_compactor import compact_prompt
+from render_pipeline import RenderPipeline
+from status_hub import StatusHub
+from video_poller import VideoJobPoller, TERMINAL_STATUSES
+
+load_dotenv()
+
+DEFAULT_HOST = os.getenv("GLIMPSE_API_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.getenv("GLIMPSE_API_PORT", "8000"))
+
+# Origin allowed to call the API from a browser (the Next.js frontend)
+DEFAULT_CORS_ORIGIN = os.getenv("GLIMPSE_API_CORS_ORIGIN", "*")
+
+# Concepts generated at once; more requests wait for a free slot
+DEFAULT_CONCEPT_CONCURRENCY = int(os.getenv("GLIMPSE_API_CONCEPT_CONCURRENCY", "8"))
+
+# Finished concepts and renders kept in memory (oldest finished records are dropped first)
+MAX_RECORDS = 1000
+
+# Events kept per record and replayed to a progress stream that connects late
+MAX_EVENTS = 200
+
+# Comment line sent on idle progress streams so proxies keep them open
+SSE_KEEPALIVE_SECONDS = 15.0
+
+MAX_BODY_BYTES = 64 * 1024
+
+_STATUS_TEXT = {
+    200: "OK", 202: "Accepted", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"
+}
+
+
+class HTTPError(Exception):
+    """An error answered to the client as {"error": message} with the given status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class _Record:
+    """One concept or render: its public view, event history and live subscribers."""
+
+    def __init__(self, record_id: str, kind: str, view: Dict[str, Any]):
+        self.id = record_id
+        self.kind = kind
+        self.view = view
+        self.events = []
+        self.subscribers = set()
+        self.done = False
+
+    def publish(self, event: str, data: Dict[str, Any], final: bool = False):
+        self.events.append((event, data))
+        if len(self.events) > MAX_EVENTS:
+            # Keep the first event (the record's start) and the most recent ones
+            del self.events[1]
+        for queue in self.subscribers:
+            queue.put_nowait((event, data))
+        if final:
+            self.done = True
+            for queue in self.subscribers:
+                queue.put_nowait(None)
+
+
+class GlimpseService:
+    """
+    Concept and render jobs behind the HTTP API.
+
+    Args:
+        transport: Pooled HTTP transport shared by the agents, poller and downloads
+        concept_concurrency: Concepts generated at once
+        mode: Default concept pipeline mode
+        output_dir: Directory for downloaded videos (default: the current directory,
+            like render_pipeline.py)
+    """
+
+    def __init__(self, transport: Optional[HTTPTransport] = None,
+                 concept_concurrency: int = DEFAULT_CONCEPT_CONCURRENCY,
+                 mode: str = DEFAULT_PIPELINE_MODE,
+                 output_dir: Optional[str] = None):
+        self.transport = transport or get_transport()
+        self.mode = mode
+        self.output_dir = output_dir
+        self.concepts = AsyncVideoProductionPipeline(
+            max_concurrency=concept_concurrency, transport=self.transport, mode=mode
+        )
+        self.poller = VideoJobPoller(transport=self.transport)
+        # Every watcher of a video_id shares one upstream poll
+        self.hub = StatusHub(self.poller)
+        self._renderers = {}
+        self._records = OrderedDict()
+        self._tasks = set()
+
+    # --- concepts ------------------------------------------------------------------
+
+    def create_concept(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        product = body.get("product")
+        if not isinstance(product, str) or not product.strip():
+            raise HTTPError(400, "'product' must be a non-empty string")
+        mode = body.get("mode", self.mode)
+        if mode not in PIPELINE_MODES:
+            raise HTTPError(400, f"'mode' must be one of {', '.join(PIPELINE_MODES)}")
+
+        # The concept ID is the pipeline run ID, so a failed concept can be resumed with main.py --resume
+        concept_id = new_run_id()
+        record = self._add(concept_id, "concept", {
+            "concept_id": concept_id,
+            "status": "running",
+            "product": product.strip(),
+            "mode": mode,
+            "created_at": datetime.now().isoformat()
+        })
+        self._spawn(self._run_concept(record, bool(body.get("use_cache", True))))
+        return self._accepted(record)
+
+    async def _run_concept(self, record: _Record, use_cache: bool):
+        def on_field(field: str, value: Any):
+            record.publish("field", {"field": field, "value": value})
+
+        try:
+            result = await self.concepts.create_video_concept(
+                record.view["product"], verbose=False, use_cache=use_cache,
+                on_script_field=on_field, mode=record.view["mode"], run_id=record.id
+            )
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        self._finish(record, result)
+
+    # --- renders -------------------------------------------------------------------
+
+    def create_render(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        model = body.get("model", "sora-2")
+        try:
+            get_model_config(model)
+        except ValueError:
+            raise HTTPError(400, f"'model' must be one of {', '.join(c['name'] for c in MODELS.values())}")
+
+        if body.get("concept_id"):
+            concept = self._get(body["concept_id"], "concept")
+            if concept.view["status"] != "success":
+                raise HTTPError(409, f"Concept {concept.id} is {concept.view['status']}, not success")
+            result = concept.view["result"]
+            source = {"concept_id": concept.id}
+        elif isinstance(body.get("prompt"), str) and body["prompt"].strip():
+            # Hand-written prompts get the same ceiling as pipeline output
+            result = {"final_prompt_for_video_generation": compact_prompt(body["prompt"].strip())[0]}
+            source = {}
+        else:
+            raise HTTPError(400, "Provide 'concept_id' of a finished concept or a 'prompt'")
+
+        render_id = f"render_{uuid.uuid4().hex}"
+        record = self._add(render_id, "render", {
+            "render_id": render_id,
+            "status": "pending",
+            "model": model,
+            **source,
+            "created_at": datetime.now().isoformat()
+        })
+        item = {"render_id": render_id, "concept": result, "status": "scripted", "timings": {}}
+        self._spawn(self._run_render(record, item, model, bool(body.get("force", False))))
+        return self._accepted(record)
+
+    async def _run_render(self, record: _Record, item: Dict[str, Any], model: str, force: bool):
+        try:
+            item = await self._renderer(model, force).render_one(item)
+        except Exception as e:
+            item["status"] = "error"
+            item["error"] = str(e)
+        result = {key: item.get(key) for key in
+                  ("status", "error", "video_id", "video_path", "size_bytes", "cost", "cache_hit", "timings")
+                  if item.get(key) is not None}
+        self._finish(record, result)
+
+    def _renderer(self, model: str, force: bool = False) -> RenderPipeline:
+        renderer = self._renderers.get((model, force))
+        if renderer is None:
+            renderer = RenderPipeline(model=model, poller=self.poller, concept_pipeline=self.concepts,
+                                      transport=self.transport, force_render=force,
+                                      output_dir=self.output_dir,
+                                      on_progress=self._render_progress)
+            self._renderers[(model, force)] = renderer
+        return renderer
+
+    def _render_progress(self, item: Dict[str, Any], info: Dict[str, Any]):
+        record = self._records.get(item["render_id"])
+        if record is None:
+            return
+        record.view.update(status=info.get("status"), progress=info.get("progress"), video_id=info.get("id"))
+        record.publish("status", {key: record.view.get(key) for key in ("status", "progress", "video_id")})
+
+    # --- records -------------------------------------------------------------------
+
+    def get(self, record_id: str, kind: str) -> Dict[str, Any]:
+        return self._get(record_id, kind).view
+
+    def subscribe(self, record_id: str, kind: str) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[asyncio.Queue]]:
+        """
+        Events so far and, unless the record has finished, a queue of the ones to come.
+
+        The queue yields (event, data) tuples and then None after the final event.
+        """
+        record = self._get(record_id, kind)
+        history = list(record.events)
+        if record.done:
+            return history, None
+        queue = asyncio.Queue()
+        record.subscribers.add(queue)
+        return history, queue
+
+    def unsubscribe(self, record_id: str, queue: asyncio.Queue):
+        record = self._records.get(record_id)
+        if record is not None:
+            record.subscribers.discard(queue)
+
+    def stats(self) -> Dict[str, Any]:
+        records = list(self._records.values())
+        return {
+            "concepts": sum(1 for record in records if record.kind == "concept"),
+            "renders": sum(1 for record in records if record.kind == "render"),
+            "running": sum(1 for record in records if not record.done),
+            "subscribers": sum(len(record.subscribers) for record in records),
+            "polling": self.poller.stats(),
+            "status_hub": self.hub.stats()
+        }
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.poller.close()
+
+    def _add(self, record_id: str, kind: str, view: Dict[str, Any]) -> _Record:
+        record = _Record(record_id, kind, view)
+        self._records[record_id] = record
+        record.publish("status", {"status": view["status"]})
+        if len(self._records) > MAX_RECORDS:
+            for old_id in [key for key, old in self._records.items() if old.done][:len(self._records) - MAX_RECORDS]:
+                del self._records[old_id]
+        return record
+
+    def _get(self, record_id: str, kind: str) -> _Record:
+        record = self._records.get(record_id)
+        if record is None or record.kind != kind:
+            raise HTTPError(404, f"Unknown {kind} '{record_id}'")
+        return record
+
+    def _finish(self, record: _Record, result: Dict[str, Any]):
+        status = "success" if result.get("status") == "success" else "error"
+        record.view["status"] = status
+        record.view["finished_at"] = datetime.now().isoformat()
+        if record.kind == "concept":
+            record.view["result"] = result
+            if status == "error":
+                record.view["error"] = result.get("error")
+        else:
+            record.view.update(result, status=status)
+        record.publish("complete" if status == "success" else "error", record.view, final=True)
+
+    def _spawn(self, coroutine):
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _accepted(record: _Record) -> Dict[str, Any]:
+        base = f"/api/{record.kind}s/{record.id}"
+        return {**record.view, "url": base, "events_url": f"{base}/events"}
+
+
+class ApiServer:
+    """
+    Minimal HTTP/1.1 server on asyncio streams, routing to a GlimpseService.
+
+    Args:
+        service: Concept and render jobs
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+        cors_origin: Access-Control-Allow-Origin sent with every response
+    """
+
+    _ROUTES = [
+        ("POST", re.compile(r"^/api/concepts$"), "_post_concept"),
+        ("GET", re.compile(r"^/api/concepts/(?P<id>[\w-]+)$"), "_get_concept"),
+        ("GET", re.compile(r"^/api/concepts/(?P<id>[\w-]+)/events$"), "_concept_events"),
+        ("POST", re.compile(r"^/api/renders$"), "_post_render"),
+        ("GET", re.compile(r"^/api/renders/(?P<id>[\w-]+)$"), "_get_render"),
+        ("GET", re.compile(r"^/api/renders/(?P<id>[\w-]+)/events$"), "_render_events"),
+        ("GET", re.compile(r"^/api/videos/(?P<id>[\w-]+)$"), "_get_video"),
+        ("GET", re.compile(r"^/api/videos/(?P<id>[\w-]+)/events$"), "_video_events"),
+        ("GET", re.compile(r"^/health$"), "_health"),
+    ]
+
+    def __init__(self, service: GlimpseService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 cors_origin: str = DEFAULT_CORS_ORIGIN):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.cors_origin = cors_origin
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> "ApiServer":
+        # A large backlog so hundreds of browsers can open progress streams at once
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=1024)
+        return self
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        await self.service.close()
+
+    # --- connection handling -------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, body = await self._read_request(reader)
+            if method == "OPTIONS":
+                await self._respond(writer, 204, None)
+                return
+            handler, params = self._route(method, path)
+            await handler(writer, body, **params)
+        except HTTPError as e:
+            await self._respond(writer, e.status, {"error": e.message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            get_metrics().inc("glimpse_errors_total", stage="api")
+            await self._respond(writer, 500, {"error": str(e)})
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, Any]]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise HTTPError(400, "Malformed request line")
+        method, target, _ = parts
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f"Request body is larger than {MAX_BODY_BYTES} bytes")
+        body = {}
+        if length:
+            try:
+                body = json.loads(await reader.readexactly(length))
+            except ValueError:
+                raise HTTPError(400, "Request body must be JSON")
+            if not isinstance(body, dict):
+                raise HTTPError(400, "Request body must be a JSON object")
+        return method.upper(), target.split("?")[0].rstrip("/") or "/", body
+
+    def _route(self, method: str, path: str):
+        allowed = False
+        for route_method, pattern, name in self._ROUTES:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method == method:
+                return getattr(self, name), match.groupdict()
+            allowed = True
+        if allowed:
+            raise HTTPError(405, f"{method} not allowed on {path}")
+        raise HTTPError(404, f"Unknown path {path}")
+
+    def _headers(self, status: int, content_type: Optional[str], extra: str = "") -> bytes:
+        lines = [
+            f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}",
+            f"Access-Control-Allow-Origin: {self.cors_origin}",
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+            "Access-Control-Allow-Headers: Content-Type",
+        ]
+        if content_type:
+            lines.append(f"Content-Type: {content_type}")
+        return ("\r\n".join(lines) + "\r\n" + extra).encode("latin-1")
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Optional[Dict[str, Any]]):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+        writer.write(self._headers(status, "application/json" if payload is not None else None,
+                                   f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n") + data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _stream_events(self, writer: asyncio.StreamWriter, record_id: str, kind: str):
+        history, queue = self.service.subscribe(record_id, kind)
+        try:
+            await self._send_events(writer, history, queue)
+        finally:
+            if queue is not None:
+                self.service.unsubscribe(record_id, queue)
+
+    async def _send_events(self, writer: asyncio.StreamWriter, history: List[Tuple[str, Dict[str, Any]]],
+                           queue: Optional[asyncio.Queue],
+                           convert: Optional[Callable[[Any], Tuple[str, Dict[str, Any]]]] = None):
+        # Write the history, then whatever arrives on the queue until it yields None
+        writer.write(self._headers(200, "text/event-stream",
+                                   "Cache-Control: no-cache\r\nConnection: close\r\n\r\n"))
+        try:
+            for event, data in history:
+                writer.write(_sse(event, data))
+            await writer.drain()
+            while queue is not None:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                else:
+                    if message is None:
+                        break
+                    writer.write(_sse(*(convert(message) if convert else message)))
+                await writer.drain()
+        except ConnectionError:
+            pass
+
+    # --- routes --------------------------------------------------------------------
+
+    async def _post_concept(self, writer, body):
+        await self._respond(writer, 202, self.service.create_concept(body))
+
+    async def _get_concept(self, writer, body, id):
+        view = self.service.get(id, "concept")
+        await self._respond(writer, 202 if view["status"] == "running" else 200, view)
+
+    async def _concept_events(self, writer, body, id):
+        await self._stream_events(writer, id, "concept")
+
+    async def _post_render(self, writer, body):
+        await self._respond(writer, 202, self.service.create_render(body))
+
+    async def _get_render(self, writer, body, id):
+        view = self.service.get(id, "render")
+        await self._respond(writer, 200 if view["status"] in ("success", "error") else 202, view)
+
+    async def _render_events(self, writer, body, id):
+        await self._stream_events(writer, id, "render")
+
+    async def _get_video(self, writer, body, id):
+        info = self.service.hub.last_status(id)
+        if info is None:
+            raise HTTPError(404, f"No status known for video '{id}'; open /api/videos/{id}/events to watch it")
+        await self._respond(writer, 200, info)
+
+    async def _video_events(self, writer, body, id):
+        subscription = self.service.hub.subscribe_queue(id)
+        try:
+            await self._send_events(writer, [], subscription.queue, convert=_video_event)
+        finally:
+            subscription.close()
+
+    async def _health(self, writer, body):
+        await self._respond(writer, 200, {"status": "ok", **self.service.stats()})
+
+
+def _video_event(info: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    status = info.get("status")
+    if status == "completed":
+        return "complete", info
+    return ("error" if status in TERMINAL_STATUSES else "status"), info
+
+
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+async def serve(host: str, port: int, mode: str, concept_concurrency: int,
+                output_dir: Optional[str] = None):
+    service = GlimpseService(concept_concurrency=concept_concurrency, mode=mode, output_dir=output_dir)
+    server = await ApiServer(service, host=host, port=port).start()
+    print(f"Glimpse API on {server.base_url}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Glimpse concept + render HTTP API with SSE progress")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--mode", choices=PIPELINE_MODES, default=DEFAULT_PIPELINE_MODE,
+                        help="Default concept pipeline mode")
+    parser.add_argument("--concept-concurrency", type=int, default=DEFAULT_CONCEPT_CONCURRENCY)
+    parser.add_argument("--output-dir", help="Directory for downloaded videos (default: current directory)")
+    args = parser.parse_args()
+
+    if not os.getenv("OPENAI_API_KEY"):
+        raise SystemExit("❌ OPENAI_API_KEY not found in .env file")
+
+    for exporter in start_exporter_from_env():
+        print(f"📈 Exporting metrics to {exporter}")
+
+    try:
+        # Stores (.cache/, video_jobs.db) stay relative to the working directory, so limits
+        # and render reuse are shared with generate_video.py and render_pipeline.py runs
+        asyncio.run(serve(args.host, args.port, args.mode, args.concept_concurrency, args.output_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,579 @@
+"""
+Searchable SQLite catalog of generated videos and saved prompts.
+
+Renders land as loose generated_video_<timestamp>_<video_id>.mp4 files and
+prompts as prompt_<product>_<timestamp>.txt files (see examples/). scan()
+indexes the output directories:
+
+- incremental: a file whose size and mtime are unchanged since the last scan
+  is not opened again, so rescanning thousands of files takes a fraction of
+  a second; deleted files are dropped from the index
+- MP4 duration, resolution, frame rate, codecs and faststart layout are read
+  from the box headers (mvhd, tkhd/stsd, mdhd, stsz) without decoding; only
+  the box headers and the moov box are read
+- prompt text is indexed with SQLite FTS5 for full-text search
+- every video is linked to its job in the job store (by video_id) and, through
+  the job's prompt hash, to the prompt file it was rendered from. Videos
+  without a recorded job are linked to the newest prompt saved before them in
+  the same directory (link = "time"), which is how the pipeline writes them
+
+Usage:
+    catalog = get_catalog()
+    catalog.scan(["."])
+    for hit in catalog.search("grocery scanner"):
+        print(hit["product"], [video["path"] for video in hit["videos"]])
+
+    python catalog.py scan . examples
+    python catalog.py search "space defense"
+"""
+
+import os
+import re
+import mmap
+import time
+import bisect
+import struct
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+
+from faststart import Box, FaststartError, parse_boxes
+from job_store import DEFAULT_DB_PATH as DEFAULT_JOB_DB_PATH, VideoJobStore, get_job_store, hash_prompt
+from prompt_compactor import compact_prompt
+
+DEFAULT_DB_PATH = os.getenv("GLIMPSE_CATALOG_DB", "video_catalog.db")
+
+# Videos without a job record are linked to a prompt saved at most this long before them
+DEFAULT_LINK_WINDOW = float(os.getenv("GLIMPSE_CATALOG_LINK_WINDOW", str(24 * 3600)))
+
+_VIDEO_NAME = re.compile(r"^generated_video_(\d{8}_\d{6})_(.+)\.mp4$")
+_PROMPT_NAME = re.compile(r"^prompt_(.*)_(\d{8}_\d{6})\.txt$")
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    video_id TEXT,
+    created_at REAL NOT NULL,
+    duration REAL,
+    width INTEGER,
+    height INTEGER,
+    fps REAL,
+    video_codec TEXT,
+    audio_codec TEXT,
+    faststart INTEGER,
+    error TEXT,
+    prompt_path TEXT,
+    link TEXT,
+    model TEXT,
+    job_status TEXT,
+    cost REAL
+);
+CREATE INDEX IF NOT EXISTS idx_videos_directory ON videos (directory);
+CREATE INDEX IF NOT EXISTS idx_videos_video_id ON videos (video_id);
+CREATE INDEX IF NOT EXISTS idx_videos_prompt_path ON videos (prompt_path);
+CREATE TABLE IF NOT EXISTS prompts (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    product TEXT,
+    created_at REAL NOT NULL,
+    chars INTEGER NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    compact_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_prompts_directory ON prompts (directory);
+CREATE VIRTUAL TABLE IF NOT EXISTS prompts_fts USING fts5(
+    path UNINDEXED, product, text, tokenize = 'porter unicode61'
+);
+"""
+
+_VIDEO_COLUMNS = ("path", "directory", "size", "mtime_ns", "video_id", "created_at", "duration",
+                  "width", "height", "fps", "video_codec", "audio_codec", "faststart", "error")
+_PROMPT_COLUMNS = ("path", "directory", "size", "mtime_ns", "product", "created_at", "chars",
+                   "prompt_hash")
+
+
+def read_mp4_info(path: str) -> Dict[str, Any]:
+    """
+    Duration, resolution, frame rate, codecs and layout of an MP4, from its box headers.
+
+    Returns:
+        Dictionary with duration (seconds), width, height, fps, video_codec,
+        audio_codec (sample entry types such as "avc1" / "mp4a") and faststart
+        (moov before mdat); values the file does not have are None
+
+    Raises:
+        FaststartError: If the box structure cannot be parsed
+    """
+    info = {"duration": None, "width": None, "height": None, "fps": None,
+            "video_codec": None, "audio_codec": None, "faststart": None}
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise FaststartError("Empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            boxes = parse_boxes(data)
+            types = [box.type for box in boxes]
+            if b"moov" not in types:
+                raise FaststartError("No moov box")
+            if b"mdat" in types:
+                info["faststart"] = types.index(b"moov") < types.index(b"mdat")
+            moov = boxes[types.index(b"moov")]
+            children = _children(data, moov)
+            if b"mvhd" in children:
+                timescale, duration = _timescale_duration(data, children[b"mvhd"])
+                info["duration"] = round(duration / timescale, 3) if timescale else None
+            for trak in parse_boxes(data, moov.offset + moov.header_size, moov.end):
+                if trak.type == b"trak":
+                    _read_track(data, trak, info)
+    return info
+
+
+class VideoCatalog:
+    """
+    Thread-safe SQLite index of videos and prompts in one or more directories.
+
+    Args:
+        path: SQLite database file (created on first use)
+        job_store: Job registry used to link videos to jobs and prompts (None: link by time only)
+        link_window: Longest gap (seconds) between a prompt and a video linked by time
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, job_store: Optional[VideoJobStore] = None,
+                 link_window: float = DEFAULT_LINK_WINDOW):
+        self.path = path
+        self.job_store = job_store
+        self.link_window = link_window
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def scan(self, directories: List[str]) -> Dict[str, Any]:
+        """
+        Bring the index up to date with the files in the given directories.
+
+        Only new or modified files (size or mtime changed) are read; files that
+        are gone are removed. Links are recomputed afterwards.
+
+        Args:
+            directories: Output directories to scan (not recursive)
+
+        Returns:
+            Dictionary with files, new, changed, unchanged, removed, errors,
+            linked, seconds and files_per_second
+        """
+        start_time = time.perf_counter()
+        counts = {"files": 0, "new": 0, "changed": 0, "unchanged": 0, "removed": 0, "errors": 0}
+        for directory in directories:
+            self._scan_directory(os.path.abspath(directory), counts)
+        counts["linked"] = self._link()
+        seconds = time.perf_counter() - start_time
+        counts["seconds"] = round(seconds, 3)
+        counts["files_per_second"] = round(counts["files"] / seconds) if seconds > 0 else 0
+        return counts
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Full-text search over prompt text and product names, best match first.
+
+        Every word must appear (stemmed, case-insensitive); no FTS syntax is needed.
+
+        Returns:
+            Prompt dictionaries with a snippet and the videos rendered from them
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+        match = " ".join(f'"{word}"' for word in words)
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT prompts.*, snippet(prompts_fts, 2, '[', ']', '…', 12) AS snippet
+                FROM prompts_fts JOIN prompts ON prompts.path = prompts_fts.path
+                WHERE prompts_fts MATCH ?
+                ORDER BY bm25(prompts_fts)
+                LIMIT ?
+                """,
+                (match, limit)
+            ).fetchall()
+            hits = []
+            for row in rows:
+                hit = dict(row)
+                hit["videos"] = [dict(video) for video in self._conn.execute(
+                    "SELECT * FROM videos WHERE prompt_path = ? ORDER BY created_at", (row["path"],)
+                )]
+                hits.append(hit)
+        return hits
+
+    def get_video(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Newest catalogued file for a video_id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM videos WHERE video_id = ? ORDER BY created_at DESC LIMIT 1", (video_id,)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def videos(self, directory: Optional[str] = None, linked: Optional[bool] = None,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Catalogued videos, newest first.
+
+        Args:
+            directory: Only videos in this directory
+            linked: True for videos with a prompt, False for those without
+            limit: Maximum number of rows
+        """
+        clauses, params = [], []
+        if directory is not None:
+            clauses.append("directory = ?")
+            params.append(os.path.abspath(directory))
+        if linked is not None:
+            clauses.append("prompt_path IS NOT NULL" if linked else "prompt_path IS NULL")
+        sql = "SELECT * FROM videos"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def summary(self) -> Dict[str, Any]:
+        """Video and prompt counts, total duration and how videos were linked."""
+        with self._lock:
+            videos = self._conn.execute(
+                "SELECT COUNT(*) AS videos, COALESCE(SUM(duration), 0) AS seconds, "
+                "COALESCE(SUM(size), 0) AS bytes, SUM(error IS NOT NULL) AS unreadable, "
+                "SUM(faststart = 0) AS not_faststart FROM videos"
+            ).fetchone()
+            links = self._conn.execute(
+                "SELECT COALESCE(link, 'none') AS link, COUNT(*) AS videos FROM videos GROUP BY link"
+            ).fetchall()
+            prompts = self._conn.execute("SELECT COUNT(*) FROM prompts").fetchone()[0]
+        return {
+            "videos": videos["videos"],
+            "prompts": prompts,
+            "video_seconds": round(videos["seconds"], 1),
+            "video_bytes": videos["bytes"],
+            "unreadable": videos["unreadable"] or 0,
+            "not_faststart": videos["not_faststart"] or 0,
+            "links": {row["link"]: row["videos"] for row in links}
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- scanning ------------------------------------------------------------------
+
+    def _scan_directory(self, directory: str, counts: Dict[str, int]):
+        with self._lock:
+            known = {
+                row["path"]: (row["size"], row["mtime_ns"])
+                for row in self._conn.execute(
+                    "SELECT path, size, mtime_ns FROM videos WHERE directory = ? "
+                    "UNION ALL SELECT path, size, mtime_ns FROM prompts WHERE directory = ?",
+                    (directory, directory)
+                )
+            }
+
+        videos, prompts, seen = [], [], set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                is_video = entry.name.endswith(".mp4")
+                if not (is_video or _PROMPT_NAME.match(entry.name)) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                seen.add(entry.path)
+                counts["files"] += 1
+                previous = known.get(entry.path)
+                if previous == (stat.st_size, stat.st_mtime_ns):
+                    counts["unchanged"] += 1
+                    continue
+                counts["changed" if previous else "new"] += 1
+                if is_video:
+                    row = _video_row(entry, stat, directory)
+                    counts["errors"] += row["error"] is not None
+                    videos.append(row)
+                else:
+                    prompts.append(_prompt_row(entry, stat, directory))
+
+        removed = [path for path in known if path not in seen]
+        counts["removed"] += len(removed)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO videos ({', '.join(_VIDEO_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_VIDEO_COLUMNS))})",
+                [tuple(row[column] for column in _VIDEO_COLUMNS) for row in videos]
+            )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO prompts ({', '.join(_PROMPT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_PROMPT_COLUMNS))})",
+                [tuple(row[column] for column in _PROMPT_COLUMNS) for row in prompts]
+            )
+            stale = [(row["path"],) for row in prompts] + [(path,) for path in removed]
+            self._conn.executemany("DELETE FROM prompts_fts WHERE path = ?", stale)
+            self._conn.executemany(
+                "INSERT INTO prompts_fts (path, product, text) VALUES (?, ?, ?)",
+                [(row["path"], row["product"], row["text"]) for row in prompts]
+            )
+            self._conn.executemany("DELETE FROM videos WHERE path = ?", [(path,) for path in removed])
+            self._conn.executemany("DELETE FROM prompts WHERE path = ?", [(path,) for path in removed])
+
+    def _link(self) -> int:
+        # Recompute every video's prompt: by the job's prompt hash first, then by time
+        jobs = {}
+        if self.job_store is not None:
+            jobs = {job["video_id"]: job for job in self.job_store.query()}
+        with self._lock:
+            prompts = self._conn.execute(
+                "SELECT path, directory, created_at, prompt_hash, compact_hash FROM prompts ORDER BY created_at"
+            ).fetchall()
+            videos = self._conn.execute("SELECT path, directory, video_id, created_at FROM videos").fetchall()
+
+        by_hash = {}
+        by_directory = {}
+        for prompt in prompts:
+            by_hash.setdefault(prompt["prompt_hash"], prompt["path"])
+            if prompt["compact_hash"]:
+                by_hash.setdefault(prompt["compact_hash"], prompt["path"])
+            by_directory.setdefault(prompt["directory"], []).append(prompt)
+        times = {directory: [prompt["created_at"] for prompt in rows] for directory, rows in by_directory.items()}
+
+        compacted = {}
+        updates = []
+        for video in videos:
+            job = jobs.get(video["video_id"]) or {}
+            candidates = self._prompts_before(by_directory.get(video["directory"], []),
+                                              times.get(video["directory"], []), video["created_at"])
+            prompt_path = by_hash.get(job.get("prompt_hash"))
+            if prompt_path is None and job.get("prompt_hash"):
+                prompt_path = _match_compacted(candidates, job["prompt_hash"], by_hash, compacted)
+            link = "job" if prompt_path else None
+            if prompt_path is None and candidates:
+                prompt_path, link = candidates[0]["path"], "time"
+            updates.append((prompt_path, link, job.get("model"), job.get("status"), job.get("cost"),
+                            video["path"]))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE videos SET prompt_path = ?, link = ?, model = ?, job_status = ?, cost = ? WHERE path = ?",
+                updates
+            )
+            self._conn.executemany("UPDATE prompts SET compact_hash = ? WHERE path = ?",
+                                   [(digest, path) for path, digest in compacted.items()])
+        return sum(1 for update in updates if update[0] is not None)
+
+    def _prompts_before(self, prompts: List[sqlite3.Row], times: List[float],
+                        created_at: float) -> List[sqlite3.Row]:
+        # Prompts saved within link_window before the video, newest first
+        candidates = []
+        index = bisect.bisect_right(times, created_at) - 1
+        while index >= 0 and created_at - times[index] <= self.link_window:
+            candidates.append(prompts[index])
+            index -= 1
+        return candidates
+
+
+def _match_compacted(candidates: List[sqlite3.Row], prompt_hash: str, by_hash: Dict[str, str],
+                     compacted: Dict[str, str]) -> Optional[str]:
+    # Jobs record the prompt as submitted, which generate_video.py compacts first. Compacting
+    # is slow, so it is done here, only for the prompts a job could have come from (newest
+    # first, usually a single file), and the hash is kept in the index
+    for prompt in candidates:
+        if prompt["compact_hash"] or prompt["path"] in compacted:
+            continue
+        try:
+            with open(prompt["path"], "r", encoding="utf-8", errors="replace") as f:
+                digest = hash_prompt(compact_prompt(f.read())[0])
+        except OSError:
+            continue
+        compacted[prompt["path"]] = digest
+        by_hash.setdefault(digest, prompt["path"])
+        if digest == prompt_hash:
+            return prompt["path"]
+    return None
+
+
+def _video_row(entry: os.DirEntry, stat: os.stat_result, directory: str) -> Dict[str, Any]:
+    match = _VIDEO_NAME.match(entry.name)
+    row = {
+        "path": entry.path,
+        "directory": directory,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "video_id": match.group(2) if match else None,
+        "created_at": _name_time(match.group(1) if match else None, stat),
+        "error": None
+    }
+    try:
+        row.update(read_mp4_info(entry.path))
+    except (OSError, ValueError, struct.error, FaststartError) as e:
+        # Recorded so an unreadable file is not re-read until it changes
+        row.update({key: None for key in ("duration", "width", "height", "fps",
+                                          "video_codec", "audio_codec", "faststart")})
+        row["error"] = str(e) or type(e).__name__
+    return row
+
+
+def _prompt_row(entry: os.DirEntry, stat: os.stat_result, directory: str) -> Dict[str, Any]:
+    match = _PROMPT_NAME.match(entry.name)
+    with open(entry.path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    return {
+        "path": entry.path,
+        "directory": directory,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "product": match.group(1).replace("_", " "),
+        "created_at": _name_time(match.group(2), stat),
+        "chars": len(text),
+        "prompt_hash": hash_prompt(text),
+        "text": text
+    }
+
+
+def _name_time(stamp: Optional[str], stat: os.stat_result) -> float:
+    # The timestamp in the file name is when it was written; fall back to the mtime
+    if stamp:
+        try:
+            return datetime.strptime(stamp, _TIMESTAMP_FORMAT).timestamp()
+        except ValueError:
+            pass
+    return stat.st_mtime
+
+
+# --- MP4 box headers -----------------------------------------------------------------
+
+
+def _children(data, box: Box) -> Dict[bytes, Box]:
+    children = {}
+    for child in parse_boxes(data, box.offset + box.header_size, box.end):
+        children.setdefault(child.type, child)
+    return children
+
+
+def _timescale_duration(data, box: Box) -> Tuple[int, int]:
+    # mvhd / mdhd: version, flags, creation and modification times, timescale, duration
+    body = box.offset + box.header_size
+    if data[body] == 1:
+        return struct.unpack_from(">IQ", data, body + 20)
+    return struct.unpack_from(">II", data, body + 12)
+
+
+def _read_track(data, trak: Box, info: Dict[str, Any]):
+    mdia_box = _children(data, trak).get(b"mdia")
+    if mdia_box is None:
+        return
+    mdia = _children(data, mdia_box)
+    if b"hdlr" not in mdia or b"minf" not in mdia:
+        return
+    stbl_box = _children(data, mdia[b"minf"]).get(b"stbl")
+    if stbl_box is None:
+        return
+    stbl = _children(data, stbl_box)
+    if b"stsd" not in stbl:
+        return
+    hdlr_body = mdia[b"hdlr"].offset + mdia[b"hdlr"].header_size
+    handler = bytes(data[hdlr_body + 8:hdlr_body + 12])
+    # First sample entry: its box type is the codec; a visual entry holds width and height
+    entry = stbl[b"stsd"].offset + stbl[b"stsd"].header_size + 8
+    entry_size, codec = struct.unpack_from(">I4s", data, entry)
+    codec = codec.decode("latin-1")
+    if handler == b"vide" and info["video_codec"] is None:
+        info["video_codec"] = codec
+        if entry_size >= 36:
+            info["width"], info["height"] = struct.unpack_from(">HH", data, entry + 32)
+        if b"mdhd" in mdia and b"stsz" in stbl:
+            timescale, duration = _timescale_duration(data, mdia[b"mdhd"])
+            samples = struct.unpack_from(">I", data, stbl[b"stsz"].offset + stbl[b"stsz"].header_size + 8)[0]
+            if timescale and duration:
+                info["fps"] = round(samples * timescale / duration, 3)
+    elif handler == b"soun" and info["audio_codec"] is None:
+        info["audio_codec"] = codec
+
+
+_default_catalog = None
+_default_lock = threading.Lock()
+
+
+def get_catalog() -> VideoCatalog:
+    """Return the process-wide catalog, creating it on first use."""
+    global _default_catalog
+    with _default_lock:
+        if _default_catalog is None:
+            # Only link against a job store that exists; do not create an empty one here
+            store = get_job_store() if os.path.exists(DEFAULT_JOB_DB_PATH) else None
+            _default_catalog = VideoCatalog(job_store=store)
+        return _default_catalog
+
+
+def _format_video(video: Dict[str, Any]) -> str:
+    if video["error"]:
+        return f"{os.path.basename(video['path'])} (unreadable: {video['error']})"
+    details = [f"{video['duration']}s" if video["duration"] is not None else None,
+               f"{video['width']}x{video['height']}" if video["width"] else None,
+               f"{video['fps']:g} fps" if video["fps"] else None,
+               "/".join(codec for codec in (video["video_codec"], video["audio_codec"]) if codec) or None,
+               "faststart" if video["faststart"] else None,
+               video["video_id"]]
+    return f"{os.path.basename(video['path'])} ({', '.join(d for d in details if d)})"
+
+
+def main():
+    """Command-line entry point: scan directories, search prompts, list videos."""
+    parser = argparse.ArgumentParser(description="Catalog of generated videos and prompts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    scan_parser = subparsers.add_parser("scan", help="Index new and changed files")
+    scan_parser.add_argument("directories", nargs="*", default=["."], help="Directories to scan (default: .)")
+    search_parser = subparsers.add_parser("search", help="Full-text search over prompts")
+    search_parser.add_argument("query", help="Words that must all appear in the prompt")
+    search_parser.add_argument("--limit", type=int, default=10)
+    list_parser = subparsers.add_parser("list", help="List catalogued videos, newest first")
+    list_parser.add_argument("--unlinked", action="store_true", help="Only videos without a prompt")
+    list_parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    catalog = get_catalog()
+    if args.command == "scan":
+        result = catalog.scan(args.directories)
+        summary = catalog.summary()
+        print("\n" + "="*80)
+        print("CATALOG SCAN")
+        print("="*80)
+        print(f"Files: {result['files']} ({result['new']} new, {result['changed']} changed, "
+              f"{result['unchanged']} unchanged, {result['removed']} removed, {result['errors']} unreadable)")
+        print(f"Time: {result['seconds']}s ({result['files_per_second']} files/s)")
+        print(f"Catalog: {summary['videos']} videos ({summary['video_seconds']}s), {summary['prompts']} prompts")
+        print("Links: " + ", ".join(f"{count} by {link}" for link, count in sorted(summary["links"].items())))
+        print("="*80 + "\n")
+    elif args.command == "search":
+        hits = catalog.search(args.query, args.limit)
+        if not hits:
+            print("No matching prompts")
+        for hit in hits:
+            print(f"📄 {hit['product']} — {hit['path']}")
+            print(f"   {hit['snippet']}")
+            for video in hit["videos"]:
+                print(f"   🎬 {_format_video(video)} [linked by {video['link']}]")
+            if not hit["videos"]:
+                print("   (no video)")
+    else:
+        for video in catalog.videos(linked=False if args.unlinked else None, limit=args.limit):
+            prompt = os.path.basename(video["prompt_path"]) if video["prompt_path"] else "no prompt"
+            print(f"🎬 {_format_video(video)} → {prompt}")
+    catalog.close()
+
+
+if __name__ == "__main__":
+    main()
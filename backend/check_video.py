@@ -1,47 +1,58 @@
 """
 Check the status of a Sora video generation job and download if ready.
-Usage: python check_video.py <video_id>
+
+Every check goes through the job store (job_store.py), so jobs submitted by
+generate_video.py or render_pipeline.py can be recovered after a crash.
+
+Usage:
+    python check_video.py <video_id>            # check one job, download if ready
+    python check_video.py --resume              # resume polling/downloading every in-flight job
+    python check_video.py --list [--status S]   # list recorded jobs
 """
 
-import sys
 import os
-import requests
+import sys
+import asyncio
+import argparse
 from datetime import datetime
-from dotenv import load_dotenv
+from typing import Dict, Any, Optional, List
 
-# Load environment variables
-load_dotenv()
+import requests
+
+from generate_video import VideoAPIError, get_video_status, download_video, job_error_message
+from downloader import DownloadError
+from job_store import VideoJobStore, ACTIVE_STATUSES, get_job_store
+from video_poller import VideoJobPoller
 
-API_KEY = os.getenv("OPENAI_API_KEY")
-if not API_KEY:
-    raise SystemExit("❌ OPENAI_API_KEY not found in .env file")
 
-BASE_URL = "https://api.openai.com/v1/videos"
+def check_and_download_video(video_id: str, store: Optional[VideoJobStore] = None) -> Optional[str]:
+    """
+    Check status and download video if ready.
 
+    Args:
+        video_id: ID of the video job
+        store: Job registry to read and update (default: the shared process-wide one)
 
-def check_and_download_video(video_id: str):
-    """Check status and download video if ready."""
+    Returns:
+        Path to the downloaded video, or None if it is not available yet
+    """
+    store = store or get_job_store()
 
     print(f"\n{'='*80}")
     print(f"CHECKING VIDEO STATUS")
     print(f"{'='*80}")
     print(f"Video ID: {video_id}\n")
 
-    # Check status
-    try:
-        status_resp = requests.get(
-            f"{BASE_URL}/{video_id}",
-            headers={"Authorization": f"Bearer {API_KEY}"}
-        )
+    job = store.get(video_id)
+    if job and job["downloaded_at"] and job["output_path"] and os.path.exists(job["output_path"]):
+        print(f"✓ Already downloaded: {job['output_path']}")
+        return job["output_path"]
 
-        if status_resp.status_code != 200:
-            print(f"❌ Error: {status_resp.status_code}")
-            print(f"Response: {status_resp.text}")
-            return
-
-        info = status_resp.json()
+    try:
+        info = get_video_status(video_id)
         status = info.get("status")
         progress = info.get("progress", 0)
+        store.update_status(video_id, status, progress, job_error_message(info))
 
         print(f"Status: {status}")
         print(f"Progress: {progress}%")
@@ -49,37 +60,18 @@ def check_and_download_video(video_id: str):
         if status == "completed":
             print(f"\n✓ Video is ready! Downloading...\n")
 
-            # Download the video
-            download_resp = requests.get(
-                f"{BASE_URL}/{video_id}/content",
-                headers={"Authorization": f"Bearer {API_KEY}"},
-                stream=True,
-            )
-
-            if download_resp.status_code != 200:
-                print(f"❌ Download error: {download_resp.status_code}")
-                print(f"Response: {download_resp.text}")
-                return
-
-            # Save file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = f"generated_video_{timestamp}_{video_id}.mp4"
-
-            with open(output_path, "wb") as f:
-                total_size = 0
-                for chunk in download_resp.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        total_size += len(chunk)
-
-            file_size_mb = total_size / (1024 * 1024)
+            download = download_video(video_id)
+            store.mark_downloaded(video_id, download["path"], download["sha256"])
 
             print(f"{'='*80}")
             print(f"SUCCESS - VIDEO DOWNLOADED")
             print(f"{'='*80}")
-            print(f"File: {output_path}")
-            print(f"Size: {file_size_mb:.2f} MB")
+            print(f"File: {download['path']}")
+            print(f"Size: {download['bytes'] / (1024 * 1024):.2f} MB")
+            print(f"Download: {download['mb_per_second']:.2f} MB/s, {download['resumes']} resume(s)")
+            print(f"SHA-256: {download['sha256']}")
             print(f"{'='*80}\n")
+            return download["path"]
 
         elif status == "failed":
             print(f"\n❌ Video generation failed")
@@ -90,18 +82,117 @@ def check_and_download_video(video_id: str):
 
         else:
             print(f"\n⏳ Video is still processing...")
-            print(f"Run this script again in a few minutes to check status.")
+            print(f"Run this script again in a few minutes, or use --resume to wait for it.")
+
+    except VideoAPIError as e:
+        print(f"❌ Error: {e.status_code}")
+        print(f"Response: {e.response_text}")
 
     except Exception as e:
         print(f"❌ Error: {e}")
 
+    return None
+
+
+async def resume_jobs(store: Optional[VideoJobStore] = None,
+                      poller: Optional[VideoJobPoller] = None) -> List[Dict[str, Any]]:
+    """
+    Resume every in-flight job recorded in the store.
+
+    Jobs still rendering are handed to one shared VideoJobPoller; finished but
+    not yet downloaded jobs are downloaded straight away.
+
+    Args:
+        store: Job registry (default: the shared process-wide one)
+        poller: Multi-job poller (default: a new one on the shared transport)
+
+    Returns:
+        Final store row for every resumed job
+    """
+    store = store or get_job_store()
+    poller = poller or VideoJobPoller()
+    jobs = store.in_flight()
+
+    async def follow(job: Dict[str, Any]) -> Dict[str, Any]:
+        video_id = job["video_id"]
+        try:
+            if job["status"] in ACTIVE_STATUSES:
+                def record(info: Dict[str, Any]):
+                    store.update_status(video_id, info["status"], info.get("progress"),
+                                        job_error_message(info))
+
+                info = await poller.watch(video_id, on_update=record)
+                print(f"  {video_id}: {info['status']}")
+                if info["status"] != "completed":
+                    return store.get(video_id)
+
+            download = await asyncio.to_thread(download_video, video_id)
+            store.mark_downloaded(video_id, download["path"], download["sha256"])
+            print(f"  {video_id}: downloaded {download['path']} "
+                  f"({download['bytes'] / (1024 * 1024):.2f} MB at {download['mb_per_second']:.2f} MB/s, "
+                  f"{download['resumes']} resume(s))")
+        except (VideoAPIError, DownloadError, requests.RequestException, OSError) as e:
+            # Leave the row as is so the next --resume tries again
+            print(f"  {video_id}: {e}")
+        return store.get(video_id)
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python check_video.py <video_id>")
+    try:
+        return await asyncio.gather(*(follow(job) for job in jobs))
+    finally:
+        await poller.close()
+
+
+def print_jobs(jobs: List[Dict[str, Any]]):
+    """Print a compact table of job rows."""
+    print(f"{'Video ID':40} {'Model':11} {'Status':11} {'Prog':>4} {'Cost':>6}  {'Submitted':19}  Output")
+    for job in jobs:
+        submitted = (datetime.fromtimestamp(job["submitted_at"]).strftime("%Y-%m-%d %H:%M:%S")
+                     if job["submitted_at"] else "-")
+        cost = f"${job['cost']:.2f}" if job["cost"] is not None else "-"
+        print(f"{job['video_id'][:40]:40} {job['model'] or '-':11} {job['status']:11} "
+              f"{job['progress'] if job['progress'] is not None else '-':>4} {cost:>6}  "
+              f"{submitted:19}  {job['output_path'] or ''}")
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Check, resume and list Sora video jobs")
+    parser.add_argument("video_id", nargs="?", help="Video job ID to check")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume polling and downloading every in-flight job")
+    parser.add_argument("--list", action="store_true", help="List recorded jobs")
+    parser.add_argument("--status", help="With --list: only jobs with this status")
+    parser.add_argument("--limit", type=int, default=50, help="With --list: maximum rows")
+    args = parser.parse_args()
+
+    store = get_job_store()
+
+    if args.list:
+        print_jobs(store.query(status=args.status, limit=args.limit))
+        summary = store.summary()
+        print(f"\n{summary['total_jobs']} job(s), ${summary['total_cost']:.2f} total: {summary['by_status']}")
+        if summary["cache_hits"]:
+            print(f"Render cache: {summary['cache_hits']} hit(s), ${summary['cost_saved']:.2f} saved")
+        return
+
+    if not os.getenv("OPENAI_API_KEY"):
+        raise SystemExit("❌ OPENAI_API_KEY not found in .env file")
+
+    if args.resume:
+        jobs = store.in_flight()
+        print(f"Resuming {len(jobs)} in-flight job(s)...")
+        if jobs:
+            print_jobs(asyncio.run(resume_jobs(store)))
+        return
+
+    if not args.video_id:
+        parser.print_usage()
         print("\nExample:")
         print("  python check_video.py video_6916e4bc81fc8191a7ca4c7a2a03d4240f303b0a41ea8813")
         sys.exit(1)
 
-    video_id = sys.argv[1]
-    check_and_download_video(video_id)
+    check_and_download_video(args.video_id, store)
+
+
+if __name__ == "__main__":
+    main()
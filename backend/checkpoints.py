@@ -0,0 +1,186 @@
+"""
+Durable per-stage checkpoints for concept pipeline runs.
+
+Each run of VideoProductionPipeline gets a run ID. Every stage that succeeds
+(creative_director, scriptwriter, fast_concept) is stored with its validated
+output, so a run whose Scriptwriter failed can be resumed later without
+paying for the Creative Director again:
+
+    pipeline.resume_run(run_id)            # or: python main.py --resume RUN_ID
+
+A run's checkpoints are deleted once it completes; runs that never complete
+(failed, or interrupted mid-stage) expire after GLIMPSE_CHECKPOINT_RETENTION_DAYS.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from typing import Dict, Any, Optional, List
+
+DEFAULT_DB_PATH = os.getenv("GLIMPSE_CHECKPOINT_DB", os.path.join(".cache", "pipeline_checkpoints.db"))
+# Unfinished runs idle for longer than this are pruned when a store is opened
+DEFAULT_RETENTION_SECONDS = float(os.getenv("GLIMPSE_CHECKPOINT_RETENTION_DAYS", "7")) * 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    run_id TEXT PRIMARY KEY,
+    product TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    status TEXT NOT NULL,
+    failed_stage TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_status ON pipeline_runs (status);
+
+CREATE TABLE IF NOT EXISTS stage_checkpoints (
+    run_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    result TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (run_id, stage)
+);
+"""
+
+
+def new_run_id() -> str:
+    return f"run_{uuid.uuid4().hex}"
+
+
+class CheckpointStore:
+    """
+    Thread-safe SQLite store of pipeline runs and their completed stages.
+
+    Args:
+        path: SQLite database file (created on first use)
+        retention_seconds: Runs not updated for this long are pruned on open
+            (None keeps them)
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH,
+                 retention_seconds: Optional[float] = DEFAULT_RETENTION_SECONDS):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        if retention_seconds is not None:
+            self.prune(retention_seconds)
+
+    def start_run(self, run_id: str, product: str, mode: str):
+        """Record a new run, or mark an existing one as running again."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO pipeline_runs (run_id, product, mode, status, created_at, updated_at)
+                VALUES (?, ?, ?, 'running', ?, ?)
+                ON CONFLICT(run_id) DO UPDATE SET
+                    status = 'running', failed_stage = NULL, error = NULL,
+                    updated_at = excluded.updated_at
+                """,
+                (run_id, product, mode, now, now)
+            )
+
+    def finish_run(self, run_id: str, status: str, failed_stage: Optional[str] = None,
+                   error: Optional[str] = None):
+        """Record a run's outcome ("completed" or "failed"); a completed run is deleted."""
+        with self._lock, self._conn:
+            if status == "completed":
+                # Nothing left to resume
+                self._delete_runs("run_id = ?", (run_id,))
+                return
+            self._conn.execute(
+                "UPDATE pipeline_runs SET status = ?, failed_stage = ?, error = ?, updated_at = ? "
+                "WHERE run_id = ?",
+                (status, failed_stage, error, time.time(), run_id)
+            )
+
+    def save_stage(self, run_id: str, stage: str, result: Dict[str, Any], attempts: int = 1):
+        """Store a stage's successful result."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO stage_checkpoints (run_id, stage, result, attempts, saved_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(run_id, stage) DO UPDATE SET
+                    result = excluded.result, attempts = excluded.attempts, saved_at = excluded.saved_at
+                """,
+                (run_id, stage, json.dumps(result, ensure_ascii=False), attempts, time.time())
+            )
+
+    def load_stage(self, run_id: str, stage: str) -> Optional[Dict[str, Any]]:
+        """A stage's stored result, or None if it has not succeeded yet."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM stage_checkpoints WHERE run_id = ? AND stage = ?", (run_id, stage)
+            ).fetchone()
+        return json.loads(row["result"]) if row is not None else None
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """One run with the names of its checkpointed stages, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM pipeline_runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                return None
+            stages = self._conn.execute(
+                "SELECT stage FROM stage_checkpoints WHERE run_id = ? ORDER BY saved_at", (run_id,)
+            ).fetchall()
+        return {**dict(row), "stages_checkpointed": [stage["stage"] for stage in stages]}
+
+    def failed_runs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Runs that can be resumed, newest first."""
+        sql = "SELECT * FROM pipeline_runs WHERE status = 'failed' ORDER BY updated_at DESC"
+        params = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def prune(self, max_age_seconds: float) -> int:
+        """
+        Delete runs (and their checkpoints) not updated for max_age_seconds.
+
+        Returns:
+            Number of runs deleted
+        """
+        with self._lock, self._conn:
+            return self._delete_runs("updated_at < ?", (time.time() - max_age_seconds,))
+
+    def _delete_runs(self, where: str, params: tuple) -> int:
+        # Caller holds self._lock inside a transaction
+        self._conn.execute(
+            f"DELETE FROM stage_checkpoints WHERE run_id IN (SELECT run_id FROM pipeline_runs WHERE {where})",
+            params
+        )
+        return self._conn.execute(f"DELETE FROM pipeline_runs WHERE {where}", params).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Return the process-wide checkpoint store, creating it on first use."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = CheckpointStore()
+        return _default_store
@@ -0,0 +1,285 @@
+"""
+Resumable, verified file downloads for rendered videos.
+
+download_file() streams into "<output>.part" with large buffers, hashes the
+bytes with SHA-256 as they arrive, resumes from the last written byte with an
+HTTP Range request when the connection drops, and atomically renames the
+finished file into place, so a failed download never leaves a truncated MP4
+under the final name. Large files can optionally be fetched as several ranged
+segments in parallel.
+"""
+
+import os
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple, List
+
+import requests
+
+from http_transport import HTTPTransport, get_transport
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("GLIMPSE_DOWNLOAD_CHUNK_SIZE", str(1024 * 1024)))
+DEFAULT_SEGMENTS = int(os.getenv("GLIMPSE_DOWNLOAD_SEGMENTS", "1"))
+DEFAULT_MAX_RESUMES = 5
+
+# Files smaller than this per segment are not worth splitting
+DEFAULT_MIN_SEGMENT_BYTES = 4 * 1024 * 1024
+
+TEMP_SUFFIX = ".part"
+
+# Errors after which the download continues from the last written byte
+RETRYABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed."""
+
+
+class DownloadHTTPError(DownloadError):
+    """Raised when the server answers with an unexpected HTTP status."""
+
+    def __init__(self, response: requests.Response):
+        super().__init__(f"Unexpected HTTP {response.status_code} while downloading")
+        self.response = response
+        self.status_code = response.status_code
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code >= 500
+
+
+class IncompleteDownloadError(DownloadError):
+    """Raised when a response ends before all expected bytes arrived."""
+
+
+def download_file(url: str, output_path: str,
+                  headers: Optional[Dict[str, str]] = None,
+                  transport: Optional[HTTPTransport] = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  segments: int = DEFAULT_SEGMENTS,
+                  max_resumes: int = DEFAULT_MAX_RESUMES,
+                  min_segment_bytes: int = DEFAULT_MIN_SEGMENT_BYTES,
+                  expected_sha256: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Download a URL to output_path via a temp file and atomic rename.
+
+    Args:
+        url: URL to fetch
+        output_path: Final destination path
+        headers: Extra request headers (e.g. Authorization)
+        transport: Pooled HTTP transport (default: the shared process-wide one)
+        chunk_size: Read/write buffer size in bytes
+        segments: Parallel ranged segments to use for large files (1 = sequential)
+        max_resumes: Dropped connections tolerated before giving up
+        min_segment_bytes: Minimum bytes per segment before splitting is worthwhile
+        expected_sha256: If given, the download fails unless the digest matches
+
+    Returns:
+        Dictionary with path, bytes, bytes_transferred, sha256, seconds,
+        mb_per_second, resumes and segments
+    """
+    transport = transport or get_transport()
+    headers = dict(headers or {})
+    temp_path = output_path + TEMP_SUFFIX
+    start_time = time.perf_counter()
+
+    total = None
+    if segments > 1:
+        total = _probe_size(url, headers, transport)
+
+    if total is not None and total >= segments * min_segment_bytes:
+        transferred, resumes, digest = _download_segmented(
+            url, headers, transport, temp_path, total, segments, chunk_size, max_resumes
+        )
+        used_segments = segments
+    else:
+        transferred, resumes, digest, total = _download_sequential(
+            url, headers, transport, temp_path, chunk_size, max_resumes
+        )
+        used_segments = 1
+
+    if expected_sha256 is not None and digest != expected_sha256.lower():
+        os.remove(temp_path)
+        raise DownloadError(f"SHA-256 mismatch: expected {expected_sha256}, got {digest}")
+
+    os.replace(temp_path, output_path)
+    seconds = time.perf_counter() - start_time
+    return {
+        "path": output_path,
+        "bytes": total,
+        "bytes_transferred": transferred,
+        "sha256": digest,
+        "seconds": round(seconds, 3),
+        "mb_per_second": round(transferred / (1024 * 1024) / seconds, 2) if seconds > 0 else 0.0,
+        "resumes": resumes,
+        "segments": used_segments
+    }
+
+
+def _download_sequential(url: str, headers: Dict[str, str], transport: HTTPTransport,
+                         temp_path: str, chunk_size: int,
+                         max_resumes: int) -> Tuple[int, int, str, int]:
+    # A .part file left by an earlier attempt is resumed, not re-downloaded
+    offset = os.path.getsize(temp_path) if os.path.exists(temp_path) else 0
+    hasher = _hash_file(temp_path, chunk_size) if offset else hashlib.sha256()
+    transferred = 0
+    resumes = 0
+    total = None
+
+    while True:
+        request_headers = dict(headers)
+        if offset:
+            request_headers["Range"] = f"bytes={offset}-"
+        try:
+            resp = transport.get(url, headers=request_headers, stream=True)
+            with resp:
+                if resp.status_code == 416 and offset:
+                    # Nothing left to fetch: the .part file already holds the whole body
+                    total = _content_range_total(resp)
+                    if total == offset:
+                        break
+                    offset, hasher = 0, hashlib.sha256()
+                    continue
+                if resp.status_code == 206:
+                    start, total = _parse_content_range(resp.headers.get("Content-Range"))
+                    if start != offset:
+                        raise IncompleteDownloadError(f"Server resumed at byte {start}, expected {offset}")
+                    mode = "ab"
+                elif resp.status_code == 200:
+                    # Fresh download, or the server ignored the Range header
+                    offset, hasher = 0, hashlib.sha256()
+                    length = resp.headers.get("Content-Length")
+                    total = int(length) if length is not None else None
+                    mode = "wb"
+                else:
+                    raise DownloadHTTPError(resp)
+
+                with open(temp_path, mode) as f:
+                    for chunk in resp.iter_content(chunk_size=chunk_size):
+                        if chunk:
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            offset += len(chunk)
+                            transferred += len(chunk)
+
+            if total is not None and offset < total:
+                raise IncompleteDownloadError(f"Connection closed after {offset} of {total} bytes")
+            break
+
+        except (*RETRYABLE_ERRORS, IncompleteDownloadError, DownloadHTTPError) as e:
+            if isinstance(e, DownloadHTTPError) and not e.retryable:
+                raise
+            resumes += 1
+            if resumes > max_resumes:
+                raise DownloadError(f"Download failed after {max_resumes} resumes: {e}") from e
+            time.sleep(_backoff(resumes))
+
+    return transferred, resumes, hasher.hexdigest(), offset
+
+
+def _download_segmented(url: str, headers: Dict[str, str], transport: HTTPTransport,
+                        temp_path: str, total: int, segments: int, chunk_size: int,
+                        max_resumes: int) -> Tuple[int, int, str]:
+    # Segments land out of order, so they go into a preallocated file and are hashed after
+    with open(temp_path, "wb") as f:
+        f.truncate(total)
+
+    bounds = _segment_bounds(total, segments)
+    try:
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            resumes = sum(executor.map(
+                lambda span: _fetch_range(url, headers, transport, temp_path, span[0], span[1],
+                                          chunk_size, max_resumes),
+                bounds
+            ))
+    except BaseException:
+        # A sparse preallocated file must never be mistaken for a resumable prefix
+        os.remove(temp_path)
+        raise
+
+    return total, resumes, _hash_file(temp_path, chunk_size).hexdigest()
+
+
+def _fetch_range(url: str, headers: Dict[str, str], transport: HTTPTransport, temp_path: str,
+                 start: int, end: int, chunk_size: int, max_resumes: int) -> int:
+    position = start
+    resumes = 0
+    with open(temp_path, "r+b") as f:
+        while position <= end:
+            try:
+                resp = transport.get(url, headers={**headers, "Range": f"bytes={position}-{end}"},
+                                     stream=True)
+                with resp:
+                    if resp.status_code != 206:
+                        raise DownloadHTTPError(resp)
+                    f.seek(position)
+                    for chunk in resp.iter_content(chunk_size=chunk_size):
+                        if chunk:
+                            chunk = chunk[:end + 1 - position]
+                            f.write(chunk)
+                            position += len(chunk)
+                            if position > end:
+                                break
+                if position <= end:
+                    raise IncompleteDownloadError(f"Segment closed at byte {position}, expected {end + 1}")
+
+            except (*RETRYABLE_ERRORS, IncompleteDownloadError, DownloadHTTPError) as e:
+                if isinstance(e, DownloadHTTPError) and not e.retryable:
+                    raise
+                resumes += 1
+                if resumes > max_resumes:
+                    raise DownloadError(f"Segment {start}-{end} failed after {max_resumes} resumes: {e}") from e
+                time.sleep(_backoff(resumes))
+    return resumes
+
+
+def _probe_size(url: str, headers: Dict[str, str], transport: HTTPTransport) -> Optional[int]:
+    """Total size if the server supports byte ranges, else None."""
+    try:
+        resp = transport.get(url, headers={**headers, "Range": "bytes=0-0"}, stream=True)
+    except RETRYABLE_ERRORS:
+        return None
+    with resp:
+        if resp.status_code == 206:
+            return _parse_content_range(resp.headers.get("Content-Range"))[1]
+        if resp.status_code != 200:
+            raise DownloadHTTPError(resp)
+    return None
+
+
+def _segment_bounds(total: int, segments: int) -> List[Tuple[int, int]]:
+    size = -(-total // segments)
+    return [(start, min(start + size, total) - 1) for start in range(0, total, size)]
+
+
+def _parse_content_range(value: Optional[str]) -> Tuple[int, Optional[int]]:
+    """Parse 'bytes START-END/TOTAL' into (start, total)."""
+    if not value or not value.startswith("bytes "):
+        raise IncompleteDownloadError(f"Missing or invalid Content-Range: {value!r}")
+    span, _, total = value[len("bytes "):].partition("/")
+    start = int(span.split("-")[0])
+    return start, int(total) if total not in ("", "*") else None
+
+
+def _content_range_total(resp: requests.Response) -> Optional[int]:
+    """Total size from a 416 response's 'bytes */TOTAL' header, if present."""
+    value = resp.headers.get("Content-Range", "")
+    _, _, total = value.partition("/")
+    return int(total) if total.isdigit() else None
+
+
+def _hash_file(path: str, chunk_size: int):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(block)
+    return hasher
+
+
+def _backoff(attempt: int) -> float:
+    return min(0.5 * 2 ** (attempt - 1), 8.0)
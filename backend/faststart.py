@@ -0,0 +1,394 @@
+"""
+MP4 "faststart": move the moov atom ahead of mdat so playback can start early.
+
+A browser can only start playing an MP4 once it has the moov box (the sample
+tables). When moov sits after mdat, a landing page has to fetch the whole file
+first. faststart() rewrites such a file with moov in front of the media data,
+without re-encoding:
+
+- the top-level box structure is read through a memory map, so only the box
+  headers and the moov box itself are ever copied into memory
+- every chunk offset in the stco / co64 tables is moved by as many bytes as
+  the chunk's box moved (stco tables are widened to co64 if an offset no
+  longer fits in 32 bits)
+- the media data is streamed from the map into "<file>.faststart" and the
+  result is renamed over the original, so a failed rewrite leaves the
+  downloaded file untouched
+
+Files that already start with moov are left alone, as are fragmented MP4s
+(their moof boxes address data relative to themselves).
+
+Usage:
+    result = faststart("generated_video.mp4")   # rewrites in place if needed
+    python faststart.py video.mp4 [...]
+    python faststart.py --benchmark              # times the rewrite on examples/*.mp4
+"""
+
+import os
+import sys
+import mmap
+import glob
+import time
+import bisect
+import struct
+import hashlib
+import argparse
+import tempfile
+from typing import Dict, Any, List, Optional, Tuple, NamedTuple
+
+DEFAULT_FASTSTART = os.getenv("GLIMPSE_FASTSTART", "1") != "0"
+DEFAULT_CHUNK_SIZE = int(os.getenv("GLIMPSE_DOWNLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+TEMP_SUFFIX = ".faststart"
+
+# Boxes on the path from moov down to the chunk offset tables
+_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+_UINT32_MAX = 0xFFFFFFFF
+# Each pass can only widen more tables, so this is never reached on a valid file
+_MAX_LAYOUT_PASSES = 8
+
+
+class FaststartError(Exception):
+    """Raised when a file's box structure cannot be parsed."""
+
+
+class Box(NamedTuple):
+    """One MP4 box: type, offset of its header, total size and header length."""
+    type: bytes
+    offset: int
+    size: int
+    header_size: int
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.size
+
+
+def parse_boxes(data, start: int = 0, end: Optional[int] = None) -> List[Box]:
+    """
+    Read the boxes laid out back to back in data[start:end].
+
+    Args:
+        data: bytes, bytearray or mmap holding the boxes
+        start: Offset of the first box header
+        end: Offset just past the last box (default: end of data)
+
+    Returns:
+        The boxes in file order
+
+    Raises:
+        FaststartError: If a box header is truncated or its size is impossible
+    """
+    end = len(data) if end is None else end
+    boxes = []
+    offset = start
+    while offset < end:
+        if end - offset < 8:
+            raise FaststartError(f"Truncated box header at byte {offset}")
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header_size = 8
+        if size == 1:
+            if end - offset < 16:
+                raise FaststartError(f"Truncated 64-bit box header at byte {offset}")
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header_size = 16
+        elif size == 0:
+            # Box runs to the end of the enclosing space
+            size = end - offset
+        if size < header_size or offset + size > end:
+            raise FaststartError(f"Invalid size {size} for {box_type!r} box at byte {offset}")
+        boxes.append(Box(box_type, offset, size, header_size))
+        offset += size
+    return boxes
+
+
+def faststart(path: str, output_path: Optional[str] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Put the moov box ahead of the media data, rewriting the file only if needed.
+
+    Args:
+        path: MP4 file to check
+        output_path: Where to write the result (default: replace path in place)
+        chunk_size: Bytes copied per write while streaming the media data
+
+    Returns:
+        Dictionary with status ("relocated", "already_faststart" or "skipped"),
+        path, bytes, seconds, moov_bytes, chunk_offsets patched, and the
+        sha256 of the rewritten file when it was relocated
+
+    Raises:
+        FaststartError: If the file is not a readable MP4
+    """
+    start_time = time.perf_counter()
+    output_path = output_path or path
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            raise FaststartError("Empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            boxes = parse_boxes(data)
+            order, reason = _faststart_order(boxes)
+            result = {"path": output_path, "bytes": size, "moov_bytes": 0, "chunk_offsets": 0}
+            if order is None:
+                result["status"] = "skipped" if reason else "already_faststart"
+                if reason:
+                    result["reason"] = reason
+            else:
+                written, patched, digest, moov_bytes = write_layout(data, boxes, order, output_path, chunk_size)
+                result.update(status="relocated", bytes=written, chunk_offsets=patched,
+                              sha256=digest, moov_bytes=moov_bytes)
+
+    if result["status"] != "relocated" and output_path != path:
+        # Nothing to move: the output is a plain copy
+        with open(path, "rb") as src, open(output_path, "wb") as dst:
+            for block in iter(lambda: src.read(chunk_size), b""):
+                dst.write(block)
+    result["seconds"] = round(time.perf_counter() - start_time, 4)
+    return result
+
+
+def write_layout(data, boxes: List[Box], order: List[int], output_path: str,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[int, int, str, int]:
+    """
+    Write the top-level boxes in a new order, patching moov's chunk offsets to match.
+
+    Args:
+        data: Memory map (or bytes) of the source file
+        boxes: Its top-level boxes, from parse_boxes()
+        order: Indexes into boxes, in the order they should be written
+        output_path: Destination; written via "<output_path>.faststart" and renamed
+        chunk_size: Bytes copied per write
+
+    Returns:
+        (bytes written, chunk offsets patched, sha256 of the output, size of the new moov)
+    """
+    moov_index = next(i for i, box in enumerate(boxes) if box.type == b"moov")
+    moov = boxes[moov_index]
+
+    # Widening an stco table to co64 grows moov, which moves every box after it and may push
+    # more offsets past 32 bits; repeat until the size of the new moov settles
+    moov_size = moov.size
+    for _ in range(_MAX_LAYOUT_PASSES):
+        relocate = _relocation(boxes, order, {moov_index: moov_size})
+        new_moov, patched = _rewrite_container(data, moov, relocate)
+        if len(new_moov) == moov_size:
+            break
+        moov_size = len(new_moov)
+    else:
+        raise FaststartError("Chunk offset tables did not settle")
+
+    temp_path = output_path + TEMP_SUFFIX
+    hasher = hashlib.sha256()
+    written = 0
+    try:
+        with open(temp_path, "wb") as out, memoryview(data) as source:
+            for index in order:
+                if index == moov_index:
+                    out.write(new_moov)
+                    hasher.update(new_moov)
+                    written += len(new_moov)
+                    continue
+                box = boxes[index]
+                # Slices of the map are views, so mdat goes to disk without being copied in memory
+                for position in range(box.offset, box.end, chunk_size):
+                    block = source[position:min(position + chunk_size, box.end)]
+                    out.write(block)
+                    hasher.update(block)
+                    block.release()
+                written += box.size
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return written, patched, hasher.hexdigest(), len(new_moov)
+
+
+def _faststart_order(boxes: List[Box]) -> Tuple[Optional[List[int]], Optional[str]]:
+    # Returns (new box order, None) if moov has to move, (None, None) if it is already in
+    # front, or (None, reason) if the file cannot or need not be rewritten
+    types = [box.type for box in boxes]
+    if b"moov" not in types:
+        return None, "no moov box"
+    if b"mdat" not in types:
+        return None, "no mdat box"
+    if b"moof" in types:
+        return None, "fragmented MP4"
+    moov_index = types.index(b"moov")
+    first_mdat = types.index(b"mdat")
+    if moov_index < first_mdat:
+        return None, None
+    order = [i for i in range(len(boxes)) if i != moov_index]
+    order.insert(first_mdat, moov_index)
+    return order, None
+
+
+def _relocation(boxes: List[Box], order: List[int], sizes: Dict[int, int]):
+    # Map an old file offset to its new one: an offset moves with the box that contains it
+    new_offsets = {}
+    position = 0
+    for index in order:
+        new_offsets[index] = position
+        position += sizes.get(index, boxes[index].size)
+    starts = [box.offset for box in boxes]
+
+    def relocate(offset: int) -> int:
+        index = bisect.bisect_right(starts, offset) - 1
+        if index < 0 or offset >= boxes[index].end:
+            raise FaststartError(f"Chunk offset {offset} points outside the file")
+        return offset + new_offsets[index] - boxes[index].offset
+
+    return relocate
+
+
+def _rewrite_container(data, box: Box, relocate) -> Tuple[bytes, int]:
+    # Rebuild a container box with patched chunk offset tables; other boxes are copied verbatim.
+    # Returns (box bytes, offsets patched)
+    body = []
+    patched = 0
+    for child in parse_boxes(data, box.offset + box.header_size, box.end):
+        if child.type in _CONTAINERS:
+            rebuilt, count = _rewrite_container(data, child, relocate)
+        elif child.type in (b"stco", b"co64"):
+            rebuilt, count = _rewrite_offsets(data, child, relocate)
+        else:
+            rebuilt, count = bytes(data[child.offset:child.end]), 0
+        body.append(rebuilt)
+        patched += count
+    payload = b"".join(body)
+    return _box_header(box.type, len(payload)) + payload, patched
+
+
+def _rewrite_offsets(data, box: Box, relocate) -> Tuple[bytes, int]:
+    # stco: version/flags, entry count, 32-bit offsets; co64: the same with 64-bit offsets
+    body = box.offset + box.header_size
+    version_flags, count = struct.unpack_from(">4sI", data, body)
+    width = "Q" if box.type == b"co64" else "I"
+    if body + 8 + count * struct.calcsize(width) > box.end:
+        raise FaststartError(f"Truncated {box.type.decode()} table at byte {box.offset}")
+    offsets = [relocate(offset) for offset in struct.unpack_from(f">{count}{width}", data, body + 8)]
+    box_type = box.type
+    if width == "I" and offsets and max(offsets) > _UINT32_MAX:
+        box_type, width = b"co64", "Q"
+    payload = version_flags + struct.pack(f">I{count}{width}", count, *offsets)
+    return _box_header(box_type, len(payload)) + payload, count
+
+
+def _box_header(box_type: bytes, payload_size: int) -> bytes:
+    if payload_size + 8 <= _UINT32_MAX:
+        return struct.pack(">I4s", payload_size + 8, box_type)
+    return struct.pack(">I4sQ", 1, box_type, payload_size + 16)
+
+
+# --- benchmark ---------------------------------------------------------------------
+
+
+def benchmark(paths: List[str], repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    Time faststart on each file as downloaded and on a copy with moov moved to the end.
+
+    The moov-at-end copy is what an encoder without faststart produces; rewriting it
+    is checked by comparing the first bytes of every chunk before and after.
+
+    Returns:
+        One dictionary per file with check_ms (file already faststart), rewrite_ms,
+        mb_per_second and verified
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for path in paths:
+            size = os.path.getsize(path)
+            check_seconds = min(_timed(lambda: faststart(path)) for _ in range(repeat))
+
+            tail_path = os.path.join(workdir, "tail.mp4")
+            out_path = os.path.join(workdir, "out.mp4")
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                boxes = parse_boxes(data)
+                moov_index = next(i for i, box in enumerate(boxes) if box.type == b"moov")
+                write_layout(data, boxes, [i for i in range(len(boxes)) if i != moov_index] + [moov_index],
+                             tail_path)
+            rewrite_seconds = min(_timed(lambda: faststart(tail_path, out_path)) for _ in range(repeat))
+            results.append({
+                "file": os.path.basename(path),
+                "bytes": size,
+                "check_ms": round(check_seconds * 1000, 3),
+                "rewrite_ms": round(rewrite_seconds * 1000, 3),
+                "mb_per_second": round(size / (1024 * 1024) / rewrite_seconds, 1),
+                "verified": _same_chunks(path, out_path)
+            })
+    return results
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _chunk_offsets(data) -> List[int]:
+    offsets = []
+    pending = [box for box in parse_boxes(data) if box.type == b"moov"]
+    while pending:
+        box = pending.pop()
+        for child in parse_boxes(data, box.offset + box.header_size, box.end):
+            if child.type in _CONTAINERS:
+                pending.append(child)
+            elif child.type in (b"stco", b"co64"):
+                body = child.offset + child.header_size
+                count = struct.unpack_from(">I", data, body + 4)[0]
+                width = "Q" if child.type == b"co64" else "I"
+                offsets.extend(struct.unpack_from(f">{count}{width}", data, body + 8))
+    return offsets
+
+
+def _same_chunks(original_path: str, rewritten_path: str, probe: int = 64) -> bool:
+    with open(original_path, "rb") as f1, open(rewritten_path, "rb") as f2:
+        original, rewritten = f1.read(), f2.read()
+    types = [box.type for box in parse_boxes(rewritten)]
+    if types.index(b"moov") > types.index(b"mdat"):
+        return False
+    before, after = _chunk_offsets(original), _chunk_offsets(rewritten)
+    return len(before) == len(after) and all(
+        original[old:old + probe] == rewritten[new:new + probe] for old, new in zip(before, after)
+    )
+
+
+def main():
+    """Command-line entry point: rewrite files in place, or benchmark on the examples."""
+    parser = argparse.ArgumentParser(description="Move the MP4 moov box ahead of mdat (faststart)")
+    parser.add_argument("files", nargs="*", help="MP4 files to rewrite in place")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time the rewrite (default files: examples/*.mp4) without modifying them")
+    parser.add_argument("--repeat", type=int, default=5, help="Benchmark runs per file (best is reported)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        paths = args.files or sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "examples", "*.mp4")))
+        results = benchmark(paths, args.repeat)
+        print("\n" + "="*80)
+        print("FASTSTART BENCHMARK")
+        print("="*80)
+        print(f"{'File':44} {'MB':>6} {'Check':>9} {'Rewrite':>9} {'MB/s':>7} {'OK':>4}")
+        for result in results:
+            print(f"{result['file'][-44:]:44} {result['bytes'] / (1024 * 1024):>6.2f} "
+                  f"{result['check_ms']:>7.2f}ms {result['rewrite_ms']:>7.2f}ms "
+                  f"{result['mb_per_second']:>7.0f} {'yes' if result['verified'] else 'NO':>4}")
+        print("="*80 + "\n")
+        sys.exit(0 if all(result["verified"] for result in results) else 1)
+
+    if not args.files:
+        parser.error("no files given")
+    for path in args.files:
+        try:
+            result = faststart(path)
+        except (OSError, FaststartError) as e:
+            print(f"❌ {path}: {e}")
+            continue
+        detail = f" ({result['reason']})" if result.get("reason") else ""
+        print(f"✓ {path}: {result['status']}{detail} in {result['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,24 +6,29 @@ Supports 12-second landscape videos optimized for landing pages and social media
 
 import os
 import sys
+import glob
 import time
 import json
 import requests
 from datetime import datetime
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
+from adaptive_limiter import parse_retry_after
+from http_transport import API_ROOT, HTTPTransport, get_transport
+from poll_schedule import AdaptivePollSchedule
+from downloader import DEFAULT_SEGMENTS, TEMP_SUFFIX, DownloadError, DownloadHTTPError, download_file
+from faststart import DEFAULT_FASTSTART, FaststartError, faststart as make_faststart
+from job_store import VideoJobStore, get_job_store, hash_prompt
+from submission_limiter import SubmissionLimiter, get_submission_limiter
+from metrics import get_metrics, start_exporter_from_env
+from prompt_compactor import compact_prompt
+from singleflight import SingleFlight
 
 # Load environment variables from .env file
 load_dotenv()
 
-API_KEY = os.getenv("OPENAI_API_KEY")
-if not API_KEY:
-    raise SystemExit("❌ OPENAI_API_KEY not found in .env file")
-
-BASE_URL = "https://api.openai.com/v1/videos"
-HEADERS = {
-    "Authorization": f"Bearer {API_KEY}",
-    "Content-Type": "application/json",
-}
+# OPENAI_BASE_URL points both the video client and the agents at another host (e.g. mock_openai_server.py)
+BASE_URL = f"{API_ROOT}/videos"
 
 # Model configurations
 MODELS = {
@@ -42,6 +47,242 @@ MODELS = {
 DURATION = "12"  # Sora supports up to 12 seconds (must be string: "4", "8", or "12")
 SIZE = "1280x720"  # 16:9 landscape format (720 x 1280 portrait, 1280 x 720 landscape)
 
+# Identical renders requested from several threads at once share one lookup and submission
+_submissions = SingleFlight()
+
+
+def require_api_key() -> str:
+    """
+    Return OPENAI_API_KEY, read when a request is made (not at import).
+
+    Raises:
+        RuntimeError: If the key is not set
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY not found in .env file")
+    return api_key
+
+
+def auth_headers() -> Dict[str, str]:
+    """Authorization header for the Sora API."""
+    return {"Authorization": f"Bearer {require_api_key()}"}
+
+
+class VideoAPIError(Exception):
+    """Raised when the Sora API answers with a non-200 status."""
+
+    def __init__(self, message: str, status_code: int, response_text: str = "",
+                 retry_after: Optional[float] = None):
+        super().__init__(f"{message} (HTTP {status_code})")
+        self.status_code = status_code
+        self.response_text = response_text
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_response(cls, message: str, resp: requests.Response) -> "VideoAPIError":
+        """Build the error from a response, keeping any Retry-After hint (in seconds)."""
+        return cls(message, resp.status_code, resp.text, parse_retry_after(resp.headers.get("Retry-After")))
+
+
+def get_model_config(model: str) -> Dict[str, Any]:
+    """Look up a model configuration from MODELS by model name (e.g. sora-2)."""
+    for config in MODELS.values():
+        if config["name"] == model:
+            return config
+    raise ValueError(f"Unknown video model: {model}")
+
+
+def submit_video_job(prompt: str, model: str, duration: str = DURATION, size: str = SIZE,
+                     transport: Optional[HTTPTransport] = None) -> Dict[str, Any]:
+    """
+    Submit a video generation job to the Sora API.
+
+    Args:
+        prompt: Text description for video generation
+        model: Model name (sora-2 or sora-2-pro)
+        duration: Video duration in seconds (max 12)
+        size: Video resolution (default: 1280x720 landscape)
+        transport: Pooled HTTP transport (default: the shared process-wide one)
+
+    Returns:
+        Job object returned by the API (includes "id" and "status")
+    """
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "seconds": duration,
+        "size": size,
+    }
+    metrics = get_metrics()
+    start_time = time.perf_counter()
+    resp = (transport or get_transport()).post(
+        BASE_URL, headers={**auth_headers(), "Content-Type": "application/json"}, json=payload
+    )
+    if resp.status_code != 200:
+        metrics.inc("glimpse_errors_total", stage="submit")
+        raise VideoAPIError.from_response("Video generation request failed", resp)
+    metrics.observe_stage("submit", time.perf_counter() - start_time)
+    metrics.inc("glimpse_requests_total", stage="submit")
+    return resp.json()
+
+
+def get_video_status(video_id: str, transport: Optional[HTTPTransport] = None) -> Dict[str, Any]:
+    """
+    Fetch the current status of a video job.
+
+    Args:
+        video_id: ID of the video job
+        transport: Pooled HTTP transport (default: the shared process-wide one)
+
+    Returns:
+        Job object with "status" and "progress"
+    """
+    resp = (transport or get_transport()).get(
+        f"{BASE_URL}/{video_id}",
+        headers=auth_headers()
+    )
+    if resp.status_code != 200:
+        get_metrics().inc("glimpse_errors_total", stage="poll")
+        raise VideoAPIError.from_response("Failed to check video status", resp)
+    get_metrics().inc("glimpse_requests_total", stage="poll")
+    return resp.json()
+
+
+def download_video(video_id: str, output_path: Optional[str] = None,
+                   transport: Optional[HTTPTransport] = None,
+                   segments: int = DEFAULT_SEGMENTS,
+                   faststart: bool = DEFAULT_FASTSTART,
+                   output_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Download a completed video to disk (resumable, SHA-256 verified, atomic rename).
+
+    Args:
+        video_id: ID of a completed video job
+        output_path: Destination path (default: timestamped file in output_dir)
+        transport: Pooled HTTP transport (default: the shared process-wide one)
+        segments: Parallel ranged segments for large files (1 = sequential)
+        faststart: Move the MP4's moov box ahead of the media data after downloading
+        output_dir: Directory for the default file name (default: the current directory)
+
+    Returns:
+        Download result from downloader.download_file (path, bytes, sha256,
+        mb_per_second, resumes, ...) plus the faststart status; sha256 is that
+        of the file as saved
+    """
+    if output_path is None:
+        # Continue an interrupted download of the same job instead of starting a new file
+        output_dir = output_dir or ""
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        pattern = os.path.join(glob.escape(output_dir), f"generated_video_*_{video_id}.mp4{TEMP_SUFFIX}")
+        partials = sorted(glob.glob(pattern))
+        if partials:
+            output_path = partials[-1][:-len(TEMP_SUFFIX)]
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = os.path.join(output_dir, f"generated_video_{timestamp}_{video_id}.mp4")
+
+    metrics = get_metrics()
+    try:
+        result = download_file(
+            f"{BASE_URL}/{video_id}/content",
+            output_path,
+            headers=auth_headers(),
+            transport=transport,
+            segments=segments
+        )
+    except DownloadHTTPError as e:
+        metrics.inc("glimpse_errors_total", stage="download")
+        raise VideoAPIError.from_response("Failed to download video", e.response)
+    except DownloadError:
+        metrics.inc("glimpse_errors_total", stage="download")
+        raise
+
+    metrics.observe_stage("download", result["seconds"])
+    metrics.inc("glimpse_requests_total", stage="download")
+    metrics.inc("glimpse_video_bytes_total", result["bytes_transferred"])
+    if result["resumes"]:
+        metrics.inc("glimpse_retries_total", result["resumes"], stage="download", reason="resume")
+    if faststart:
+        result["faststart"] = _faststart_download(result)
+    return result
+
+
+def _faststart_download(result: Dict[str, Any]) -> Dict[str, Any]:
+    # Rewrite the downloaded MP4 for progressive playback; a failure keeps the file as downloaded
+    metrics = get_metrics()
+    try:
+        rewrite = make_faststart(result["path"])
+    except (OSError, FaststartError) as e:
+        metrics.inc("glimpse_errors_total", stage="faststart")
+        return {"status": "error", "error": str(e)}
+    metrics.observe_stage("faststart", rewrite["seconds"])
+    metrics.inc("glimpse_requests_total", stage="faststart")
+    if rewrite["status"] == "relocated":
+        result["bytes"] = rewrite["bytes"]
+        result["sha256"] = rewrite["sha256"]
+    return {key: rewrite[key] for key in ("status", "seconds", "reason") if key in rewrite}
+
+
+def record_render(model: str, duration: str, render_seconds: float, status: str):
+    """
+    Record a finished render: latency, rendered seconds and estimated cost.
+
+    Args:
+        model: Model name (sora-2 or sora-2-pro)
+        duration: Video duration in seconds
+        render_seconds: Time from submission to terminal status
+        status: Final job status
+    """
+    metrics = get_metrics()
+    if status != "completed":
+        metrics.inc("glimpse_errors_total", stage="render")
+        return
+    seconds = int(duration)
+    metrics.observe_stage("render", render_seconds)
+    metrics.inc("glimpse_requests_total", stage="render")
+    metrics.inc("glimpse_video_seconds_total", seconds, model=model)
+    metrics.inc("glimpse_video_cost_dollars_total",
+                seconds * get_model_config(model)["cost_per_second"], model=model)
+
+
+def find_cached_render(prompt: str, model: str, duration: str = DURATION, size: str = SIZE,
+                       store: Optional[VideoJobStore] = None) -> Optional[Dict[str, Any]]:
+    """
+    Look up an earlier job for the same (prompt, model, size, seconds) and count the hit.
+
+    Args:
+        prompt: Text description for video generation
+        model: Model name (sora-2 or sora-2-pro)
+        duration: Video duration in seconds
+        size: Video resolution
+        store: Job registry (default: the shared process-wide one)
+
+    Returns:
+        The job with "cache_hit" set to "file" (its MP4 is on disk) or
+        "in_flight" (still rendering or not yet downloaded), or None on a miss
+    """
+    store = store or get_job_store()
+    job = store.find_render(prompt, model, size, duration)
+    if job is None:
+        get_metrics().inc("glimpse_render_cache_misses_total")
+        return None
+    job["cache_hit"] = "file" if job["downloaded_at"] is not None else "in_flight"
+    store.record_cache_hit(job["video_id"])
+    get_metrics().inc("glimpse_render_cache_hits_total", kind=job["cache_hit"])
+    return job
+
+
+def job_error_message(info: Dict[str, Any]) -> Optional[str]:
+    """Error message from a failed job object, if any."""
+    error = info.get("error")
+    if not error:
+        return None
+    if isinstance(error, dict):
+        return error.get("message") or json.dumps(error)
+    return str(error)
+
 
 def load_prompt_from_file(filepath: str) -> str:
     """Load the video prompt from a text file."""
@@ -52,16 +293,30 @@ def load_prompt_from_file(filepath: str) -> str:
         raise SystemExit(f"❌ Failed to load prompt from {filepath}: {e}")
 
 
-def generate_video(prompt: str, model: str, cost_per_second: float, duration: str = DURATION, size: str = SIZE) -> str:
+def generate_video(prompt: str, model: str, cost_per_second: float, duration: str = DURATION, size: str = SIZE,
+                   store: Optional[VideoJobStore] = None,
+                   limiter: Optional[SubmissionLimiter] = None,
+                   force: bool = False) -> str:
     """
     Generate a video using Sora API.
 
+    An identical earlier request (same prompt, model, size and duration) is
+    reused: its MP4 is returned right away if it is still on disk, and a job
+    that is still rendering is waited on instead of submitting a new one.
+    Identical calls made at the same time (from several threads) share one
+    submission instead of each paying for a render.
+
     Args:
         prompt: Text description for video generation
         model: Model name (sora-2 or sora-2-pro)
         cost_per_second: Cost per second for the selected model
         duration: Video duration in seconds (max 12)
         size: Video resolution (default: 1280x720 landscape)
+        store: Job registry that records the submission and its progress
+            (default: the shared process-wide one)
+        limiter: Per-model rate/concurrency limiter shared with other processes
+            (default: the shared process-wide one)
+        force: Always submit a new render, even for a cached request
 
     Returns:
         Path to the saved video file
@@ -77,92 +332,138 @@ def generate_video(prompt: str, model: str, cost_per_second: float, duration: st
     print(f"\nPrompt:\n{prompt[:200]}..." if len(prompt) > 200 else f"\nPrompt:\n{prompt}")
     print("="*80 + "\n")
 
-    # Step 1: Submit generation job
-    print("⏳ Submitting video generation job...")
-
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "seconds": duration,
-        "size": size,
-    }
+    store = store or get_job_store()
+    limiter = limiter or get_submission_limiter()
+
+    def report_wait(seconds: float, reason: str):
+        print(f"  ⏳ Queued ({reason}), waiting {seconds:.1f}s...")
+
+    def find_or_submit():
+        # (cached, None, None) for a render cache hit, (None, job, slot) for a new submission
+        cached = None if force else find_cached_render(prompt, model, duration, size, store)
+        if cached is not None:
+            return cached, None, None
+        # Step 1: Submit generation job (queued behind other processes when over the limits)
+        print("⏳ Submitting video generation job...")
+        job, slot = limiter.submit(model, lambda: submit_video_job(prompt, model, duration, size),
+                                   on_wait=report_wait)
+        # Recorded right away so check_video.py --resume can pick it up if this process dies
+        store.record_submission(job["id"], prompt, model, size, duration,
+                                cost=round(int(duration) * cost_per_second, 2),
+                                status=job.get("status", "queued"))
+        return None, job, slot
 
     try:
-        resp = requests.post(BASE_URL, headers=HEADERS, json=payload)
+        if force:
+            cached, job, slot = find_or_submit()
+        else:
+            # The job row is only written after the POST, so identical requests waiting on the
+            # limiter together would each submit; coalesce them and let the others attach
+            key = (hash_prompt(prompt), model, size, str(duration))
+            (cached, job, slot), shared = _submissions.do(key, find_or_submit)
+            if shared:
+                cached = find_cached_render(prompt, model, duration, size, store)
+                job = slot = None
+                if cached is None:
+                    cached, job, slot = find_or_submit()
+
+    except VideoAPIError as e:
+        print(f"❌ API Error: {e.status_code}")
+        print(f"Response: {e.response_text}")
+        raise SystemExit("Video generation request failed.")
+
+    except requests.exceptions.RequestException as e:
+        raise SystemExit(f"❌ Network error: {e}")
 
-        if resp.status_code != 200:
-            print(f"❌ API Error: {resp.status_code}")
-            print(f"Response: {resp.text}")
-            raise SystemExit("Video generation request failed.")
+    if cached is not None and cached["cache_hit"] == "file":
+        print(f"✓ Identical render already on disk (job {cached['video_id']})")
+        print(f"File: {cached['output_path']}")
+        print(f"Saved: ${int(duration) * cost_per_second:.2f} (pass --force to render again)\n")
+        return cached["output_path"]
 
-        job = resp.json()
+    if cached is not None:
+        # Attach to the identical job that is already rendering; it holds its own slot
+        video_id = cached["video_id"]
+        print(f"✓ Identical render already in progress, attaching to it")
+        print(f"  Job ID: {video_id}")
+        print(f"  Status: {cached['status']}\n")
+    else:
         video_id = job["id"]
         print(f"✓ Job created successfully")
         print(f"  Job ID: {video_id}")
         print(f"  Status: {job['status']}\n")
 
-    except requests.exceptions.RequestException as e:
-        raise SystemExit(f"❌ Network error: {e}")
-
     # Step 2: Poll for completion
     print("⏳ Generating video (this may take a few minutes)...\n")
 
     start_time = time.time()
-    last_progress = None
+    schedule = AdaptivePollSchedule()
     retry_count = 0
     max_retries = 5
 
     while True:
         try:
-            status_resp = requests.get(
-                f"{BASE_URL}/{video_id}",
-                headers={"Authorization": f"Bearer {API_KEY}"}
-            )
-
-            if status_resp.status_code == 403:
-                # Handle verification/permission errors with retry
-                retry_count += 1
-                if retry_count <= max_retries:
-                    print(f"  ⚠️  Authorization issue (403), retrying ({retry_count}/{max_retries})...")
-                    time.sleep(10)  # Wait longer for verification to propagate
+            try:
+                info = get_video_status(video_id)
+            except VideoAPIError as e:
+                if e.status_code == 429:
+                    # Rate limited: wait as long as the server asks
+                    get_metrics().inc("glimpse_retries_total", stage="poll", reason="429")
+                    print("  ⚠️  Rate limited (429), backing off...")
+                    time.sleep(schedule.next_interval(retry_after=e.retry_after))
                     continue
-                else:
-                    print(f"❌ Status check error: {status_resp.status_code}")
-                    print(f"Response: {status_resp.text}")
+                if e.status_code == 403:
+                    # Handle verification/permission errors with retry
+                    retry_count += 1
+                    if retry_count <= max_retries:
+                        get_metrics().inc("glimpse_retries_total", stage="poll", reason="403")
+                        print(f"  ⚠️  Authorization issue (403), retrying ({retry_count}/{max_retries})...")
+                        # Wait longer for verification to propagate
+                        time.sleep(schedule.next_interval(retry_after=max(e.retry_after or 0, 10)))
+                        continue
+                    print(f"❌ Status check error: {e.status_code}")
+                    print(f"Response: {e.response_text}")
                     print("\n⚠️  The video may still be processing. Check your OpenAI dashboard:")
                     print(f"    https://platform.openai.com/videos/{video_id}")
                     raise SystemExit("Failed to check video status after multiple retries.")
 
-            if status_resp.status_code != 200:
-                print(f"❌ Status check error: {status_resp.status_code}")
-                print(f"Response: {status_resp.text}")
+                print(f"❌ Status check error: {e.status_code}")
+                print(f"Response: {e.response_text}")
                 raise SystemExit("Failed to check video status.")
 
             # Reset retry count on successful response
             retry_count = 0
 
-            info = status_resp.json()
             status = info["status"]
             progress = info.get("progress")
+            store.update_status(video_id, status, progress, job_error_message(info))
+            limiter.heartbeat(slot)
 
-            # Only print if progress changed or every 5 seconds
+            # Polls are spaced out adaptively, so report every one
             elapsed = time.time() - start_time
-            if progress != last_progress or elapsed % 5 < 3:
-                progress_bar = "█" * int((progress or 0) / 10) + "░" * (10 - int((progress or 0) / 10))
-                print(f"  Status: {status.upper():12} | Progress: [{progress_bar}] {progress}% | Elapsed: {elapsed:.0f}s")
-                last_progress = progress
+            progress_bar = "█" * int((progress or 0) / 10) + "░" * (10 - int((progress or 0) / 10))
+            print(f"  Status: {status.upper():12} | Progress: [{progress_bar}] {progress}% | Elapsed: {elapsed:.0f}s")
 
             # Check if complete
             if status in ("completed", "failed", "canceled"):
                 break
 
-            time.sleep(3)
+            # Poll slowly while the render is far from done, faster near the end
+            schedule.observe(progress)
+            time.sleep(schedule.next_interval())
 
         except requests.exceptions.RequestException as e:
+            get_metrics().inc("glimpse_retries_total", stage="poll", reason="network")
             print(f"❌ Network error during polling: {e}")
             time.sleep(5)
             continue
 
+    # The render no longer counts against the in-flight limit (a crashed process's slot
+    # is reclaimed automatically)
+    limiter.release(slot)
+    if cached is None:
+        # An attached job's render and cost were recorded by the request that submitted it
+        record_render(model, duration, time.time() - start_time, status)
     print()
 
     if status != "completed":
@@ -170,33 +471,22 @@ def generate_video(prompt: str, model: str, cost_per_second: float, duration: st
         print(f"Final status: {info}")
         raise SystemExit("Video did not complete successfully.")
 
+    if cached is not None:
+        job = store.get(video_id)
+        if job["output_path"] and os.path.exists(job["output_path"]):
+            # The request that submitted the job has already downloaded it
+            print(f"✓ Video downloaded by the original request: {job['output_path']}\n")
+            return job["output_path"]
+
     # Step 3: Download the video
     print("⏳ Downloading video...")
 
     try:
-        download_resp = requests.get(
-            f"{BASE_URL}/{video_id}/content",
-            headers={"Authorization": f"Bearer {API_KEY}"},
-            stream=True,
-        )
-
-        if download_resp.status_code != 200:
-            print(f"❌ Download error: {download_resp.status_code}")
-            print(f"Response: {download_resp.text}")
-            raise SystemExit("Failed to download video.")
-
-        # Create output filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = f"generated_video_{timestamp}_{video_id}.mp4"
+        download = download_video(video_id)
+        output_path = download["path"]
+        store.mark_downloaded(video_id, output_path, download["sha256"])
 
-        with open(output_path, "wb") as f:
-            total_size = 0
-            for chunk in download_resp.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    total_size += len(chunk)
-
-        file_size_mb = total_size / (1024 * 1024)
+        file_size_mb = download["bytes"] / (1024 * 1024)
 
         print(f"✓ Video downloaded successfully\n")
         print("="*80)
@@ -204,20 +494,40 @@ def generate_video(prompt: str, model: str, cost_per_second: float, duration: st
         print("="*80)
         print(f"File: {output_path}")
         print(f"Size: {file_size_mb:.2f} MB")
+        print(f"Download: {download['mb_per_second']:.2f} MB/s, {download['resumes']} resume(s)")
+        if "faststart" in download:
+            print(f"Faststart: {download['faststart']['status']}")
+        print(f"SHA-256: {download['sha256']}")
         print(f"Duration: {duration} seconds")
         print(f"Cost: ${int(duration) * cost_per_second:.2f}")
         print(f"Total time: {time.time() - start_time:.0f}s")
+        connection_stats = get_transport().stats()["video_api"]
+        print(f"HTTP: {connection_stats['requests']} requests over "
+              f"{connection_stats['new_connections']} connection(s)")
         print("="*80 + "\n")
 
         return output_path
 
+    except VideoAPIError as e:
+        print(f"❌ Download error: {e.status_code}")
+        print(f"Response: {e.response_text}")
+        raise SystemExit("Failed to download video.")
+
+    except DownloadError as e:
+        print(f"❌ Download error: {e}")
+        print(f"Run python check_video.py {video_id} to retry; the partial file is kept and resumed.")
+        raise SystemExit("Failed to download video.")
+
     except requests.exceptions.RequestException as e:
         raise SystemExit(f"❌ Network error during download: {e}")
 
 
 def main():
     """Main entry point for video generation."""
-    if len(sys.argv) < 2:
+    # --force renders again even when an identical video is already on disk
+    force = "--force" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    if not args:
         print("Usage:")
         print("  1. From prompt text file:")
         print('     python generate_video.py <path_to_prompt.txt>')
@@ -225,11 +535,16 @@ def main():
         print("  2. With custom prompt:")
         print('     python generate_video.py "Your custom prompt here"')
         print()
+        print("  Add --force to render again when an identical video already exists.")
+        print()
         print("Example:")
         print('     python generate_video.py prompt_ai_coach_20250114_023958.txt')
         sys.exit(1)
 
-    input_arg = sys.argv[1]
+    if not os.getenv("OPENAI_API_KEY"):
+        raise SystemExit("❌ OPENAI_API_KEY not found in .env file")
+
+    input_arg = args[0]
 
     # Check if input is a text file or a direct prompt
     if input_arg.endswith('.txt') and os.path.exists(input_arg):
@@ -241,6 +556,12 @@ def main():
         # Treat as direct prompt
         prompt = input_arg
 
+    # Saved prompts predate the compactor; fit them to the prompt ceiling
+    prompt, compaction = compact_prompt(prompt)
+    if compaction["final_chars"] < compaction["original_chars"]:
+        print(f"✂️  Compacted prompt: {compaction['original_chars']} → {compaction['final_chars']} chars "
+              f"({compaction['original_tokens']} → {compaction['final_tokens']} tokens)")
+
     # Ask user to select model
     print("\n" + "="*80)
     print("SELECT MODEL")
@@ -262,9 +583,16 @@ def main():
 
     print(f"✓ Selected: {selected_model}\n")
 
+    for exporter in start_exporter_from_env():
+        print(f"📈 Exporting metrics to {exporter}")
+
+    # Optionally open the API connection before submitting so the handshake is off the critical path
+    if os.getenv("GLIMPSE_HTTP_PREWARM") == "1":
+        get_transport().prewarm(connections=1, include_openai=False)
+
     # Generate the video
     try:
-        output_file = generate_video(prompt, selected_model, cost_per_second)
+        output_file = generate_video(prompt, selected_model, cost_per_second, force=force)
         print(f"✅ All done! Your video is ready: {output_file}")
     except KeyboardInterrupt:
         print("\n\n❌ Generation cancelled by user")
@@ -0,0 +1,218 @@
+"""
+Hedged requests for agent LLM calls.
+
+A few chat completions take far longer than the rest, and they set the
+pipeline's p99. With hedging, a request still running after its deadline (a
+percentile of the stage's recent request latencies, e.g. p95) is sent a second
+time; whichever answers first is used and the other is cancelled.
+
+Only the network request is hedged: agents run it inside their
+AdaptiveLimiter slot, one attempt at a time, so slot waits and retry backoff
+neither count toward the deadline nor get duplicated. The caller can also
+hold a hedge back (allow=limiter.has_headroom), so no hedge is sent while
+other calls are queued, rate limited or backing off.
+
+Extra spend is capped by a budget: every call earns `budget` hedge tokens
+(0.1 = at most one hedge per ten calls over time, with a small burst
+allowance), and a hedge is only sent when a whole token is available.
+
+Each hedged call reports its deadline, the winner and an estimate of the
+latency saved: the mean recent latency of calls slower than this one, minus
+this call's latency (a straggler that was cancelled cannot be timed exactly).
+"""
+
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple, TypeVar
+
+from metrics import ATTEMPT_SECONDS, MetricsRegistry, get_metrics
+
+T = TypeVar("T")
+
+# Hedge once a call is slower than this percentile of the stage's recent latencies
+DEFAULT_HEDGE_PERCENTILE = float(os.getenv("GLIMPSE_HEDGE_PERCENTILE", "95"))
+# Hedge tokens earned per call (the long-run cap on extra requests per call)
+DEFAULT_HEDGE_BUDGET = float(os.getenv("GLIMPSE_HEDGE_BUDGET", "0.1"))
+# Deadline used until the stage has MIN_SAMPLES latencies to take a percentile from
+DEFAULT_INITIAL_DEADLINE = float(os.getenv("GLIMPSE_HEDGE_INITIAL_DEADLINE", "30"))
+MIN_SAMPLES = 20
+# Unused hedge tokens are capped so a quiet period cannot fund a burst of hedges
+MAX_BURST = 3.0
+
+
+class HedgePolicy:
+    """
+    Hedge deadline, spend budget and statistics for one agent stage.
+
+    Args:
+        stage: Stage whose request latencies set the deadline (e.g. "scriptwriter")
+        percentile: Latency percentile used as the hedge deadline
+        budget: Hedge tokens earned per call (0 disables hedging)
+        initial_deadline: Deadline (seconds) while there are too few samples
+        metrics: Registry holding the stage latencies (default: the shared one)
+    """
+
+    def __init__(self, stage: str,
+                 percentile: float = DEFAULT_HEDGE_PERCENTILE,
+                 budget: float = DEFAULT_HEDGE_BUDGET,
+                 initial_deadline: float = DEFAULT_INITIAL_DEADLINE,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.stage = stage
+        self.percentile = percentile
+        self.budget = budget
+        self.initial_deadline = initial_deadline
+        self.metrics = metrics or get_metrics()
+        self._lock = threading.Lock()
+        # Start with one token so the very first straggler can be hedged
+        # (none when budget=0, which disables hedging)
+        self._tokens = 1.0 if budget > 0 else 0.0
+        self._stats = {
+            "calls": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "budget_exhausted": 0,
+            "held_back": 0,
+            "latency_saved_seconds": 0.0
+        }
+
+    def deadline(self) -> float:
+        """Seconds to wait for the original request before hedging."""
+        samples = self.metrics.recent(ATTEMPT_SECONDS, stage=self.stage)
+        if len(samples) < MIN_SAMPLES:
+            return self.initial_deadline
+        return self.metrics.percentile(ATTEMPT_SECONDS, self.percentile, stage=self.stage)
+
+    def call(self, fn: Callable[[], T],
+             allow: Optional[Callable[[], bool]] = None) -> Tuple[T, Dict[str, Any]]:
+        """
+        Run a blocking request with hedging.
+
+        A losing request that has already started cannot be interrupted from
+        another thread; it finishes in the background and its result is discarded.
+
+        Args:
+            fn: Sends the request once (no queueing or retries of its own)
+            allow: Checked at the deadline; a hedge is only sent if it returns True
+
+        Returns:
+            (result, hedge info)
+        """
+        deadline = self._begin()
+        start_time = time.perf_counter()
+        primary = _run_in_thread(fn)
+        done, _ = wait([primary], timeout=deadline)
+        if done or not self._take_token(allow):
+            return primary.result(), self._finish(deadline, start_time, hedged=False)
+
+        hedge = _run_in_thread(fn)
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+            if winner is not None or not pending:
+                break
+        for future in pending:
+            future.cancel()
+        if winner is None:
+            # Both failed: report the original request's error
+            raise primary.exception()
+        return winner.result(), self._finish(deadline, start_time, hedged=True, hedge_won=winner is hedge)
+
+    async def acall(self, fn: Callable[[], Awaitable[T]],
+                    allow: Optional[Callable[[], bool]] = None) -> Tuple[T, Dict[str, Any]]:
+        """Async counterpart of call(); the losing request is cancelled."""
+        deadline = self._begin()
+        start_time = time.perf_counter()
+        primary = asyncio.ensure_future(fn())
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=deadline)
+            if done or not self._take_token(allow):
+                return await primary, self._finish(deadline, start_time, hedged=False)
+
+            hedge = asyncio.ensure_future(fn())
+            pending = {primary, hedge}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None or not pending:
+                    break
+            if winner is None:
+                raise primary.exception()
+            return winner.result(), self._finish(deadline, start_time, hedged=True, hedge_won=winner is hedge)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["hedge_rate"] = round(stats["hedged"] / stats["calls"], 3) if stats["calls"] else 0.0
+        stats["latency_saved_seconds"] = round(stats["latency_saved_seconds"], 3)
+        return stats
+
+    def _begin(self) -> float:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._tokens = min(self._tokens + self.budget, MAX_BURST)
+        return self.deadline()
+
+    def _take_token(self, allow: Optional[Callable[[], bool]] = None) -> bool:
+        if allow is not None and not allow():
+            with self._lock:
+                self._stats["held_back"] += 1
+            return False
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self._stats["hedged"] += 1
+                hedged = True
+            else:
+                self._stats["budget_exhausted"] += 1
+                hedged = False
+        if hedged:
+            self.metrics.inc("glimpse_hedges_total", stage=self.stage)
+        else:
+            self.metrics.inc("glimpse_hedge_budget_exhausted_total", stage=self.stage)
+        return hedged
+
+    def _finish(self, deadline: float, start_time: float, hedged: bool,
+                hedge_won: bool = False) -> Dict[str, Any]:
+        latency = time.perf_counter() - start_time
+        saved = self._estimate_saved(latency) if hedge_won else 0.0
+        self.metrics.observe(ATTEMPT_SECONDS, latency, stage=self.stage)
+        if hedge_won:
+            self.metrics.inc("glimpse_hedge_wins_total", stage=self.stage)
+            with self._lock:
+                self._stats["hedge_wins"] += 1
+                self._stats["latency_saved_seconds"] += saved
+        return {
+            "hedged": hedged,
+            "winner": "hedge" if hedge_won else "primary",
+            "deadline_seconds": round(deadline, 3),
+            "latency_saved_seconds": round(saved, 3)
+        }
+
+    def _estimate_saved(self, latency: float) -> float:
+        # The cancelled original was still running at `latency`; expect it to take as
+        # long as the recent calls that were slower than that
+        slower = [sample for sample in self.metrics.recent(ATTEMPT_SECONDS, stage=self.stage) if sample > latency]
+        return sum(slower) / len(slower) - latency if slower else 0.0
+
+
+def _run_in_thread(fn: Callable[[], T]) -> Future:
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
@@ -0,0 +1,485 @@
+"""
+Fragmented-MP4 / HLS segmenter for generated videos.
+
+A 12-second clip served as one MP4 makes a phone download the whole file (or
+at least its index and a large range) before playback starts. segment_video()
+turns a downloaded MP4 into an HLS stream: an init segment (ftyp + moov with
+the codec configuration and no samples), a few short fragmented-MP4 media
+segments (moof + mdat) and a VOD playlist that references them. Samples are
+copied as they are; nothing is re-encoded and ffmpeg is not needed.
+
+- The source is read through a memory map; sample data is written to each
+  segment from slices of the map (adjacent samples are written as one run),
+  so the media data is never copied into Python objects
+- Segments start on a keyframe of the video track, at the first keyframe
+  at least segment_seconds after the previous cut; the audio samples up to
+  the same time go into the same segment
+- segment_directory() segments every MP4 in a directory in parallel across a
+  process pool and reports segments/second
+
+Usage:
+    result = segment_video("generated_video.mp4", "hls/generated_video")
+    python hls_segmenter.py examples/ --output-dir hls --workers 4
+"""
+
+import os
+import sys
+import math
+import mmap
+import glob
+import time
+import bisect
+import struct
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from faststart import Box, FaststartError, parse_boxes
+
+DEFAULT_SEGMENT_SECONDS = float(os.getenv("GLIMPSE_HLS_SEGMENT_SECONDS", "2"))
+DEFAULT_WORKERS = int(os.getenv("GLIMPSE_HLS_WORKERS", "0")) or None
+
+PLAYLIST_NAME = "playlist.m3u8"
+INIT_NAME = "init.mp4"
+SEGMENT_NAME = "segment_{:05d}.m4s"
+
+# trun sample_flags: keyframe (depends on no other sample) / non-keyframe
+_SYNC_SAMPLE_FLAGS = 0x02000000
+_NON_SYNC_SAMPLE_FLAGS = 0x01010000
+
+# trun flags: data-offset, sample-duration, sample-size, sample-flags, composition time offset
+_TRUN_FLAGS = 0x000001 | 0x000100 | 0x000200 | 0x000400
+_TRUN_CTS_FLAG = 0x000800
+# tfhd flag: sample data offsets are relative to the start of the moof box
+_TFHD_DEFAULT_BASE_IS_MOOF = 0x020000
+
+
+class SegmentError(Exception):
+    """Raised when a file cannot be segmented (no usable tracks, unsupported tables)."""
+
+
+class _Track:
+    """Sample table of one track, expanded to one entry per sample."""
+
+    def __init__(self, track_id: int, handler: bytes, timescale: int, trak: Box):
+        self.track_id = track_id
+        self.handler = handler
+        self.timescale = timescale
+        self.trak = trak
+        self.offsets = []
+        self.sizes = []
+        self.durations = []
+        self.decode_times = []
+        self.cts_offsets = []
+        self.sync = []
+
+    @property
+    def samples(self) -> int:
+        return len(self.sizes)
+
+
+def segment_video(path: str, output_dir: str,
+                  segment_seconds: float = DEFAULT_SEGMENT_SECONDS) -> Dict[str, Any]:
+    """
+    Write an HLS stream (init segment, fMP4 media segments, playlist) for one MP4.
+
+    Args:
+        path: Progressive MP4 (e.g. a file saved by generate_video)
+        output_dir: Directory for playlist.m3u8, init.mp4 and segment_*.m4s
+        segment_seconds: Target segment length; segments are cut on keyframes
+
+    Returns:
+        Dictionary with path, playlist, segments, duration_seconds,
+        segment_durations, bytes written and seconds taken
+
+    Raises:
+        FaststartError: If the file's box structure cannot be parsed
+        SegmentError: If the file has no segmentable tracks
+    """
+    start_time = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        boxes = parse_boxes(data)
+        types = [box.type for box in boxes]
+        if b"moof" in types:
+            raise SegmentError("File is already fragmented")
+        if b"moov" not in types:
+            raise SegmentError("No moov box")
+        moov = boxes[types.index(b"moov")]
+        tracks = _read_tracks(data, moov)
+
+        written = _write_file(os.path.join(output_dir, INIT_NAME), [_init_segment(data, moov, tracks)])
+        reference = next((track for track in tracks if track.handler == b"vide"), tracks[0])
+        cuts = _cut_points(reference, segment_seconds)
+
+        durations = []
+        with memoryview(data) as source:
+            for number, (first, last) in enumerate(zip(cuts, cuts[1:] + [reference.samples])):
+                start = reference.decode_times[first] / reference.timescale
+                end = _end_time(reference, last) / reference.timescale
+                ranges = [(reference, first, last)] + [
+                    (track, _sample_at(track, start), _sample_at(track, end) if last < reference.samples
+                     else track.samples)
+                    for track in tracks if track is not reference
+                ]
+                written += _write_segment(os.path.join(output_dir, SEGMENT_NAME.format(number)),
+                                          source, number + 1, ranges)
+                durations.append(end - start)
+
+    playlist = os.path.join(output_dir, PLAYLIST_NAME)
+    written += _write_file(playlist, [_playlist(durations).encode("utf-8")])
+    return {
+        "path": path,
+        "playlist": playlist,
+        "segments": len(durations),
+        "duration_seconds": round(sum(durations), 3),
+        "segment_durations": [round(duration, 3) for duration in durations],
+        "bytes": written,
+        "seconds": round(time.perf_counter() - start_time, 4)
+    }
+
+
+def segment_directory(input_dir: str, output_dir: str,
+                      segment_seconds: float = DEFAULT_SEGMENT_SECONDS,
+                      workers: Optional[int] = DEFAULT_WORKERS) -> Dict[str, Any]:
+    """
+    Segment every MP4 in a directory in parallel, one process per video.
+
+    Each video goes to output_dir/<file name without .mp4>/.
+
+    Args:
+        input_dir: Directory of MP4 files
+        output_dir: Parent directory for the per-video HLS directories
+        segment_seconds: Target segment length
+        workers: Worker processes (default: one per CPU)
+
+    Returns:
+        Dictionary with videos (per-file results; failures have status "error"),
+        segments, bytes, seconds, segments_per_second and mb_per_second
+    """
+    paths = sorted(glob.glob(os.path.join(input_dir, "*.mp4")))
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(segment_video, path,
+                            os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0]),
+                            segment_seconds)
+            for path in paths
+        ]
+        videos = []
+        for path, future in zip(paths, futures):
+            try:
+                videos.append({"status": "success", **future.result()})
+            except (OSError, FaststartError, SegmentError) as e:
+                videos.append({"status": "error", "path": path, "error": str(e)})
+    seconds = time.perf_counter() - start_time
+
+    succeeded = [video for video in videos if video["status"] == "success"]
+    segments = sum(video["segments"] for video in succeeded)
+    input_bytes = sum(os.path.getsize(video["path"]) for video in succeeded)
+    return {
+        "videos": videos,
+        "failed": len(videos) - len(succeeded),
+        "segments": segments,
+        "bytes": sum(video["bytes"] for video in succeeded),
+        "seconds": round(seconds, 3),
+        "segments_per_second": round(segments / seconds, 1) if seconds > 0 else 0.0,
+        "mb_per_second": round(input_bytes / (1024 * 1024) / seconds, 1) if seconds > 0 else 0.0
+    }
+
+
+# --- reading the sample tables -------------------------------------------------------
+
+
+def _children(data, box: Box) -> Dict[bytes, Box]:
+    return {child.type: child for child in parse_boxes(data, box.offset + box.header_size, box.end)}
+
+
+def _full_box(data, box: Box) -> Tuple[int, int]:
+    # (version, offset of the body after version/flags)
+    body = box.offset + box.header_size
+    return data[body], body + 4
+
+
+def _timescale(data, box: Box) -> int:
+    # mvhd / mdhd: timescale follows the 32- or 64-bit creation and modification times
+    version, body = _full_box(data, box)
+    return struct.unpack_from(">I", data, body + (16 if version == 1 else 8))[0]
+
+
+def _table(data, box: Optional[Box], fields: str) -> List[Tuple[int, ...]]:
+    # Entry count followed by fixed-size entries
+    if box is None:
+        return []
+    _, body = _full_box(data, box)
+    count = struct.unpack_from(">I", data, body)[0]
+    size = struct.calcsize(">" + fields)
+    if body + 4 + count * size > box.end:
+        raise SegmentError(f"Truncated {box.type.decode()} table")
+    flat = struct.unpack_from(f">{count * fields}", data, body + 4)
+    width = len(fields)
+    return [flat[i:i + width] for i in range(0, len(flat), width)]
+
+
+def _read_tracks(data, moov: Box) -> List[_Track]:
+    tracks = []
+    for trak in parse_boxes(data, moov.offset + moov.header_size, moov.end):
+        if trak.type != b"trak":
+            continue
+        try:
+            trak_boxes = _children(data, trak)
+            mdia = _children(data, trak_boxes[b"mdia"])
+            minf = _children(data, mdia[b"minf"])
+            stbl = _children(data, minf[b"stbl"])
+            tkhd, hdlr, mdhd = trak_boxes[b"tkhd"], mdia[b"hdlr"], mdia[b"mdhd"]
+        except KeyError as e:
+            raise SegmentError(f"Track is missing its {e.args[0].decode()} box") from e
+        version, body = _full_box(data, tkhd)
+        track_id = struct.unpack_from(">I", data, body + (16 if version == 1 else 8))[0]
+        _, hdlr_body = _full_box(data, hdlr)
+        track = _Track(track_id, bytes(data[hdlr_body + 4:hdlr_body + 8]), _timescale(data, mdhd), trak)
+        _expand_samples(data, track, stbl)
+        if track.samples:
+            tracks.append(track)
+    if not tracks:
+        raise SegmentError("No tracks with samples")
+    return tracks
+
+
+def _expand_samples(data, track: _Track, stbl: Dict[bytes, Box]):
+    if b"stsz" not in stbl:
+        raise SegmentError("Only stsz sample size tables are supported")
+    _, body = _full_box(data, stbl[b"stsz"])
+    sample_size, count = struct.unpack_from(">II", data, body)
+    sizes = [sample_size] * count if sample_size else list(struct.unpack_from(f">{count}I", data, body + 8))
+
+    # stsc runs of chunks with the same samples-per-chunk, applied to the chunk offsets
+    chunk_offsets = [entry[0] for entry in (_table(data, stbl[b"co64"], "Q") if b"co64" in stbl
+                                            else _table(data, stbl.get(b"stco"), "I"))]
+    runs = _table(data, stbl.get(b"stsc"), "III")
+    offsets = []
+    sample = 0
+    for index, (first_chunk, per_chunk, _) in enumerate(runs):
+        last_chunk = runs[index + 1][0] - 1 if index + 1 < len(runs) else len(chunk_offsets)
+        for chunk in range(first_chunk - 1, last_chunk):
+            position = chunk_offsets[chunk]
+            for size in sizes[sample:sample + per_chunk]:
+                offsets.append(position)
+                position += size
+            sample += per_chunk
+    if len(offsets) != count:
+        raise SegmentError(f"Chunk tables describe {len(offsets)} samples, stsz has {count}")
+
+    durations = [delta for run, delta in _table(data, stbl.get(b"stts"), "II") for _ in range(run)]
+    if len(durations) != count:
+        raise SegmentError(f"stts describes {len(durations)} samples, stsz has {count}")
+    decode_times = []
+    elapsed = 0
+    for duration in durations:
+        decode_times.append(elapsed)
+        elapsed += duration
+
+    cts_offsets = [0] * count
+    if b"ctts" in stbl:
+        version, _ = _full_box(data, stbl[b"ctts"])
+        entries = _table(data, stbl[b"ctts"], "Ii" if version == 1 else "II")
+        cts_offsets = [offset for run, offset in entries for _ in range(run)][:count]
+
+    # No stss box means every sample is a sync sample
+    sync = [True] * count
+    if b"stss" in stbl:
+        sync = [False] * count
+        for (number,) in _table(data, stbl[b"stss"], "I"):
+            sync[number - 1] = True
+
+    track.offsets, track.sizes, track.durations = offsets, sizes, durations
+    track.decode_times, track.cts_offsets, track.sync = decode_times, cts_offsets, sync
+
+
+def _cut_points(track: _Track, segment_seconds: float) -> List[int]:
+    # First sample of every segment: the first keyframe at least segment_seconds after the last cut
+    cuts = [0]
+    target = segment_seconds * track.timescale
+    for index in range(1, track.samples):
+        if track.sync[index] and track.decode_times[index] - track.decode_times[cuts[-1]] >= target:
+            cuts.append(index)
+    return cuts
+
+
+def _end_time(track: _Track, end: int) -> int:
+    # Decode time where sample `end` starts (or the track ends)
+    if end < track.samples:
+        return track.decode_times[end]
+    return track.decode_times[-1] + track.durations[-1]
+
+
+def _sample_at(track: _Track, seconds: float) -> int:
+    # First sample decoded at or after `seconds`
+    return bisect.bisect_left(track.decode_times, round(seconds * track.timescale))
+
+
+# --- writing -----------------------------------------------------------------------
+
+
+def _box(box_type: bytes, *payload: bytes) -> bytes:
+    body = b"".join(payload)
+    return struct.pack(">I4s", len(body) + 8, box_type) + body
+
+
+def _full(box_type: bytes, version: int, flags: int, *payload: bytes) -> bytes:
+    return _box(box_type, struct.pack(">I", (version << 24) | flags), *payload)
+
+
+def _init_segment(data, moov: Box, tracks: List[_Track]) -> bytes:
+    """ftyp + moov with each track's codec configuration, empty sample tables and an mvex."""
+    ftyp = _box(b"ftyp", b"iso6", struct.pack(">I", 0), b"iso6", b"iso5", b"mp41")
+    moov_boxes = _children(data, moov)
+    traks = [_init_box(data, track.trak) for track in tracks]
+    trexes = [_full(b"trex", 0, 0, struct.pack(">5I", track.track_id, 1, 0, 0, 0)) for track in tracks]
+    return ftyp + _box(b"moov", bytes(data[moov_boxes[b"mvhd"].offset:moov_boxes[b"mvhd"].end]),
+                       *traks, _box(b"mvex", *trexes))
+
+
+def _init_box(data, box: Box) -> bytes:
+    # Copy a track's boxes, keeping only the sample descriptions from stbl
+    if box.type == b"stbl":
+        stsd = _children(data, box)[b"stsd"]
+        return _box(b"stbl", bytes(data[stsd.offset:stsd.end]),
+                    _full(b"stts", 0, 0, struct.pack(">I", 0)),
+                    _full(b"stsc", 0, 0, struct.pack(">I", 0)),
+                    _full(b"stsz", 0, 0, struct.pack(">II", 0, 0)),
+                    _full(b"stco", 0, 0, struct.pack(">I", 0)))
+    if box.type in (b"trak", b"mdia", b"minf"):
+        children = parse_boxes(data, box.offset + box.header_size, box.end)
+        return _box(box.type, *(_init_box(data, child) for child in children))
+    return bytes(data[box.offset:box.end])
+
+
+def _write_segment(path: str, source: memoryview, sequence: int,
+                   ranges: List[Tuple[_Track, int, int]]) -> int:
+    """Write one moof + mdat fragment with samples [first, last) of each track."""
+    ranges = [(track, first, last) for track, first, last in ranges if last > first]
+    # trun data offsets count from the start of the moof, so measure it first (the offset is fixed-width)
+    moof_size = 16 + 8 + sum(len(_traf(track, first, last, 0)) for track, first, last in ranges)
+    data_offset = moof_size + 8
+    trafs = []
+    for track, first, last in ranges:
+        trafs.append(_traf(track, first, last, data_offset))
+        data_offset += sum(track.sizes[first:last])
+    moof = _box(b"moof", _full(b"mfhd", 0, 0, struct.pack(">I", sequence)), *trafs)
+    mdat_size = 8 + sum(sum(track.sizes[first:last]) for track, first, last in ranges)
+
+    parts = [moof, struct.pack(">I4s", mdat_size, b"mdat")]
+    for track, first, last in ranges:
+        parts.extend(source[start:end] for start, end in _runs(track, first, last))
+    return _write_file(path, parts)
+
+
+def _traf(track: _Track, first: int, last: int, data_offset: int) -> bytes:
+    tfhd = _full(b"tfhd", 0, _TFHD_DEFAULT_BASE_IS_MOOF, struct.pack(">I", track.track_id))
+    tfdt = _full(b"tfdt", 1, 0, struct.pack(">Q", track.decode_times[first]))
+    count = last - first
+    cts = track.cts_offsets[first:last]
+    flags = _TRUN_FLAGS
+    if any(cts):
+        flags |= _TRUN_CTS_FLAG
+    # Version 1 makes composition offsets signed
+    version = 1 if any(offset < 0 for offset in cts) else 0
+    entries = []
+    for index in range(first, last):
+        entries.extend((track.durations[index], track.sizes[index],
+                        _SYNC_SAMPLE_FLAGS if track.sync[index] else _NON_SYNC_SAMPLE_FLAGS))
+        if flags & _TRUN_CTS_FLAG:
+            entries.append(track.cts_offsets[index])
+    entry_format = ("IIIi" if version == 1 else "IIII") if flags & _TRUN_CTS_FLAG else "III"
+    trun = _full(b"trun", version, flags, struct.pack(">Ii", count, data_offset),
+                 struct.pack(">" + entry_format * count, *entries))
+    return _box(b"traf", tfhd, tfdt, trun)
+
+
+def _runs(track: _Track, first: int, last: int) -> List[Tuple[int, int]]:
+    # Byte ranges of samples [first, last), merging samples that are adjacent in the file
+    runs = []
+    for index in range(first, last):
+        start = track.offsets[index]
+        end = start + track.sizes[index]
+        if runs and runs[-1][1] == start:
+            runs[-1] = (runs[-1][0], end)
+        else:
+            runs.append((start, end))
+    return runs
+
+
+def _write_file(path: str, parts: List) -> int:
+    # Write via a temp file so a player never sees a half-written segment
+    temp_path = path + ".tmp"
+    written = 0
+    with open(temp_path, "wb") as f:
+        for part in parts:
+            f.write(part)
+            written += len(part)
+            if isinstance(part, memoryview):
+                part.release()
+    os.replace(temp_path, path)
+    return written
+
+
+def _playlist(durations: List[float]) -> str:
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:7",
+        f"#EXT-X-TARGETDURATION:{math.ceil(max(durations))}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+        "#EXT-X-INDEPENDENT-SEGMENTS",
+        f'#EXT-X-MAP:URI="{INIT_NAME}"',
+    ]
+    for number, duration in enumerate(durations):
+        lines.append(f"#EXTINF:{duration:.6f},")
+        lines.append(SEGMENT_NAME.format(number))
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    """Command-line entry point: segment one MP4 or a directory of them."""
+    parser = argparse.ArgumentParser(description="Convert MP4s into fragmented-MP4 HLS streams")
+    parser.add_argument("input", help="MP4 file or directory of MP4 files")
+    parser.add_argument("--output-dir", default="hls", help="Where the HLS directories are written")
+    parser.add_argument("--segment-seconds", type=float, default=DEFAULT_SEGMENT_SECONDS,
+                        help="Target segment length (segments are cut on keyframes)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Worker processes for a directory (default: one per CPU)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input):
+        output_dir = os.path.join(args.output_dir, os.path.splitext(os.path.basename(args.input))[0])
+        try:
+            result = segment_video(args.input, output_dir, args.segment_seconds)
+        except (OSError, FaststartError, SegmentError) as e:
+            print(f"❌ {args.input}: {e}")
+            sys.exit(1)
+        print(f"✓ {result['playlist']}: {result['segments']} segments "
+              f"({', '.join(f'{d}s' for d in result['segment_durations'])}) in {result['seconds']}s")
+        return
+
+    report = segment_directory(args.input, args.output_dir, args.segment_seconds, args.workers)
+    print("\n" + "="*80)
+    print("HLS SEGMENTER")
+    print("="*80)
+    for video in report["videos"]:
+        if video["status"] == "success":
+            print(f"✓ {video['playlist']}: {video['segments']} segments, "
+                  f"{video['duration_seconds']}s, {video['seconds']}s")
+        else:
+            print(f"❌ {video['path']}: {video['error']}")
+    print(f"Videos: {len(report['videos']) - report['failed']} segmented, {report['failed']} failed")
+    print(f"Segments: {report['segments']} in {report['seconds']}s "
+          f"({report['segments_per_second']} segments/s, {report['mb_per_second']} MB/s)")
+    print("="*80 + "\n")
+    if report["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Shared pooled HTTP transport for the agents and the Sora video API.
+
+One HTTPTransport owns:
+- a keep-alive requests.Session (Sora submit / status / download calls)
+- keep-alive httpx clients backing the OpenAI SDK clients used by the agents
+
+Every component gets its connections from the same pools, so status polls
+and downloads reuse warm TLS connections instead of handshaking each time.
+stats() reports how many requests were sent versus how many new connections
+had to be opened.
+"""
+
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from openai import OpenAI, AsyncOpenAI
+
+DEFAULT_POOL_SIZE = int(os.getenv("GLIMPSE_HTTP_POOL_SIZE", "20"))
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 120.0
+API_ROOT = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+
+
+class HTTPTransport:
+    """
+    Keep-alive connection pools shared by every API caller in the process.
+
+    Args:
+        pool_size: Maximum kept-alive connections per host (per pool)
+        connect_timeout: Seconds to wait for a TCP/TLS connection
+        read_timeout: Seconds to wait for response data
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT):
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._httpx_clients = {}
+        self._openai_clients = {}
+        self._httpx_counters = {"requests": 0, "new_connections": 0}
+
+    # --- requests (Sora video API) -------------------------------------------------
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session, applying the default timeouts."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    # --- OpenAI SDK (agents) -------------------------------------------------------
+
+    def openai_client(self, api_key: Optional[str] = None, asynchronous: bool = False):
+        """
+        Return an OpenAI (or AsyncOpenAI) client backed by this transport's pool.
+
+        Clients are shared per (api_key, sync/async), so both agents reuse the
+        same connections.
+        """
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        key = (api_key, asynchronous)
+        with self._lock:
+            client = self._openai_clients.get(key)
+            if client is None:
+                client_class = AsyncOpenAI if asynchronous else OpenAI
+                # Retries are left to adaptive_limiter, which also adapts concurrency to 429s
+                client = client_class(api_key=api_key, http_client=self._httpx_client(asynchronous),
+                                      max_retries=0)
+                self._openai_clients[key] = client
+        return client
+
+    def _httpx_client(self, asynchronous: bool):
+        # Caller holds self._lock (or is single-threaded warm-up code)
+        client = self._httpx_clients.get(asynchronous)
+        if client is None:
+            client = self._build_httpx_client(asynchronous)
+            self._httpx_clients[asynchronous] = client
+        return client
+
+    def _build_httpx_client(self, asynchronous: bool):
+        limits = httpx.Limits(max_connections=self.pool_size,
+                              max_keepalive_connections=self.pool_size)
+        timeout = httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+
+        # httpx reports connection setup through the per-request "trace" extension
+        if asynchronous:
+            async def trace(event_name, info):
+                self._count_trace(event_name)
+
+            async def on_request(request):
+                self._count_request()
+                request.extensions["trace"] = trace
+
+            return httpx.AsyncClient(limits=limits, timeout=timeout,
+                                     event_hooks={"request": [on_request]})
+
+        def trace(event_name, info):
+            self._count_trace(event_name)
+
+        def on_request(request):
+            self._count_request()
+            request.extensions["trace"] = trace
+
+        return httpx.Client(limits=limits, timeout=timeout,
+                            event_hooks={"request": [on_request]})
+
+    def _count_request(self):
+        with self._lock:
+            self._httpx_counters["requests"] += 1
+
+    def _count_trace(self, event_name: str):
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._httpx_counters["new_connections"] += 1
+
+    # --- warm-up and metrics -------------------------------------------------------
+
+    def prewarm(self, connections: int = 2, url: str = API_ROOT, include_openai: bool = True) -> int:
+        """
+        Open keep-alive connections ahead of time so the first real calls skip the handshake.
+
+        Args:
+            connections: Number of parallel connections to open in each pool
+            url: Any URL on the API host
+            include_openai: Also warm the pool behind sync OpenAI clients
+
+        Returns:
+            Number of warm-up requests that completed
+        """
+        connections = max(1, min(connections, self.pool_size))
+        http_client = None
+        if include_openai:
+            with self._lock:
+                http_client = self._httpx_client(False)
+
+        def _warm(_):
+            try:
+                self.session.head(url, timeout=self.timeout).close()
+                if http_client is not None:
+                    http_client.head(url)
+                return 1
+            except (requests.RequestException, httpx.HTTPError):
+                return 0
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(_warm, range(connections)))
+
+    async def aprewarm(self, connections: int = 2, url: str = API_ROOT) -> int:
+        """Async counterpart of prewarm for the pool behind AsyncOpenAI clients."""
+        connections = max(1, min(connections, self.pool_size))
+        with self._lock:
+            http_client = self._httpx_client(True)
+
+        async def _warm():
+            try:
+                await http_client.head(url)
+                return 1
+            except httpx.HTTPError:
+                return 0
+
+        return sum(await asyncio.gather(*(_warm() for _ in range(connections))))
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests sent and connections opened, per pool, to confirm connection reuse."""
+        session_requests, session_connections = self._session_counters()
+        with self._lock:
+            openai_requests = self._httpx_counters["requests"]
+            openai_connections = self._httpx_counters["new_connections"]
+        return {
+            "video_api": _reuse_stats(session_requests, session_connections),
+            "openai": _reuse_stats(openai_requests, openai_connections),
+            "pool_size": self.pool_size
+        }
+
+    def _session_counters(self) -> Tuple[int, int]:
+        requests_sent = connections = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    requests_sent += pool.num_requests
+                    connections += pool.num_connections
+        return requests_sent, connections
+
+    def close(self):
+        """Close the session and the sync OpenAI pool (use aclose for the async pool)."""
+        self.session.close()
+        with self._lock:
+            client = self._httpx_clients.pop(False, None)
+            self._openai_clients = {
+                key: value for key, value in self._openai_clients.items() if key[1]
+            }
+        if client is not None:
+            client.close()
+
+    async def aclose(self):
+        """Close every pool, including the one behind AsyncOpenAI clients."""
+        self.close()
+        with self._lock:
+            client = self._httpx_clients.pop(True, None)
+            self._openai_clients.clear()
+        if client is not None:
+            await client.aclose()
+
+
+def _reuse_stats(requests_sent: int, new_connections: int) -> Dict[str, Any]:
+    reused = max(requests_sent - new_connections, 0)
+    return {
+        "requests": requests_sent,
+        "new_connections": new_connections,
+        "reused_connections": reused,
+        "reuse_rate": round(reused / requests_sent, 3) if requests_sent else 0.0
+    }
+
+
+_default_transport = None
+_default_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """Return the process-wide shared transport, creating it on first use."""
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = HTTPTransport()
+        return _default_transport
@@ -0,0 +1,266 @@
+"""
+Durable SQLite registry of Sora render jobs.
+
+Every submission is recorded with its prompt hash, model, size, duration,
+cost, status, progress, output path and timings. If a process dies mid-poll,
+a restarted process can list the in-flight jobs and resume polling and
+downloading them (see check_video.py --resume).
+
+The store doubles as a render cache: find_render() returns an earlier job for
+the same (prompt, model, size, seconds) whose MP4 is still on disk or which
+is still rendering, so an identical request is never paid for twice.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Any, Optional, List
+
+DEFAULT_DB_PATH = os.getenv("GLIMPSE_JOB_DB", "video_jobs.db")
+
+# Statuses reported by the Sora API while a job is still rendering
+ACTIVE_STATUSES = ("queued", "in_progress")
+TERMINAL_STATUSES = ("completed", "failed", "canceled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS video_jobs (
+    video_id TEXT PRIMARY KEY,
+    prompt_hash TEXT,
+    prompt TEXT,
+    model TEXT,
+    size TEXT,
+    seconds TEXT,
+    cost REAL,
+    status TEXT NOT NULL,
+    progress INTEGER,
+    output_path TEXT,
+    sha256 TEXT,
+    error TEXT,
+    submitted_at REAL,
+    updated_at REAL NOT NULL,
+    completed_at REAL,
+    downloaded_at REAL,
+    cache_hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_video_jobs_status ON video_jobs (status);
+CREATE INDEX IF NOT EXISTS idx_video_jobs_prompt_hash ON video_jobs (prompt_hash);
+"""
+
+# (column, type) pairs added after the initial schema, applied to older databases
+_ADDED_COLUMNS = (
+    ("sha256", "TEXT"),
+    ("cache_hits", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+
+def hash_prompt(prompt: str) -> str:
+    """SHA-256 hex digest of a prompt's exact text."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class VideoJobStore:
+    """
+    Thread-safe SQLite-backed job registry.
+
+    Args:
+        path: SQLite database file (created on first use)
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            # WAL lets several CLIs read while one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+
+    def _migrate(self):
+        # Add columns introduced after a database was first created
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(video_jobs)")}
+        for column, column_type in _ADDED_COLUMNS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE video_jobs ADD COLUMN {column} {column_type}")
+
+    def record_submission(self, video_id: str, prompt: str, model: str, size: str,
+                          seconds: str, cost: Optional[float] = None,
+                          status: str = "queued") -> Dict[str, Any]:
+        """Record a newly submitted job."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO video_jobs (video_id, prompt_hash, prompt, model, size, seconds,
+                                        cost, status, progress, submitted_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    prompt_hash = excluded.prompt_hash, prompt = excluded.prompt,
+                    model = excluded.model, size = excluded.size, seconds = excluded.seconds,
+                    cost = excluded.cost, updated_at = excluded.updated_at
+                """,
+                (video_id, hash_prompt(prompt), prompt, model, size, seconds,
+                 cost, status, now, now)
+            )
+        return self.get(video_id)
+
+    def update_status(self, video_id: str, status: str,
+                      progress: Optional[int] = None,
+                      error: Optional[str] = None):
+        """Record the latest status (creates a bare row for jobs submitted elsewhere)."""
+        now = time.time()
+        completed_at = now if status in TERMINAL_STATUSES else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO video_jobs (video_id, status, progress, error, updated_at, completed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(video_id) DO UPDATE SET
+                    status = excluded.status,
+                    progress = COALESCE(excluded.progress, video_jobs.progress),
+                    error = COALESCE(excluded.error, video_jobs.error),
+                    updated_at = excluded.updated_at,
+                    completed_at = COALESCE(video_jobs.completed_at, excluded.completed_at)
+                """,
+                (video_id, status, progress, error, now, completed_at)
+            )
+
+    def mark_downloaded(self, video_id: str, output_path: str, sha256: Optional[str] = None):
+        """Record where a completed job's MP4 was saved (and its SHA-256 digest)."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                UPDATE video_jobs
+                SET output_path = ?, sha256 = ?, downloaded_at = ?, updated_at = ?,
+                    status = 'completed', progress = 100
+                WHERE video_id = ?
+                """,
+                (output_path, sha256, now, now, video_id)
+            )
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Return one job as a dictionary, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM video_jobs WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def find_render(self, prompt: str, model: str, size: str, seconds: str) -> Optional[Dict[str, Any]]:
+        """
+        Newest reusable job for an identical render request.
+
+        A job is reusable if it is still rendering, completed but not yet
+        downloaded, or downloaded to a file that still exists. Failed jobs and
+        jobs whose file was deleted are skipped.
+
+        Returns:
+            The job dictionary, or None on a cache miss
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT * FROM video_jobs
+                WHERE prompt_hash = ? AND model = ? AND size = ? AND seconds = ?
+                  AND status IN ({",".join("?" * len(ACTIVE_STATUSES))}, 'completed')
+                ORDER BY submitted_at DESC
+                """,
+                (hash_prompt(prompt), model, size, str(seconds)) + ACTIVE_STATUSES
+            ).fetchall()
+        for row in rows:
+            job = dict(row)
+            if job["downloaded_at"] is None or (job["output_path"] and os.path.exists(job["output_path"])):
+                return job
+        return None
+
+    def record_cache_hit(self, video_id: str):
+        """Count one request served by an existing job instead of a new render."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE video_jobs SET cache_hits = cache_hits + 1 WHERE video_id = ?", (video_id,)
+            )
+
+    def in_flight(self) -> List[Dict[str, Any]]:
+        """Jobs that still need polling or downloading."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT * FROM video_jobs
+                WHERE status IN ({",".join("?" * len(ACTIVE_STATUSES))})
+                   OR (status = 'completed' AND downloaded_at IS NULL)
+                ORDER BY submitted_at
+                """,
+                ACTIVE_STATUSES
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def query(self, status: Optional[str] = None, model: Optional[str] = None,
+              prompt_hash: Optional[str] = None, since: Optional[float] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Bulk lookup of jobs, newest first.
+
+        Args:
+            status: Only jobs with this status
+            model: Only jobs rendered with this model
+            prompt_hash: Only jobs for this prompt (see hash_prompt)
+            since: Only jobs submitted at or after this UNIX timestamp
+            limit: Maximum number of rows
+        """
+        clauses, params = [], []
+        for column, value in (("status", status), ("model", model), ("prompt_hash", prompt_hash)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("submitted_at >= ?")
+            params.append(since)
+
+        sql = "SELECT * FROM video_jobs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY COALESCE(submitted_at, updated_at) DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def summary(self) -> Dict[str, Any]:
+        """Job counts per status, total recorded cost and render cache savings."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS jobs, COALESCE(SUM(cost), 0) AS cost, "
+                "COALESCE(SUM(cache_hits), 0) AS hits, COALESCE(SUM(cache_hits * cost), 0) AS saved "
+                "FROM video_jobs GROUP BY status"
+            ).fetchall()
+        return {
+            "by_status": {row["status"]: row["jobs"] for row in rows},
+            "total_jobs": sum(row["jobs"] for row in rows),
+            "total_cost": round(sum(row["cost"] for row in rows), 2),
+            "cache_hits": sum(row["hits"] for row in rows),
+            "cost_saved": round(sum(row["saved"] for row in rows), 2)
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_job_store() -> VideoJobStore:
+    """Return the process-wide job store, creating it on first use."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = VideoJobStore()
+        return _default_store
@@ -0,0 +1,225 @@
+"""
+Incremental parsing of streamed JSON-mode chat completions.
+
+The Scriptwriter returns one JSON object whose top-level fields arrive in
+order (narrative_structure → shot_breakdown → copy_elements →
+final_multimodal_prompt → technical_specs → production_notes). These helpers
+emit each top-level field as soon as its value is complete, so callers can
+act on final_multimodal_prompt before the trailing fields have streamed in.
+"""
+
+import json
+import time
+from typing import Dict, Any, List, Tuple, Optional
+
+# Field downstream code waits on (the Sora prompt)
+FINAL_PROMPT_FIELD = "final_multimodal_prompt"
+
+# Parser states while scanning the top-level object
+_BEFORE_OBJECT = "before_object"
+_EXPECT_KEY = "expect_key"
+_IN_KEY = "in_key"
+_EXPECT_COLON = "expect_colon"
+_EXPECT_VALUE = "expect_value"
+_IN_STRING_VALUE = "in_string_value"
+_IN_CONTAINER_VALUE = "in_container_value"
+_IN_SCALAR_VALUE = "in_scalar_value"
+_EXPECT_COMMA = "expect_comma"
+_DONE = "done"
+
+
+class IncrementalJSONObjectParser:
+    """
+    Push parser that yields (key, value) pairs for a JSON object's top-level members.
+
+    Feed text chunks in arrival order; each call returns the members whose
+    values became complete in that chunk. Nested values are decoded with
+    json.loads once their closing bracket arrives.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = _BEFORE_OBJECT
+        self._start = 0
+        self._key = None
+
+    @property
+    def done(self) -> bool:
+        """True once the closing brace of the top-level object has been seen."""
+        return self._state == _DONE
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next chunk of the streamed object.
+
+        Args:
+            chunk: Next piece of the JSON text
+
+        Returns:
+            List of (key, value) pairs completed by this chunk
+        """
+        self._text += chunk
+        completed = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._state == _IN_KEY:
+                        self._key = json.loads(text[self._start:i + 1])
+                        self._state = _EXPECT_COLON
+                    elif self._depth == 1 and self._state == _IN_STRING_VALUE:
+                        completed.append(self._complete(text[self._start:i + 1]))
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state == _EXPECT_KEY:
+                    self._start = i
+                    self._state = _IN_KEY
+                elif self._depth == 1 and self._state == _EXPECT_VALUE:
+                    self._start = i
+                    self._state = _IN_STRING_VALUE
+
+            elif ch in "{[":
+                if self._depth == 0:
+                    if ch == "{" and self._state == _BEFORE_OBJECT:
+                        self._state = _EXPECT_KEY
+                elif self._depth == 1 and self._state == _EXPECT_VALUE:
+                    self._start = i
+                    self._state = _IN_CONTAINER_VALUE
+                self._depth += 1
+
+            elif ch in "}]":
+                if self._depth == 1 and self._state == _IN_SCALAR_VALUE:
+                    completed.append(self._complete(text[self._start:i]))
+                self._depth -= 1
+                if self._depth == 1 and self._state == _IN_CONTAINER_VALUE:
+                    completed.append(self._complete(text[self._start:i + 1]))
+                elif self._depth == 0:
+                    self._state = _DONE
+
+            elif self._depth == 1:
+                if ch == ":" and self._state == _EXPECT_COLON:
+                    self._state = _EXPECT_VALUE
+                elif ch == ",":
+                    if self._state == _IN_SCALAR_VALUE:
+                        completed.append(self._complete(text[self._start:i]))
+                    self._state = _EXPECT_KEY
+                elif not ch.isspace() and self._state == _EXPECT_VALUE:
+                    self._start = i
+                    self._state = _IN_SCALAR_VALUE
+
+        self._pos = len(text)
+        return completed
+
+    def _complete(self, value_text: str) -> Tuple[str, Any]:
+        self._state = _EXPECT_COMMA
+        return self._key, json.loads(value_text)
+
+
+class ChatStreamAccumulator:
+    """
+    Collects a streamed chat completion and turns it into per-field events.
+
+    Works with both the sync and async OpenAI streams: call consume() for
+    every chunk and read content/usage/timings when the stream ends.
+    """
+
+    def __init__(self, start_time: Optional[float] = None):
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.parser = IncrementalJSONObjectParser()
+        self.usage = {"total_tokens": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self.time_to_first_token = None
+        self.time_to_first_field = None
+        self.time_to_final_prompt = None
+        self.fields_completed = []
+
+    @property
+    def content(self) -> str:
+        """Full message content received so far."""
+        return self.parser.text
+
+    def consume(self, chunk) -> List[Dict[str, Any]]:
+        """
+        Process one streamed chunk.
+
+        Args:
+            chunk: A ChatCompletionChunk from the OpenAI SDK
+
+        Returns:
+            Field events completed by this chunk
+        """
+        if getattr(chunk, "usage", None) is not None:
+            self.usage = {
+                "total_tokens": chunk.usage.total_tokens,
+                "prompt_tokens": chunk.usage.prompt_tokens,
+                "completion_tokens": chunk.usage.completion_tokens
+            }
+
+        events = []
+        for choice in chunk.choices or []:
+            delta = getattr(choice.delta, "content", None)
+            if delta:
+                events.extend(self.consume_text(delta))
+        return events
+
+    def consume_text(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Process a piece of message content directly (e.g. a cached response).
+
+        Args:
+            text: Next piece of the JSON message content
+
+        Returns:
+            Field events completed by this text
+        """
+        elapsed = time.perf_counter() - self.start_time
+        if self.time_to_first_token is None:
+            self.time_to_first_token = elapsed
+        return [
+            self._field_event(field, value, elapsed)
+            for field, value in self.parser.feed(text)
+        ]
+
+    def _field_event(self, field: str, value: Any, elapsed: float) -> Dict[str, Any]:
+        if self.time_to_first_field is None:
+            self.time_to_first_field = elapsed
+        if field == FINAL_PROMPT_FIELD and self.time_to_final_prompt is None:
+            self.time_to_final_prompt = elapsed
+        self.fields_completed.append(field)
+        return {
+            "event": "field",
+            "field": field,
+            "value": value,
+            "elapsed_seconds": round(elapsed, 3)
+        }
+
+    def timings(self) -> Dict[str, Any]:
+        """Streaming timings for result metadata (None when a milestone never happened)."""
+        def _round(value):
+            return round(value, 3) if value is not None else None
+
+        return {
+            "streamed": True,
+            "time_to_first_token_seconds": _round(self.time_to_first_token),
+            "time_to_first_field_seconds": _round(self.time_to_first_field),
+            "time_to_final_prompt_seconds": _round(self.time_to_final_prompt),
+            "fields_completed": list(self.fields_completed)
+        }
@@ -0,0 +1,412 @@
+"""
+Load test for the concept pipeline and the Sora render pipeline.
+
+Starts mock_openai_server.py (or targets --base-url), then drives each
+scenario at increasing concurrency:
+- concept: AsyncVideoProductionPipeline (Creative Director → Scriptwriter)
+- render: RenderPipeline (concept → submit → poll → download)
+
+For every level it reports throughput, item latency percentiles, per-stage
+latency percentiles (from metrics.py), errors and retries, and resource usage
+(CPU time, peak RSS, threads, HTTP connections opened). The report can be
+saved as JSON and compared against a saved baseline; the process exits with
+status 1 when throughput drops or p95 latency grows beyond the tolerance, so
+it can gate a deploy.
+
+Usage:
+    python loadtest.py --levels 1,4,16 --render 2:4 --output loadtest.json
+    python loadtest.py --baseline loadtest.json --tolerance 0.2
+"""
+
+import os
+import sys
+import math
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from mock_openai_server import MockOpenAIServer, add_config_arguments, config_from_args
+
+SCENARIOS = ("concept", "render")
+
+DEFAULT_LEVELS = "1,2,4,8,16"
+
+SAMPLE_ONE_LINERS = [
+    "An AI-powered grocery scanner that tracks nutrition and suggests healthier swaps",
+    "A budgeting app that automatically splits shared expenses between roommates",
+    "A smart water bottle that reminds you to drink and syncs with your fitness tracker",
+    "A real-time AI scheduler that fills last-minute cancellations at clinics",
+    "A no-code tool that turns any spreadsheet into a mobile app in minutes",
+    "A legal assistant that reviews contracts and flags risky clauses instantly",
+    "A pharmacy copilot that answers medication questions around the clock",
+    "A drone startup that maps farmland and spots crop disease early",
+]
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile (same definition as metrics.py)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(math.ceil(p / 100.0 * len(ordered))), 1)
+    return round(ordered[rank - 1], 3)
+
+
+class ResourceSampler:
+    """CPU time, peak RSS and thread count of this process over one measurement."""
+
+    def __init__(self):
+        self.peak_threads = threading.active_count()
+        self._cpu_start = _cpu_seconds()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="loadtest-sampler", daemon=True)
+        self._thread.start()
+
+    def _sample(self):
+        while not self._stop.wait(0.2):
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+
+    def finish(self, wall_seconds: float) -> Dict[str, Any]:
+        self._stop.set()
+        self._thread.join()
+        cpu = _cpu_seconds() - self._cpu_start
+        return {
+            "cpu_seconds": round(cpu, 2),
+            "cpu_utilization": round(cpu / wall_seconds, 3) if wall_seconds else 0.0,
+            "max_rss_mb": _max_rss_mb(),
+            "peak_threads": self.peak_threads
+        }
+
+
+def _cpu_seconds() -> float:
+    if resource is None:
+        return time.process_time()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _max_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _one_liners(count: int, source: List[str]) -> List[str]:
+    return [f"{source[i % len(source)]} (#{i + 1})" for i in range(count)]
+
+
+async def run_concept_level(level: int, items: int, one_liners: List[str], mode: str,
+                            workdir: str, hedging: bool = False) -> Dict[str, Any]:
+    """Push items one-liners through the async concept pipeline with level in flight."""
+    from adaptive_limiter import AdaptiveLimiter
+    from agent_system import AsyncVideoProductionPipeline
+    from checkpoints import CheckpointStore
+    from http_transport import HTTPTransport
+
+    transport = HTTPTransport(pool_size=max(level, 2))
+    checkpoints = CheckpointStore(os.path.join(workdir, f"checkpoints_{level}.db"))
+    # A fresh limiter per level, so each level shows where the limit settles on its own
+    limiter = AdaptiveLimiter()
+    pipeline = AsyncVideoProductionPipeline(max_concurrency=level, transport=transport, mode=mode,
+                                            checkpoints=checkpoints, hedging=hedging, limiter=limiter)
+
+    async def timed(one_liner: str):
+        started = time.perf_counter()
+        try:
+            result = await pipeline.create_video_concept(one_liner, verbose=False, use_cache=False)
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        return result, time.perf_counter() - started
+
+    started = time.perf_counter()
+    try:
+        outcomes = await asyncio.gather(*(timed(one_liner) for one_liner in _one_liners(items, one_liners)))
+    finally:
+        checkpoints.close()
+    wall_seconds = time.perf_counter() - started
+
+    return {
+        "wall_seconds": wall_seconds,
+        "latencies": [elapsed for result, elapsed in outcomes if result["status"] == "success"],
+        "succeeded": sum(1 for result, _ in outcomes if result["status"] == "success"),
+        "failed": sum(1 for result, _ in outcomes if result["status"] != "success"),
+        "connections": transport.stats(),
+        "llm_concurrency": limiter.stats()
+    }
+
+
+async def run_render_level(level: int, items: int, one_liners: List[str], mode: str,
+                           workdir: str, poll_interval: Optional[float]) -> Dict[str, Any]:
+    """Push items one-liners through the full render pipeline with level workers per stage."""
+    from agent_system import AsyncVideoProductionPipeline
+    from checkpoints import CheckpointStore
+    from http_transport import HTTPTransport
+    from job_store import VideoJobStore
+    from poll_schedule import AdaptivePollSchedule
+    from render_pipeline import RenderPipeline
+    from submission_limiter import SubmissionLimiter
+    from video_poller import VideoJobPoller
+
+    model = "sora-2"
+    transport = HTTPTransport(pool_size=max(level * 2, 4))
+    schedule_factory = AdaptivePollSchedule
+    if poll_interval:
+        # Mock renders take seconds, not minutes: scale the schedule down to match
+        def schedule_factory():
+            return AdaptivePollSchedule(min_interval=poll_interval, max_interval=poll_interval * 10,
+                                        initial_interval=poll_interval)
+
+    store = VideoJobStore(os.path.join(workdir, f"jobs_{level}.db"))
+    limiter = SubmissionLimiter(os.path.join(workdir, f"limits_{level}.db"),
+                                limits={model: {"requests_per_minute": 6000, "max_in_flight": level}})
+    checkpoints = CheckpointStore(os.path.join(workdir, f"render_checkpoints_{level}.db"))
+    pipeline = RenderPipeline(
+        model=model,
+        concept_workers=level,
+        render_workers=level,
+        download_workers=level,
+        render_queue_size=level * 2,
+        poller=VideoJobPoller(transport=transport, schedule_factory=schedule_factory),
+        concept_pipeline=AsyncVideoProductionPipeline(max_concurrency=level, transport=transport,
+                                                      mode=mode, checkpoints=checkpoints),
+        transport=transport,
+        store=store,
+        limiter=limiter,
+        concept_mode=mode
+    )
+
+    # Downloads land in the current directory, so keep them in the scratch directory
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        results = await pipeline.run(_one_liners(items, one_liners))
+        report = pipeline.report()
+    finally:
+        os.chdir(previous_cwd)
+        store.close()
+        limiter.close()
+        checkpoints.close()
+
+    for item in results:
+        if item.get("video_path"):
+            os.remove(os.path.join(workdir, item["video_path"]))
+
+    return {
+        "wall_seconds": pipeline.wall_seconds,
+        "latencies": [sum(item["timings"].values()) for item in results if item["status"] == "success"],
+        "succeeded": sum(1 for item in results if item["status"] == "success"),
+        "failed": sum(1 for item in results if item["status"] != "success"),
+        "errors": sorted({item["error"] for item in results if item.get("error")})[:5],
+        "connections": report["connections"],
+        "polling": report["polling"],
+        "submissions": report["submissions"]
+    }
+
+
+def _per_minute(completed: int, wall_seconds: float) -> float:
+    return completed / wall_seconds * 60 if wall_seconds else 0.0
+
+
+def run_level(scenario: str, level: int, items: int, one_liners: List[str], mode: str,
+              workdir: str, poll_interval: Optional[float], hedging: bool = False) -> Dict[str, Any]:
+    """
+    Run one scenario at one concurrency level and summarize it.
+
+    Returns:
+        Dictionary with throughput, latency percentiles, per-stage latency,
+        error/retry counters and resource usage
+    """
+    from metrics import get_metrics
+
+    metrics = get_metrics()
+    metrics.reset()
+    sampler = ResourceSampler()
+
+    if scenario == "concept":
+        raw = asyncio.run(run_concept_level(level, items, one_liners, mode, workdir, hedging))
+    else:
+        raw = asyncio.run(run_render_level(level, items, one_liners, mode, workdir, poll_interval))
+
+    wall_seconds = raw.pop("wall_seconds")
+    latencies = raw.pop("latencies")
+    summary = metrics.summary()
+    counters = summary["counters"]
+    return {
+        "concurrency": level,
+        "items": items,
+        "succeeded": raw.pop("succeeded"),
+        "failed": raw.pop("failed"),
+        "wall_seconds": round(wall_seconds, 2),
+        "throughput_per_minute": round(_per_minute(len(latencies), wall_seconds), 2),
+        "latency": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99)
+        },
+        "stages": summary["stages"],
+        "errors": {name: value for name, value in counters.items() if name.startswith("glimpse_errors_total")},
+        "retries": {name: value for name, value in counters.items() if name.startswith("glimpse_retries_total")},
+        "hedges": {name: value for name, value in counters.items() if name.startswith("glimpse_hedge")},
+        "tokens": sum(value for name, value in counters.items() if name.startswith("glimpse_tokens_total")),
+        "resources": sampler.finish(wall_seconds),
+        **raw
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float) -> List[str]:
+    """
+    Compare matching (scenario, concurrency) runs against a baseline report.
+
+    Returns:
+        Human-readable regressions (empty if none)
+    """
+    regressions = []
+    for scenario, runs in report["scenarios"].items():
+        previous = {run["concurrency"]: run for run in baseline.get("scenarios", {}).get(scenario, [])}
+        for run in runs:
+            before = previous.get(run["concurrency"])
+            if before is None:
+                continue
+            label = f"{scenario} @ {run['concurrency']}"
+            if before["throughput_per_minute"] and \
+                    run["throughput_per_minute"] < before["throughput_per_minute"] * (1 - tolerance):
+                regressions.append(f"{label}: throughput {run['throughput_per_minute']}/min "
+                                   f"vs {before['throughput_per_minute']}/min")
+            if before["latency"]["p95"] and run["latency"]["p95"] and \
+                    run["latency"]["p95"] > before["latency"]["p95"] * (1 + tolerance):
+                regressions.append(f"{label}: p95 latency {run['latency']['p95']}s "
+                                   f"vs {before['latency']['p95']}s")
+            if run["failed"] > before["failed"]:
+                regressions.append(f"{label}: {run['failed']} failed vs {before['failed']}")
+    return regressions
+
+
+def print_scenario(scenario: str, runs: List[Dict[str, Any]]):
+    """Print one row per concurrency level."""
+    print(f"\n{'='*80}")
+    print(f"LOAD TEST: {scenario.upper()}")
+    print(f"{'='*80}")
+    print(f"{'Conc':>4} {'Items':>5} {'OK':>4} {'Fail':>4} {'Wall':>8} {'Items/min':>10} "
+          f"{'p50':>7} {'p95':>7} {'p99':>7} {'CPU':>6} {'RSS MB':>7} {'Thr':>4}")
+    for run in runs:
+        latency = run["latency"]
+        cells = [f"{latency[key]:>6.2f}s" if latency[key] is not None else f"{'-':>7}"
+                 for key in ("p50", "p95", "p99")]
+        resources = run["resources"]
+        rss = f"{resources['max_rss_mb']:>7.1f}" if resources["max_rss_mb"] is not None else f"{'-':>7}"
+        print(f"{run['concurrency']:>4} {run['items']:>5} {run['succeeded']:>4} {run['failed']:>4} "
+              f"{run['wall_seconds']:>7.2f}s {run['throughput_per_minute']:>10.1f} {' '.join(cells)} "
+              f"{resources['cpu_utilization']:>6.0%} {rss} {resources['peak_threads']:>4}")
+
+    for run in runs:
+        limiter = run.get("llm_concurrency")
+        if limiter is not None:
+            print(f"  concurrency {run['concurrency']}: LLM limit settled at {limiter['limit']} "
+                  f"(peak {limiter['peak_limit']}, {limiter['decreases']} cut(s), {limiter['retries']} retries)")
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Load test the concept and render pipelines")
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--levels", default=DEFAULT_LEVELS,
+                        help=f"Comma-separated concurrency levels (default: {DEFAULT_LEVELS})")
+    parser.add_argument("--items-per-worker", type=int, default=2,
+                        help="Items pushed per unit of concurrency at each level")
+    parser.add_argument("--mode", choices=("two_stage", "fast"), default="two_stage",
+                        help="Concept pipeline mode")
+    parser.add_argument("--hedging", action="store_true",
+                        help="Hedge straggling agent calls in the concept scenario (see hedging.py)")
+    parser.add_argument("--input", help="File with one-liners to cycle through (default: built-in samples)")
+    parser.add_argument("--base-url", help="Target this API instead of starting the mock server")
+    parser.add_argument("--poll-interval", type=float, default=0.5,
+                        help="Minimum status poll interval for the render scenario (0 = production schedule)")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative throughput drop / p95 increase before failing")
+    add_config_arguments(parser)
+    parser.set_defaults(render=None)
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.levels.split(",") if level.strip()]
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    one_liners = SAMPLE_ONE_LINERS
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as f:
+            one_liners = [line.strip() for line in f if line.strip()]
+
+    server = None
+    if args.base_url:
+        base_url = args.base_url.rstrip("/")
+    else:
+        if args.render is None:
+            # Short renders keep a full sweep to a few minutes
+            from mock_openai_server import LatencyDistribution
+            args.render = LatencyDistribution(3.0, 6.0)
+        server = MockOpenAIServer(config_from_args(args)).start()
+        base_url = server.base_url
+        os.environ["OPENAI_API_KEY"] = "mock"
+
+    # Must be set before the pipeline modules are imported (they read it at import time)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    print(f"Target: {base_url}" + (" (mock)" if server else ""))
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "target": "mock" if server else base_url,
+        "levels": levels,
+        "mode": args.mode,
+        "hedging": args.hedging,
+        "scenarios": {}
+    }
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="glimpse_loadtest_") as workdir:
+            for scenario in scenarios:
+                runs = []
+                for level in levels:
+                    items = level * args.items_per_worker
+                    print(f"  {scenario}: concurrency {level}, {items} item(s)...", flush=True)
+                    runs.append(run_level(scenario, level, items, one_liners, args.mode, workdir,
+                                          args.poll_interval or None, args.hedging))
+                report["scenarios"][scenario] = runs
+                print_scenario(scenario, runs)
+    finally:
+        if server is not None:
+            report["mock_responses"] = server.stats()
+            server.stop()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report saved to: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"\n✓ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
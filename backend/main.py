@@ -5,15 +5,157 @@ Simple workflow:
 1. Drop your one-liner
 2. AI Agents collaborate on your scene
 3. You get a ready-to-ship video concept
+
+Batch mode (non-interactive):
+    python main.py --batch one_liners.txt --output concepts.jsonl --concurrency 16
+    cat one_liners.txt | python main.py --batch - > concepts.jsonl
+
+Resume a failed run from its last completed stage:
+    python main.py --resume run_3f2c...
 """
 
-from agent_system import VideoProductionPipeline, save_output
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, Any, AsyncIterator, Optional, TextIO
+
+from agent_system import (
+    VideoProductionPipeline,
+    AsyncVideoProductionPipeline,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PIPELINE_MODE,
+    PIPELINE_MODES,
+    save_output
+)
+from response_cache import ResponseCache, DEFAULT_CACHE_DIR
+from http_transport import get_transport
+from metrics import get_metrics, print_latency_table, start_exporter_from_env
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="AI video production pipeline")
+    parser.add_argument("--batch", metavar="PATH",
+                        help="Run non-interactively on a file of one-liners (one per line, '-' for stdin)")
+    parser.add_argument("--output", metavar="PATH", default="-",
+                        help="JSONL output path for batch mode (default: stdout)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f"One-liners processed in parallel in batch mode (default: {DEFAULT_MAX_CONCURRENCY})")
+    parser.add_argument("--ordered", action="store_true",
+                        help="Write batch results in input order instead of completion order")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Directory for cached agent responses (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call the model instead of reusing cached responses")
+    parser.add_argument("--mode", choices=PIPELINE_MODES, default=DEFAULT_PIPELINE_MODE,
+                        help="two_stage: Creative Director → Scriptwriter; fast: one fused call "
+                             f"(default: {DEFAULT_PIPELINE_MODE})")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resume a failed run, re-running only the stages that did not complete")
+    return parser.parse_args(argv)
+
+
+def build_cache(args: argparse.Namespace):
+    """Create the response cache requested on the command line (or None when disabled)."""
+    if args.no_cache:
+        return None
+    return ResponseCache(cache_dir=args.cache_dir)
+
+
+async def read_one_liners(stream: TextIO) -> AsyncIterator[str]:
+    """Lazily read non-empty one-liners from a text stream without blocking the event loop."""
+    while True:
+        line = await asyncio.to_thread(stream.readline)
+        if not line:
+            return
+        line = line.strip()
+        if line:
+            yield line
+
+
+async def run_batch(input_stream: TextIO, output_stream: TextIO,
+                    concurrency: int, ordered: bool,
+                    cache: Optional[ResponseCache] = None,
+                    mode: str = DEFAULT_PIPELINE_MODE) -> int:
+    """
+    Run every one-liner in input_stream through the pipeline, writing one JSON line per result.
+
+    Args:
+        input_stream: Text stream with one product one-liner per line
+        output_stream: Text stream that receives JSONL results as they complete
+        concurrency: Maximum number of one-liners in flight at once
+        ordered: If True, write results in input order; otherwise in completion order
+        cache: Optional response cache shared by both agents
+        mode: Pipeline mode ("two_stage" or "fast")
+
+    Returns:
+        Number of one-liners that failed
+    """
+    pipeline = AsyncVideoProductionPipeline(max_concurrency=concurrency, cache=cache, mode=mode)
+    # Optionally open the agents' connections up front so the first calls skip the handshake
+    if os.getenv("GLIMPSE_HTTP_PREWARM") == "1":
+        await pipeline.transport.aprewarm(connections=concurrency)
+    start_time = time.perf_counter()
+    succeeded = failed = 0
+
+    async for index, result in pipeline.stream_video_concepts(
+            read_one_liners(input_stream), ordered=ordered):
+        record = {"index": index, **result}
+        output_stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output_stream.flush()
+
+        if result["status"] == "success":
+            succeeded += 1
+        else:
+            failed += 1
+        print(f"[{succeeded + failed}] #{index} {result['status']}", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"✓ Batch complete: {succeeded} succeeded, {failed} failed in {elapsed:.1f}s",
+          file=sys.stderr)
+    if cache is not None:
+        stats = cache.stats()
+        print(f"  Cache: {stats['hits']} hits, {stats['misses']} misses", file=sys.stderr)
+    print_latency_table(get_metrics().summary(), file=sys.stderr)
+    return failed
+
+
+def main_batch(args: argparse.Namespace) -> int:
+    """Open the batch input/output streams and run the batch."""
+    input_stream = sys.stdin if args.batch == "-" else open(args.batch, "r", encoding="utf-8")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        return asyncio.run(run_batch(input_stream, output_stream,
+                                     concurrency=args.concurrency,
+                                     ordered=args.ordered,
+                                     cache=build_cache(args),
+                                     mode=args.mode))
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
 
 
 def main():
     """
     Main entry point for the video production pipeline.
     """
+    args = parse_args()
+    start_exporter_from_env()
+    if args.batch:
+        sys.exit(1 if main_batch(args) else 0)
+    # Optionally open the agents' connection up front so the first call skips the handshake
+    if os.getenv("GLIMPSE_HTTP_PREWARM") == "1":
+        get_transport().prewarm(connections=1)
+    if args.resume:
+        result = VideoProductionPipeline(cache=build_cache(args)).resume_run(args.resume)
+        report_result(result, verbose=True)
+        sys.exit(0 if result["status"] == "success" else 1)
+
     print("\n" + "="*80)
     print("AI VIDEO PRODUCTION PIPELINE")
     print("="*80)
@@ -49,14 +191,17 @@ def main():
     print("="*80)
 
     # Initialize and run pipeline
-    pipeline = VideoProductionPipeline()
+    pipeline = VideoProductionPipeline(cache=build_cache(args), mode=args.mode)
 
     result = pipeline.create_video_concept(
         product_one_liner=one_liner,
         verbose=verbose
     )
+    report_result(result, verbose)
+
 
-    # Handle results
+def report_result(result: Dict[str, Any], verbose: bool):
+    """Save a successful concept and print its summary, or print the error."""
     if result["status"] == "success":
         # Save output
         output_file = save_output(result)
@@ -74,7 +219,13 @@ def main():
 
         print(f"\nPipeline Stats:")
         print(f"  Total Tokens: {result['pipeline_metadata']['total_tokens']}")
-        print(f"  Agents Used: Creative Director (GPT-5.1) + Scriptwriter (GPT-5.1)")
+        if result["pipeline_metadata"]["mode"] == "fast":
+            print(f"  Agents Used: Fast Mode (Creative Director + Scriptwriter in one GPT-5.1 call)")
+        else:
+            print(f"  Agents Used: Creative Director (GPT-5.1) + Scriptwriter (GPT-5.1)")
+        print(f"  Latency: {result['pipeline_metadata']['total_latency_seconds']:.1f}s")
+        if result["pipeline_metadata"].get("stages_from_checkpoint"):
+            print(f"  Restored From Checkpoint: {', '.join(result['pipeline_metadata']['stages_from_checkpoint'])}")
 
         print(f"\n✓ Prompt saved to: {output_file}")
         print("\nNext steps:")
@@ -89,6 +240,9 @@ def main():
         print(f"\nError: {result.get('error', 'Unknown error')}")
         if 'details' in result:
             print(f"Details: {result['details']}")
+        if result.get("run_id"):
+            print(f"\nCompleted stages are saved. Retry only the failed stage ({result['failed_stage']}) with:")
+            print(f"  python main.py --resume {result['run_id']}")
         print("\n" + "="*80 + "\n")
 
 
@@ -0,0 +1,334 @@
+"""
+Process-wide latency, token, cost and error metrics.
+
+Every component records into one MetricsRegistry (see get_metrics()):
+- glimpse_stage_seconds{stage}: latency histogram per stage (creative_director,
+  scriptwriter, fast_concept, concept[_two_stage|_fast], submit, queue_wait,
+  render, download)
+- glimpse_tokens_total{stage,kind}: prompt/completion tokens per agent
+- glimpse_concept_tokens_total{mode}: tokens per concept, two_stage vs fast
+- glimpse_prompt_chars_saved_total: characters removed by the final-prompt compactor
+- glimpse_video_cost_dollars_total{model}: Sora spend from MODELS cost_per_second
+- glimpse_render_cache_hits_total{kind}: renders reused (file on disk / in flight)
+- glimpse_llm_concurrency_decreases_total: AIMD cuts of the agent concurrency limit
+- glimpse_errors_total{stage} / glimpse_retries_total{stage,reason}
+
+summary() gives p50/p95/p99 per stage; the registry can be exported in
+Prometheus text format to a file or served on a local port.
+
+Usage:
+    GLIMPSE_METRICS_PORT=9464 python render_pipeline.py one_liners.txt
+    GLIMPSE_METRICS_FILE=metrics.prom python generate_video.py prompt.txt
+"""
+
+import os
+import math
+import atexit
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, Tuple, List
+
+# Latency bucket upper bounds in seconds: agent calls are seconds, renders are minutes
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0,
+                   120.0, 300.0, 600.0, 1200.0, 1800.0)
+
+# Percentiles are computed exactly over this many most recent samples per series
+DEFAULT_WINDOW = 2048
+
+PERCENTILES = (50, 95, 99)
+
+STAGE_SECONDS = "glimpse_stage_seconds"
+ATTEMPT_SECONDS = "glimpse_llm_attempt_seconds"
+
+_HELP = {
+    STAGE_SECONDS: "Latency of each pipeline stage in seconds",
+    ATTEMPT_SECONDS: "Latency of one hedged agent request, without slot waits or retries, by stage",
+    "glimpse_tokens_total": "Chat completion tokens used, by agent stage and kind",
+    "glimpse_concept_tokens_total": "Tokens used per finished concept, by pipeline mode",
+    "glimpse_prompt_chars_saved_total": "Characters removed from final prompts by the compactor",
+    "glimpse_agent_cache_hits_total": "Agent calls served from the response cache",
+    "glimpse_coalesced_requests_total": "Concept requests that joined an identical in-flight run",
+    "glimpse_checkpoint_restores_total": "Pipeline stages restored from a checkpoint instead of re-run",
+    "glimpse_hedges_total": "Duplicate (hedge) agent requests sent after the hedge deadline, by stage",
+    "glimpse_hedge_wins_total": "Hedge requests that finished before the original, by stage",
+    "glimpse_hedge_budget_exhausted_total": "Calls past the hedge deadline not hedged because of the spend cap",
+    "glimpse_llm_concurrency_decreases_total": "Times the adaptive LLM concurrency limit was cut after a 429 / 5xx",
+    "glimpse_video_seconds_total": "Seconds of video rendered",
+    "glimpse_video_cost_dollars_total": "Estimated Sora spend in dollars",
+    "glimpse_video_bytes_total": "Bytes of video downloaded",
+    "glimpse_render_cache_hits_total": "Render requests served by an identical earlier job, by kind",
+    "glimpse_render_cache_misses_total": "Render requests with no identical earlier job",
+    "glimpse_errors_total": "Failed operations, by stage",
+    "glimpse_retries_total": "Retried operations, by stage and reason",
+    "glimpse_requests_total": "Completed operations, by stage",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """Cumulative bucket counts for export plus a sliding window for exact percentiles."""
+
+    def __init__(self, buckets: Tuple[float, ...], window: int):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        # Nearest-rank percentile
+        rank = max(int(math.ceil(p / 100.0 * len(ordered))), 1)
+        return ordered[rank - 1]
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and histograms keyed by metric name and labels.
+
+    Args:
+        buckets: Histogram bucket upper bounds (seconds)
+        window: Recent samples kept per histogram series for percentiles
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, window: int = DEFAULT_WINDOW):
+        self.buckets = tuple(buckets)
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        """Add value to a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one histogram sample."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = _Histogram(self.buckets, self.window)
+                self._histograms[key] = histogram
+            histogram.observe(value)
+
+    def observe_stage(self, stage: str, seconds: float):
+        """Record the latency of one pipeline stage."""
+        self.observe(STAGE_SECONDS, seconds, stage=stage)
+
+    def percentile(self, name: str, p: float, **labels) -> Optional[float]:
+        """Nearest-rank percentile of a histogram series' recent samples (None if empty)."""
+        with self._lock:
+            histogram = self._histograms.get((name, _label_key(labels)))
+            return histogram.percentile(p) if histogram is not None else None
+
+    def recent(self, name: str, **labels) -> List[float]:
+        """A histogram series' recent samples (oldest first)."""
+        with self._lock:
+            histogram = self._histograms.get((name, _label_key(labels)))
+            return list(histogram.recent) if histogram is not None else []
+
+    def counter(self, name: str, **labels) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0.0)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Per-stage latency percentiles plus every counter.
+
+        Returns:
+            {"stages": {stage: {"count", "mean", "p50", "p95", "p99"}}, "counters": {...}}
+        """
+        with self._lock:
+            stages = {}
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                if name != STAGE_SECONDS:
+                    continue
+                stage = dict(labels).get("stage", "")
+                stats = {
+                    "count": histogram.count,
+                    "mean": round(histogram.sum / histogram.count, 3) if histogram.count else 0.0
+                }
+                for p in PERCENTILES:
+                    value = histogram.percentile(p)
+                    stats[f"p{p}"] = round(value, 3) if value is not None else None
+                stages[stage] = stats
+
+            counters = {
+                _series_name(name, labels): value
+                for (name, labels), value in sorted(self._counters.items())
+            }
+        return {"stages": stages, "counters": counters}
+
+    def render_prometheus(self) -> str:
+        """Everything in Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+
+            seen = set()
+            for (name, labels), value in counters:
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{_series_name(name, labels)} {_format_value(value)}")
+
+            for (name, labels), histogram in histograms:
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                    lines.append(f"# TYPE {name} histogram")
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f"{_series_name(name + '_bucket', labels + (('le', _format_value(bound)),))} {count}")
+                lines.append(f"{_series_name(name + '_bucket', labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{_series_name(name + '_sum', labels)} {_format_value(histogram.sum)}")
+                lines.append(f"{_series_name(name + '_count', labels)} {histogram.count}")
+
+            # Exact percentiles over the recent window, for dashboards without histogram_quantile
+            recent_name = f"{STAGE_SECONDS}_recent"
+            quantile_lines = []
+            for (name, labels), histogram in histograms:
+                if name != STAGE_SECONDS:
+                    continue
+                for p in PERCENTILES:
+                    value = histogram.percentile(p)
+                    if value is not None:
+                        quantile_labels = labels + (("quantile", _format_value(p / 100.0)),)
+                        quantile_lines.append(f"{_series_name(recent_name, quantile_labels)} {_format_value(value)}")
+            if quantile_lines:
+                lines.append(f"# HELP {recent_name} Stage latency percentiles over the last {self.window} samples")
+                lines.append(f"# TYPE {recent_name} gauge")
+                lines.extend(quantile_lines)
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Atomically write the Prometheus text to a file (e.g. for node_exporter's textfile collector)."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(temp_path, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve /metrics on a local port from a daemon thread.
+
+        Returns:
+            The running server (call shutdown() to stop it)
+        """
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+        return server
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _label_key(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _series_name(name: str, labels: Labels) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f"{name}{{{rendered}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def print_latency_table(summary: Dict[str, Any], file=None):
+    """Print p50/p95/p99 per stage from MetricsRegistry.summary()."""
+    print(f"{'Stage':18} {'Count':>6} {'Mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}", file=file)
+    for stage, stats in summary["stages"].items():
+        cells = [f"{stats[key]:>7.2f}s" if stats[key] is not None else f"{'-':>8}"
+                 for key in ("mean", "p50", "p95", "p99")]
+        print(f"{stage:18} {stats['count']:>6} {' '.join(cells)}", file=file)
+
+
+_default_registry = None
+_default_lock = threading.Lock()
+_exporter_started = False
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry, creating it on first use."""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = MetricsRegistry()
+        return _default_registry
+
+
+def start_exporter_from_env() -> List[str]:
+    """
+    Start the exporters configured in the environment (idempotent).
+
+    GLIMPSE_METRICS_PORT serves /metrics on 127.0.0.1; GLIMPSE_METRICS_FILE is
+    written when the process exits.
+
+    Returns:
+        Human-readable descriptions of the exporters started
+    """
+    global _exporter_started
+    with _default_lock:
+        if _exporter_started:
+            return []
+        _exporter_started = True
+
+    registry = get_metrics()
+    started = []
+    port = os.getenv("GLIMPSE_METRICS_PORT")
+    if port:
+        registry.serve(int(port))
+        started.append(f"http://127.0.0.1:{port}/metrics")
+    path = os.getenv("GLIMPSE_METRICS_FILE")
+    if path:
+        atexit.register(registry.write_prometheus, path)
+        started.append(path)
+    return started
@@ -0,0 +1,633 @@
+"""
+Local stand-in for the OpenAI chat completions and Sora video endpoints.
+
+Lets the pipeline, the Sora client and the load-test harness run without
+spending money. It emulates:
+- POST /v1/chat/completions: JSON-object replies shaped like the Creative
+  Director / Scriptwriter / fast mode schemas in prompts.py (streaming supported)
+- POST /v1/videos, GET /v1/videos/{id}, GET /v1/videos/{id}/content:
+  jobs that progress over a sampled render duration; content supports Range
+
+Latency, render duration, error and 429 rates are configurable.
+
+Usage:
+    python mock_openai_server.py --port 8089 --render 20:40
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=mock python render_pipeline.py one_liners.txt
+"""
+
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import struct
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional
+
+from prompts import CREATIVE_DIRECTOR_SYSTEM_PROMPT, SCRIPTWRITER_SYSTEM_PROMPT, FAST_MODE_SYSTEM_PROMPT
+
+# z-score of the 95th percentile of a standard normal distribution
+_Z95 = 1.6449
+
+
+class LatencyDistribution:
+    """
+    Log-normal latency described by its median and 95th percentile, in seconds.
+
+    Args:
+        median: Median latency
+        p95: 95th percentile latency (>= median; equal means constant)
+    """
+
+    def __init__(self, median: float, p95: Optional[float] = None):
+        self.median = median
+        self.p95 = p95 if p95 is not None else median
+        self.sigma = math.log(self.p95 / median) / _Z95 if median > 0 and self.p95 > median else 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        return self.median * math.exp(self.sigma * rng.gauss(0.0, 1.0))
+
+    def __repr__(self) -> str:
+        return f"LatencyDistribution(median={self.median}, p95={self.p95})"
+
+
+class MockConfig:
+    """
+    Behaviour of the mock server.
+
+    Args:
+        chat_latency: Time to first byte of a chat completion
+        chat_chunk_delay: Delay between streamed chunks
+        chat_error_rate: Fraction of chat requests answered with HTTP 500
+        chat_rate_limit_rate: Fraction of chat requests answered with HTTP 429
+        chat_capacity: Chat requests served at once; more are answered with HTTP 429
+            (0 = unlimited), like an account's concurrency limit
+        submit_latency: Latency of POST /v1/videos
+        status_latency: Latency of GET /v1/videos/{id}
+        render_duration: Time from submission until a job completes
+        render_failure_rate: Fraction of jobs that end as "failed"
+        video_error_rate: Fraction of video API requests answered with HTTP 500
+        video_rate_limit_rate: Fraction of video API requests answered with HTTP 429
+        retry_after: Retry-After seconds sent with 429s
+        video_bytes: Size of the downloaded content
+        download_bytes_per_second: Content bandwidth (0 = unthrottled)
+        seed: Random seed for reproducible runs
+    """
+
+    def __init__(self,
+                 chat_latency: LatencyDistribution = LatencyDistribution(0.5, 1.5),
+                 chat_chunk_delay: float = 0.005,
+                 chat_error_rate: float = 0.0,
+                 chat_rate_limit_rate: float = 0.0,
+                 chat_capacity: int = 0,
+                 submit_latency: LatencyDistribution = LatencyDistribution(0.2, 0.5),
+                 status_latency: LatencyDistribution = LatencyDistribution(0.05, 0.15),
+                 render_duration: LatencyDistribution = LatencyDistribution(10.0, 20.0),
+                 render_failure_rate: float = 0.0,
+                 video_error_rate: float = 0.0,
+                 video_rate_limit_rate: float = 0.0,
+                 retry_after: float = 1.0,
+                 video_bytes: int = 2 * 1024 * 1024,
+                 download_bytes_per_second: float = 0.0,
+                 seed: Optional[int] = None):
+        self.chat_latency = chat_latency
+        self.chat_chunk_delay = chat_chunk_delay
+        self.chat_error_rate = chat_error_rate
+        self.chat_rate_limit_rate = chat_rate_limit_rate
+        self.chat_capacity = chat_capacity
+        self.submit_latency = submit_latency
+        self.status_latency = status_latency
+        self.render_duration = render_duration
+        self.render_failure_rate = render_failure_rate
+        self.video_error_rate = video_error_rate
+        self.video_rate_limit_rate = video_rate_limit_rate
+        self.retry_after = retry_after
+        self.video_bytes = video_bytes
+        self.download_bytes_per_second = download_bytes_per_second
+        self.seed = seed
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    """Ignores clients that hang up mid-response (e.g. a cancelled hedge request)."""
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class MockOpenAIServer:
+    """
+    Threaded HTTP server emulating the endpoints the backend uses.
+
+    Args:
+        config: Latency, error and render behaviour
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig()
+        self.rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._content = _fake_mp4(self.config.video_bytes)
+        self._counts = {}
+        self._chats_in_flight = 0
+        self._server = _QuietHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockOpenAIServer":
+        """Serve from a daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="mock-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        """Responses sent, keyed by "<endpoint> <status code>"."""
+        with self._lock:
+            return dict(self._counts)
+
+    # --- behaviour (called from handler threads) -----------------------------------
+
+    def count(self, endpoint: str, status: int):
+        key = f"{endpoint} {status}"
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def sample(self, distribution: LatencyDistribution) -> float:
+        with self._lock:
+            return distribution.sample(self.rng)
+
+    def roll(self, error_rate: float, rate_limit_rate: float) -> Optional[int]:
+        """Decide whether this request fails: 500, 429 or None."""
+        with self._lock:
+            draw = self.rng.random()
+        if draw < error_rate:
+            return 500
+        if draw < error_rate + rate_limit_rate:
+            return 429
+        return None
+
+    def begin_chat(self) -> bool:
+        """Take a chat slot; False when chat_capacity requests are already being served."""
+        with self._lock:
+            if self.config.chat_capacity and self._chats_in_flight >= self.config.chat_capacity:
+                return False
+            self._chats_in_flight += 1
+            return True
+
+    def end_chat(self):
+        with self._lock:
+            self._chats_in_flight -= 1
+
+    def create_job(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            duration = self.config.render_duration.sample(self.rng)
+            fails = self.rng.random() < self.config.render_failure_rate
+        job = {
+            "id": f"video_{uuid.uuid4().hex}",
+            "object": "video",
+            "model": body.get("model", "sora-2"),
+            "seconds": str(body.get("seconds", "12")),
+            "size": body.get("size", "1280x720"),
+            "created_at": int(now),
+            "_started": now,
+            "_duration": duration,
+            "_fails": fails
+        }
+        with self._lock:
+            self._jobs[job["id"]] = job
+        return self.job_view(job)
+
+    def get_job(self, video_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(video_id)
+        return self.job_view(job) if job is not None else None
+
+    def job_view(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        elapsed = time.time() - job["_started"]
+        fraction = elapsed / job["_duration"] if job["_duration"] > 0 else 1.0
+        view = {key: value for key, value in job.items() if not key.startswith("_")}
+        if fraction >= 1.0:
+            view["status"] = "failed" if job["_fails"] else "completed"
+            view["progress"] = 100
+            if job["_fails"]:
+                view["error"] = {"code": "mock_failure", "message": "Simulated render failure"}
+        elif fraction < 0.05:
+            view["status"] = "queued"
+            view["progress"] = 0
+        else:
+            view["status"] = "in_progress"
+            view["progress"] = int(fraction * 100)
+        return view
+
+    @property
+    def content(self) -> bytes:
+        return self._content
+
+
+def _make_handler(server: MockOpenAIServer):
+    config = server.config
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        # --- routing ---------------------------------------------------------------
+
+        def do_HEAD(self):
+            # Connection pre-warming
+            self._send_json(200, {}, endpoint="head", body=False)
+
+        def do_POST(self):
+            body = self._read_json()
+            path = self.path.split("?")[0].rstrip("/")
+            if path.endswith("/chat/completions"):
+                self._chat_completion(body)
+            elif path.endswith("/videos"):
+                self._submit_video(body)
+            else:
+                self._send_json(404, {"error": {"message": f"Unknown path {path}"}}, endpoint="unknown")
+
+        def do_GET(self):
+            path = self.path.split("?")[0].rstrip("/")
+            parts = path.split("/")
+            if len(parts) >= 3 and parts[-1] == "content" and parts[-3] == "videos":
+                self._video_content(parts[-2])
+            elif len(parts) >= 2 and parts[-2] == "videos":
+                self._video_status(parts[-1])
+            else:
+                self._send_json(404, {"error": {"message": f"Unknown path {path}"}}, endpoint="unknown")
+
+        # --- chat completions ------------------------------------------------------
+
+        def _chat_completion(self, body: Dict[str, Any]):
+            if not server.begin_chat():
+                self._send_error(429, "chat")
+                return
+            try:
+                self._serve_chat(body)
+            finally:
+                server.end_chat()
+
+        def _serve_chat(self, body: Dict[str, Any]):
+            time.sleep(server.sample(config.chat_latency))
+            failure = server.roll(config.chat_error_rate, config.chat_rate_limit_rate)
+            if failure is not None:
+                self._send_error(failure, "chat")
+                return
+
+            messages = body.get("messages", [])
+            content = json.dumps(_chat_reply(messages), indent=2)
+            prompt_tokens = sum(len(message.get("content", "")) for message in messages) // 4
+            completion_tokens = len(content) // 4
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+            model = body.get("model", "gpt-5.1")
+
+            if body.get("stream"):
+                self._stream_chat(completion_id, model, content, usage)
+                return
+
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            }, endpoint="chat")
+
+        def _stream_chat(self, completion_id: str, model: str, content: str, usage: Dict[str, int]):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            server.count("chat", 200)
+
+            def event(choices, usage_value=None):
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": choices
+                }
+                if usage_value is not None:
+                    chunk["usage"] = usage_value
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+
+            step = 32
+            for start in range(0, len(content), step):
+                event([{"index": 0, "delta": {"content": content[start:start + step]}, "finish_reason": None}])
+                if config.chat_chunk_delay:
+                    time.sleep(config.chat_chunk_delay)
+            event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            event([], usage)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+
+        # --- videos ----------------------------------------------------------------
+
+        def _submit_video(self, body: Dict[str, Any]):
+            time.sleep(server.sample(config.submit_latency))
+            failure = server.roll(config.video_error_rate, config.video_rate_limit_rate)
+            if failure is not None:
+                self._send_error(failure, "submit")
+                return
+            self._send_json(200, server.create_job(body), endpoint="submit")
+
+        def _video_status(self, video_id: str):
+            time.sleep(server.sample(config.status_latency))
+            failure = server.roll(config.video_error_rate, config.video_rate_limit_rate)
+            if failure is not None:
+                self._send_error(failure, "status")
+                return
+            job = server.get_job(video_id)
+            if job is None:
+                self._send_json(404, {"error": {"message": f"No video {video_id}"}}, endpoint="status")
+                return
+            self._send_json(200, job, endpoint="status")
+
+        def _video_content(self, video_id: str):
+            job = server.get_job(video_id)
+            if job is None or job["status"] != "completed":
+                self._send_json(404, {"error": {"message": f"Video {video_id} is not ready"}},
+                                endpoint="content")
+                return
+
+            data = server.content
+            start, end = 0, len(data) - 1
+            range_header = self.headers.get("Range")
+            if range_header and range_header.startswith("bytes="):
+                first, _, last = range_header[len("bytes="):].partition("-")
+                start = int(first)
+                end = min(int(last), len(data) - 1) if last else len(data) - 1
+                if start >= len(data):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(data)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    server.count("content", 416)
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                server.count("content", 206)
+            else:
+                self.send_response(200)
+                server.count("content", 200)
+
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+
+            block = 256 * 1024
+            for offset in range(start, end + 1, block):
+                piece = data[offset:min(offset + block, end + 1)]
+                self.wfile.write(piece)
+                if config.download_bytes_per_second:
+                    time.sleep(len(piece) / config.download_bytes_per_second)
+
+        # --- helpers ---------------------------------------------------------------
+
+        def _read_json(self) -> Dict[str, Any]:
+            length = int(self.headers.get("Content-Length") or 0)
+            if not length:
+                return {}
+            try:
+                return json.loads(self.rfile.read(length))
+            except ValueError:
+                return {}
+
+        def _send_error(self, status: int, endpoint: str):
+            headers = {"Retry-After": str(config.retry_after)} if status == 429 else {}
+            message = "Rate limit exceeded (mock)" if status == 429 else "Internal server error (mock)"
+            self._send_json(status, {"error": {"message": message, "type": "mock_error"}},
+                            endpoint=endpoint, headers=headers)
+
+        def _send_json(self, status: int, payload: Dict[str, Any], endpoint: str,
+                       headers: Optional[Dict[str, str]] = None, body: bool = True):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if body:
+                self.wfile.write(data)
+            server.count(endpoint, status)
+
+        def _write_chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def _chat_reply(messages) -> Dict[str, Any]:
+    """Pick the reply schema from the system prompt of the request."""
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    user = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+    if system == FAST_MODE_SYSTEM_PROMPT:
+        return {"creative_specification": _mock_creative_spec(user), "script": _mock_script(user)}
+    if system == SCRIPTWRITER_SYSTEM_PROMPT or (system != CREATIVE_DIRECTOR_SYSTEM_PROMPT
+                                                and user.startswith("Creative Specification:")):
+        return _mock_script(user)
+    return _mock_creative_spec(user)
+
+
+def _mock_creative_spec(user_prompt: str) -> Dict[str, Any]:
+    subject = _subject(user_prompt)
+    return {
+        "core_concept": f"A single continuous reveal that shows {subject} solving a real problem",
+        "creative_goal": "Make viewers instantly understand the product and remember its name",
+        "tone": "bold, confident",
+        "mood": "energetic, optimistic",
+        "pacing_strategy": "3s hook → 6s demo → 3s closer",
+        "visual_metaphor": "Chaos snapping into order",
+        "camera_approach": {
+            "shot_types": ["Macro close-up", "Medium tracking shot", "Wide hero shot"],
+            "camera_movement": "Smooth push-ins and one orbit",
+            "composition_style": "Centered subject, shallow depth of field"
+        },
+        "aesthetic_style": {
+            "visual_direction": "Clean cinematic product film",
+            "color_palette": "Deep navy, electric teal, warm white",
+            "lighting_approach": "High-contrast key light with soft rim",
+            "environment": "Minimal modern studio"
+        },
+        "key_moments": [
+            {"moment": 1, "timing": "0-3s", "focus": "The problem in one striking image",
+             "why": "Hooks attention"},
+            {"moment": 2, "timing": "3-8s", "focus": f"{subject} in action",
+             "why": "Shows the value"},
+            {"moment": 3, "timing": "8-12s", "focus": "Logo and tagline on a hero shot",
+             "why": "Drives recall"}
+        ],
+        "moodboard_keywords": ["sleek", "kinetic", "precise"],
+        "reference_styles": ["Apple product films", "Nike short-form ads"]
+    }
+
+
+def _mock_script(user_prompt: str) -> Dict[str, Any]:
+    subject = _subject(user_prompt)
+    narration = ("0-3s: Narrator says: Every second counts. "
+                 f"3-8s: Narrator says: {subject} handles it for you. "
+                 "8-12s: Narrator says: Try it today.")
+    return {
+        "narrative_structure": {
+            "hook": {"timing": "0-2s", "description": "The problem, instantly", "visual": "Macro shot of chaos",
+                     "text_overlay": None, "camera": "Fast push-in"},
+            "core": {"timing": "2-7s", "description": f"{subject} fixes it", "visual": "Product in use",
+                     "text_overlay": None, "camera": "Tracking shot"},
+            "closer": {"timing": "8-12s", "description": "Hero shot and tagline", "visual": "Logo reveal",
+                       "text_overlay": "Try it today", "camera": "Slow orbit"}
+        },
+        "shot_breakdown": [
+            {"shot_number": 1, "timing": "0-3s", "shot_type": "Close-up", "action": "Chaos",
+             "camera_movement": "Push in", "lighting": "Hard key", "visual_details": "Motion blur"},
+            {"shot_number": 2, "timing": "3-8s", "shot_type": "Medium", "action": "Product works",
+             "camera_movement": "Track", "lighting": "Soft key", "visual_details": "Clean UI glow"},
+            {"shot_number": 3, "timing": "8-12s", "shot_type": "Wide", "action": "Hero reveal",
+             "camera_movement": "Orbit", "lighting": "Rim light", "visual_details": "Logo"}
+        ],
+        "copy_elements": {
+            "opening_text": None,
+            "mid_roll_text": None,
+            "closing_text": "Try it today",
+            "narration_script": narration
+        },
+        "final_multimodal_prompt": (
+            f"A 12-second cinematic product film about {subject}. Clean modern studio, deep navy and "
+            "electric teal palette, high-contrast key light. 0-3s: macro close-up of chaos, fast push-in. "
+            "3-8s: medium tracking shot of the product in use. 8-12s: wide hero shot, slow orbit, logo "
+            f"reveal. Narration (warm, confident voice): {narration} Sound: rising synth pulse, "
+            "soft whoosh on each cut, music resolves on the logo."
+        ),
+        "technical_specs": {"duration": "12 seconds"},
+        "production_notes": "Mock response from mock_openai_server.py"
+    }
+
+
+def _subject(user_prompt: str) -> str:
+    """The one-liner from a Creative Director or Scriptwriter user prompt."""
+    for prefix in ("Product Description:", "Product One-Liner:"):
+        for line in user_prompt.splitlines():
+            if line.startswith(prefix):
+                return line[len(prefix):].strip().rstrip(".") or "the product"
+    return "the product"
+
+
+def _fake_mp4(size: int, chunks: int = 64) -> bytes:
+    """
+    An MP4 box layout of about size bytes: ftyp, mdat of random bytes, then moov.
+
+    moov comes last, as from an encoder without faststart, and its stco table
+    points at evenly spaced chunks of the mdat, so faststart.py has real work to do.
+    """
+    def box(box_type: bytes, payload: bytes) -> bytes:
+        return struct.pack(">I4s", len(payload) + 8, box_type) + payload
+
+    ftyp = box(b"ftyp", b"mp42\x00\x00\x00\x00mp42isom")
+    stco_size = 16 + 4 * chunks
+    # Nesting overhead: moov, trak, mdia, minf and stbl headers around the stco box
+    moov_size = 5 * 8 + stco_size
+    data_size = max(size - len(ftyp) - 8 - moov_size, chunks)
+    data_start = len(ftyp) + 8
+    step = data_size // chunks
+    stco = box(b"stco", struct.pack(f">4xI{chunks}I", chunks,
+                                    *(data_start + i * step for i in range(chunks))))
+    moov = box(b"moov", box(b"trak", box(b"mdia", box(b"minf", box(b"stbl", stco)))))
+    rng = random.Random(size)
+    return ftyp + box(b"mdat", rng.randbytes(data_size)) + moov
+
+
+def parse_distribution(value: str) -> LatencyDistribution:
+    """Parse "MEDIAN" or "MEDIAN:P95" (seconds) into a LatencyDistribution."""
+    median, _, p95 = value.partition(":")
+    return LatencyDistribution(float(median), float(p95) if p95 else None)
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """Mock behaviour flags shared by this CLI and loadtest.py."""
+    parser.add_argument("--chat-latency", type=parse_distribution, default=LatencyDistribution(0.5, 1.5),
+                        help="Chat completion latency MEDIAN[:P95] in seconds")
+    parser.add_argument("--chat-error-rate", type=float, default=0.0)
+    parser.add_argument("--chat-429-rate", type=float, default=0.0)
+    parser.add_argument("--chat-capacity", type=int, default=0,
+                        help="Chat requests served at once before answering 429 (0 = unlimited)")
+    parser.add_argument("--render", type=parse_distribution, default=LatencyDistribution(10.0, 20.0),
+                        help="Render duration MEDIAN[:P95] in seconds")
+    parser.add_argument("--render-failure-rate", type=float, default=0.0)
+    parser.add_argument("--video-error-rate", type=float, default=0.0)
+    parser.add_argument("--video-429-rate", type=float, default=0.0)
+    parser.add_argument("--video-mb", type=float, default=2.0, help="Size of downloaded videos in MB")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        chat_latency=args.chat_latency,
+        chat_error_rate=args.chat_error_rate,
+        chat_rate_limit_rate=args.chat_429_rate,
+        chat_capacity=args.chat_capacity,
+        render_duration=args.render,
+        render_failure_rate=args.render_failure_rate,
+        video_error_rate=args.video_error_rate,
+        video_rate_limit_rate=args.video_429_rate,
+        video_bytes=int(args.video_mb * 1024 * 1024),
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI chat + Sora video API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(config_from_args(args), host=args.host, port=args.port)
+    print(f"Mock OpenAI server on {server.base_url}")
+    print(f"  export OPENAI_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Progress-aware polling intervals for Sora video jobs.
+
+Renders take minutes and report a progress percentage. Polling at a fixed
+3 seconds wastes requests early on and still adds up to 3 seconds of latency
+at the end. AdaptivePollSchedule estimates time remaining from the observed
+progress rate and polls slowly while the job is far from done, then tightens
+the interval as completion approaches. Intervals are jittered so many jobs
+submitted together do not poll in lockstep.
+"""
+
+import time
+import random
+from typing import Optional
+
+DEFAULT_MIN_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 20.0
+DEFAULT_INITIAL_INTERVAL = 8.0
+DEFAULT_JITTER = 0.2
+
+# Poll again after this fraction of the estimated remaining render time
+DEFAULT_LEAD_FRACTION = 0.3
+
+
+class AdaptivePollSchedule:
+    """
+    Chooses the delay before the next status check of one job.
+
+    Call observe() after every successful status response and next_interval()
+    to get the delay before the following one.
+    """
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+                 jitter: float = DEFAULT_JITTER,
+                 lead_fraction: float = DEFAULT_LEAD_FRACTION):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.jitter = jitter
+        self.lead_fraction = lead_fraction
+
+        self._first_sample = None
+        self._last_sample = None
+        self._stalled_polls = 0
+
+    def observe(self, progress: Optional[float], now: Optional[float] = None):
+        """Record the progress percentage reported by a status check."""
+        now = time.monotonic() if now is None else now
+        if progress is None:
+            self._stalled_polls += 1
+            return
+
+        if self._last_sample is not None and progress <= self._last_sample[1]:
+            self._stalled_polls += 1
+            return
+
+        self._stalled_polls = 0
+        if self._first_sample is None:
+            self._first_sample = (now, progress)
+        self._last_sample = (now, progress)
+
+    def estimated_remaining(self) -> Optional[float]:
+        """Seconds until completion at the observed progress rate, or None if unknown."""
+        if self._first_sample is None or self._last_sample is self._first_sample:
+            return None
+        (t0, p0), (t1, p1) = self._first_sample, self._last_sample
+        if t1 <= t0 or p1 <= p0:
+            return None
+        rate = (p1 - p0) / (t1 - t0)
+        return max(100.0 - p1, 0.0) / rate
+
+    def next_interval(self, retry_after: Optional[float] = None) -> float:
+        """
+        Delay in seconds before the next status check.
+
+        Args:
+            retry_after: Server-provided Retry-After hint; always honored as a floor
+
+        Returns:
+            Jittered delay, never below min_interval
+        """
+        remaining = self.estimated_remaining()
+        if remaining is None:
+            # No rate yet: start slow and back off further while progress is stalled
+            base = self.initial_interval * (1.25 ** self._stalled_polls)
+        else:
+            base = remaining * self.lead_fraction
+
+        base = min(max(base, self.min_interval), self.max_interval)
+        delay = base * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+        delay = max(delay, self.min_interval)
+
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
@@ -0,0 +1,167 @@
+"""
+Token-budgeted serialization of the creative specification for the Scriptwriter.
+
+The Scriptwriter prompt embeds the whole creative spec. Pretty-printed JSON
+spends a large share of its tokens on indentation, and some fields (mood
+boards, reference styles) barely influence the script. serialize_spec():
+1. serializes compactly (no indentation, no spaces after separators)
+2. if still over the token budget, drops low-value fields in a fixed order
+3. if still over, shortens the longest remaining strings and lists
+
+Tokens are counted locally with tiktoken when it is installed, otherwise with
+a close regex-based estimate, so the budget is applied before anything is sent.
+"""
+
+import os
+import re
+import json
+import copy
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to an estimate
+    tiktoken = None
+
+# Token budget for the serialized spec (0 = compact serialization only, never prune)
+DEFAULT_SPEC_TOKEN_BUDGET = int(os.getenv("GLIMPSE_SPEC_TOKEN_BUDGET", "700"))
+
+# Encoding used by the gpt-4o / gpt-5 model families
+TOKENIZER_ENCODING = "o200k_base"
+
+# Dropped first to last when over budget; fields not listed are never dropped
+PRUNABLE_FIELDS = (
+    "reference_styles",
+    "moodboard_keywords",
+    "creative_goal",
+    "mood",
+)
+
+# Strings are shortened towards this many characters when pruning is not enough
+MIN_TRUNCATED_CHARS = 80
+
+_encoding = None
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]|\s*\n\s*")
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in text (exact with tiktoken, estimated otherwise)."""
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        return len(_encoding.encode(text))
+    # Words count roughly one token per 5 letters; digits, punctuation and
+    # newline+indent runs count one each
+    return sum((len(piece) + 4) // 5 if piece.isalpha() else 1
+               for piece in _TOKEN_PATTERN.findall(text))
+
+
+def tokenizer_name() -> str:
+    return f"tiktoken:{TOKENIZER_ENCODING}" if tiktoken is not None else "estimate"
+
+
+def compact_json(value: Any) -> str:
+    """JSON with no insignificant whitespace (non-ASCII kept as is)."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def serialize_spec(spec: Dict[str, Any],
+                   token_budget: Optional[int] = DEFAULT_SPEC_TOKEN_BUDGET) -> Tuple[str, Dict[str, Any]]:
+    """
+    Serialize a creative specification within a token budget.
+
+    Args:
+        spec: Creative specification from the Creative Director
+        token_budget: Maximum tokens for the serialized spec (None or 0 = no pruning)
+
+    Returns:
+        (serialized spec, report) where report holds original_tokens (indent=2),
+        compact_tokens, final_tokens, budget, dropped_fields, truncated_fields
+        and tokenizer
+    """
+    original_tokens = count_tokens(json.dumps(spec, indent=2))
+    text = compact_json(spec)
+    compact_tokens = tokens = count_tokens(text)
+    dropped = []
+    truncated = []
+
+    if token_budget and tokens > token_budget:
+        spec = copy.deepcopy(spec)
+
+        for field in PRUNABLE_FIELDS:
+            if tokens <= token_budget:
+                break
+            if field in spec:
+                del spec[field]
+                dropped.append(field)
+                text = compact_json(spec)
+                tokens = count_tokens(text)
+
+        while tokens > token_budget:
+            path = _shorten_longest(spec)
+            if path is None:
+                break
+            if path not in truncated:
+                truncated.append(path)
+            shortened = compact_json(spec)
+            if len(shortened) >= len(text):
+                # Nothing got shorter: stop rather than loop forever
+                break
+            text = shortened
+            tokens = count_tokens(text)
+
+    return text, {
+        "original_tokens": original_tokens,
+        "compact_tokens": compact_tokens,
+        "final_tokens": tokens,
+        "budget": token_budget or None,
+        "dropped_fields": dropped,
+        "truncated_fields": truncated,
+        "tokenizer": tokenizer_name()
+    }
+
+
+def _shorten_longest(spec: Dict[str, Any]) -> Optional[str]:
+    """Shorten the longest string (or list of strings) in spec by about a quarter; returns its path."""
+    candidates = [leaf for leaf in _leaves(spec, "") if _shrinkable(leaf[2][leaf[3]])]
+    if not candidates:
+        return None
+    _, path, container, key = max(candidates, key=lambda candidate: candidate[0])
+    value = container[key]
+    if isinstance(value, list):
+        container[key] = value[:max(1, len(value) * 3 // 4)]
+        return path
+
+    cut = max(MIN_TRUNCATED_CHARS, len(value) * 3 // 4)
+    # End on a word boundary and mark the cut
+    shortened = value[:cut].rsplit(" ", 1)[0].rstrip(" ,;:.…")
+    if len(shortened) + 1 >= len(value):
+        # No space to cut at (CJK, URLs, base64): cut characters so every step gets shorter
+        shortened = value[:min(cut, len(value) - 2)]
+    container[key] = shortened + "…"
+    return path
+
+
+def _shrinkable(value: Any) -> bool:
+    if isinstance(value, list):
+        return len(value) > 1
+    return len(value) > MIN_TRUNCATED_CHARS
+
+
+def _leaves(value: Any, path: str):
+    """Yield (size, path, container, key) for every string and every list of strings."""
+    if isinstance(value, dict):
+        items = list(value.items())
+    elif isinstance(value, list):
+        items = list(enumerate(value))
+    else:
+        return
+    for key, child in items:
+        child_path = f"{path}.{key}" if path else str(key)
+        if isinstance(child, str):
+            yield len(child), child_path, value, key
+        elif isinstance(child, list) and child and all(isinstance(entry, str) for entry in child):
+            yield sum(len(entry) for entry in child), child_path, value, key
+        else:
+            yield from _leaves(child, child_path)
@@ -0,0 +1,385 @@
+"""
+Compacts final video prompts to a character / token ceiling before submission.
+
+The Scriptwriter is asked for the most detailed prompt possible, and the
+results routinely run to 12-17k characters: the same palette, lighting and
+mood descriptors are restated in every section, and the narration is often
+repeated in a closing summary. compact_prompt():
+1. normalizes whitespace
+2. removes repeated lines, repeated sentences, repeated items in descriptor
+   lists, and narration lines whose quoted words and timestamps were
+   already given
+3. if still over the ceiling, drops low-priority sections (notes, summaries,
+   references), then cuts the longest descriptive lines down to their first
+   sentence, then cuts timed lines down to their timestamped sentences, then
+   drops descriptive lines (longest first)
+
+Narration lines are never changed and timed lines are never dropped, so the
+timeline and every spoken word survive compaction.
+
+Usage (benchmark on the saved example prompts):
+    python prompt_compactor.py examples/*.txt --max-chars 5000
+"""
+
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+from typing import Dict, Any, List, Optional, Tuple
+
+from prompt_budget import count_tokens
+
+# 0 disables a ceiling
+DEFAULT_MAX_CHARS = int(os.getenv("GLIMPSE_PROMPT_MAX_CHARS", "5000"))
+DEFAULT_MAX_TOKENS = int(os.getenv("GLIMPSE_PROMPT_MAX_TOKENS", "0"))
+
+# "0-3s", "[0.0 - 1.5 seconds]", "3–8 sec", "at 2.5s", "00:04"
+_TIMESTAMP = re.compile(
+    r"\b\d+(?:\.\d+)?\s*(?:s|sec|secs|seconds)?\s*[-–—]\s*\d+(?:\.\d+)?\s*(?:s|sec|secs|seconds)\b"
+    r"|\b\d+(?:\.\d+)?\s*(?:s|sec|secs|seconds)\b"
+    r"|\b\d{1,2}:\d{2}\b",
+    re.IGNORECASE
+)
+_NARRATION = re.compile(r"narrat|voice[- ]?over|\bvo\b|says\b|\bspoken\b|\bdialogue\b", re.IGNORECASE)
+_QUOTED = re.compile(r"[\"“]([^\"”]{3,})[\"”]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z\"“(])")
+_HEADER = re.compile(r"^\s*(?:=+.*=+|#+\s.*|[A-Z0-9][A-Z0-9 /&()\-]{2,}:?)\s*$")
+
+# Sections whose content can go first when a prompt is over its ceiling
+_LOW_PRIORITY_SECTION = re.compile(r"note|summary|reference|recap|checklist|style guide", re.IGNORECASE)
+
+
+def compact_prompt(prompt: str,
+                   max_chars: Optional[int] = DEFAULT_MAX_CHARS,
+                   max_tokens: Optional[int] = DEFAULT_MAX_TOKENS) -> Tuple[str, Dict[str, Any]]:
+    """
+    Compact a final video prompt to fit max_chars and max_tokens.
+
+    Args:
+        prompt: Final multimodal prompt from the Scriptwriter
+        max_chars: Character ceiling (None or 0 = no ceiling, deduplicate only)
+        max_tokens: Token ceiling (None or 0 = no ceiling)
+
+    Returns:
+        (compacted prompt, report) where report has original/final chars and
+        tokens, counts of removed duplicates and shortened/dropped lines,
+        protected line count and whether the result fits the ceilings
+    """
+    report = {
+        "original_chars": len(prompt),
+        "original_tokens": count_tokens(prompt),
+        "duplicates_removed": 0,
+        "sections_dropped": 0,
+        "lines_shortened": 0,
+        "lines_dropped": 0
+    }
+
+    lines = _normalize(prompt)
+    lines, report["duplicates_removed"] = _deduplicate(lines)
+
+    def fits(candidate: List["_Line"]) -> bool:
+        text = _join(candidate)
+        if max_chars and len(text) > max_chars:
+            return False
+        return not (max_tokens and count_tokens(text) > max_tokens)
+
+    if not fits(lines):
+        lines, report["sections_dropped"] = _drop_low_priority_sections(lines, fits)
+    if not fits(lines):
+        report["lines_shortened"] = _shorten_lines(lines, fits, timed=False)
+    if not fits(lines):
+        report["lines_shortened"] += _shorten_lines(lines, fits, timed=True)
+    if not fits(lines):
+        lines, report["lines_dropped"] = _drop_lines(lines, fits)
+
+    text = _join(lines)
+    report.update({
+        "final_chars": len(text),
+        "final_tokens": count_tokens(text),
+        "protected_lines": sum(1 for line in lines if line.protected),
+        "max_chars": max_chars or None,
+        "max_tokens": max_tokens or None,
+        "within_budget": fits(lines)
+    })
+    report["reduction"] = round(1 - report["final_chars"] / report["original_chars"], 3) if prompt else 0.0
+    return text, report
+
+
+class _Line:
+    """One line of the prompt plus what compaction may do with it."""
+
+    __slots__ = ("text", "narration", "timed", "header", "section", "had_content")
+
+    def __init__(self, text: str, section: str):
+        self.text = text
+        self.header = bool(_HEADER.match(text)) and len(text) < 80
+        self.narration = bool(_NARRATION.search(text))
+        self.timed = bool(_TIMESTAMP.search(text))
+        self.section = text if self.header else section
+        self.had_content = False
+
+    @property
+    def protected(self) -> bool:
+        """Never dropped (narration lines are also never shortened)."""
+        return self.narration or self.timed
+
+
+def _normalize(prompt: str) -> List[_Line]:
+    lines = []
+    section = ""
+    blank = False
+    for raw in prompt.replace("\r\n", "\n").split("\n"):
+        text = re.sub(r"[ \t]+", " ", raw).strip()
+        if not text:
+            # Keep single blank lines as paragraph breaks
+            if lines and not blank:
+                lines.append(_Line("", section))
+            blank = True
+            continue
+        blank = False
+        line = _Line(text, section)
+        section = line.section
+        lines.append(line)
+    while lines and not lines[-1].text:
+        lines.pop()
+    # Only headers whose content gets removed are dropped later, never ones that were empty to begin with
+    for index, line in enumerate(lines):
+        if line.header:
+            following = _next_content(lines, index)
+            line.had_content = following is not None and not following.header
+    return lines
+
+
+def _next_content(lines: List[_Line], index: int) -> Optional[_Line]:
+    return next((other for other in lines[index + 1:] if other.text), None)
+
+
+def _key(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def _deduplicate(lines: List[_Line]) -> Tuple[List[_Line], int]:
+    seen_lines = set()
+    seen_sentences = set()
+    seen_quotes = set()
+    seen_timestamps = set()
+    removed = 0
+    kept = []
+
+    for line in lines:
+        if not line.text:
+            kept.append(line)
+            continue
+
+        key = _key(line.text)
+        if key in seen_lines and not line.header:
+            removed += 1
+            continue
+        seen_lines.add(key)
+
+        quotes = [_key(quote) for quote in _QUOTED.findall(line.text)]
+        timestamps = set(_TIMESTAMP.findall(line.text))
+        if (line.narration and quotes and all(quote in seen_quotes for quote in quotes)
+                and timestamps <= seen_timestamps):
+            # A narration recap repeating words (and times) already scripted on the timeline
+            removed += 1
+            continue
+        seen_quotes.update(quotes)
+        seen_timestamps.update(timestamps)
+
+        if not line.protected and not line.header:
+            sentences = _SENTENCE_END.split(line.text)
+            unique = []
+            for sentence in sentences:
+                sentence_key = _key(sentence)
+                if len(sentence_key) > 20 and sentence_key in seen_sentences:
+                    removed += 1
+                    continue
+                seen_sentences.add(sentence_key)
+                unique.append(_dedupe_descriptors(sentence))
+            if not unique:
+                continue
+            line.text = " ".join(unique)
+        kept.append(line)
+
+    return _drop_empty_sections(kept), removed
+
+
+def _dedupe_descriptors(sentence: str) -> str:
+    """Remove repeated items from comma-separated descriptor lists ("soft, warm, soft light")."""
+    parts = sentence.split(", ")
+    if len(parts) < 3:
+        return sentence
+    seen = set()
+    unique = []
+    for part in parts:
+        key = _key(part)
+        if key and key in seen:
+            continue
+        seen.add(key)
+        unique.append(part)
+    return ", ".join(unique)
+
+
+def _drop_low_priority_sections(lines: List[_Line], fits) -> Tuple[List[_Line], int]:
+    dropped = 0
+    for section in dict.fromkeys(line.section for line in lines if line.header):
+        if fits(lines):
+            break
+        if not _LOW_PRIORITY_SECTION.search(section):
+            continue
+        members = [line for line in lines if line.section == section and line.text]
+        if any(line.protected and not line.header for line in members):
+            continue
+        lines = [line for line in lines if line.section != section or not line.text]
+        dropped += 1
+    return _drop_empty_sections(lines), dropped
+
+
+def _shorten_lines(lines: List[_Line], fits, timed: bool) -> int:
+    """
+    Cut the longest lines until the prompt fits: descriptive lines to their
+    first sentence, or (timed=True) timed lines to their timestamped sentences.
+    """
+    shortened = 0
+    candidates = sorted((line for line in lines if line.text and not line.header and not line.narration
+                         and line.timed == timed),
+                        key=lambda line: len(line.text), reverse=True)
+    for line in candidates:
+        if fits(lines):
+            break
+        sentences = _SENTENCE_END.split(line.text)
+        if timed:
+            keep = [sentence for index, sentence in enumerate(sentences)
+                    if index == 0 or _TIMESTAMP.search(sentence)]
+        else:
+            keep = sentences[:1]
+        if len(keep) < len(sentences):
+            line.text = " ".join(keep)
+            shortened += 1
+    return shortened
+
+
+def _droppable(line: _Line) -> bool:
+    return bool(line.text) and not line.protected and not line.header
+
+
+def _drop_lines(lines: List[_Line], fits) -> Tuple[List[_Line], int]:
+    """Drop unprotected lines, longest first; the opening line (the subject) is kept."""
+    first_content = next((index for index, line in enumerate(lines) if line.text), None)
+    order = sorted(
+        (index for index, line in enumerate(lines) if _droppable(line) and index != first_content),
+        key=lambda index: len(lines[index].text), reverse=True
+    )
+    removed = set()
+    for index in order:
+        if fits([line for i, line in enumerate(lines) if i not in removed]):
+            break
+        removed.add(index)
+    kept = [line for index, line in enumerate(lines) if index not in removed]
+    return _drop_empty_sections(kept), len(removed)
+
+
+def _drop_empty_sections(lines: List[_Line]) -> List[_Line]:
+    """Remove headers left without content and collapse repeated blank lines."""
+    result = []
+    for index, line in enumerate(lines):
+        if line.header and line.had_content and not line.protected:
+            following = _next_content(lines, index)
+            if following is None or following.header:
+                continue
+        if not line.text and (not result or not result[-1].text):
+            continue
+        result.append(line)
+    while result and not result[-1].text:
+        result.pop()
+    return result
+
+
+def _join(lines: List[_Line]) -> str:
+    return "\n".join(line.text for line in lines)
+
+
+def _narration_preserved(original: str, compacted: str) -> bool:
+    """Every quoted narration phrase of the original still appears in the result."""
+    remaining = _key(compacted)
+    for line in original.split("\n"):
+        if _NARRATION.search(line):
+            for quote in _QUOTED.findall(line):
+                if _key(quote) not in remaining:
+                    return False
+    return True
+
+
+def _timestamps_preserved(original: str, compacted: str) -> bool:
+    """Every shot timestamp of the original still appears in the result, and no new one."""
+    return set(_TIMESTAMP.findall(compacted)) == set(_TIMESTAMP.findall(original))
+
+
+def benchmark(paths: List[str], max_chars: Optional[int], max_tokens: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    Compact every prompt file and measure the result.
+
+    Returns:
+        One report per file, with path, compaction time and narration_preserved /
+        timestamps_preserved checks
+    """
+    results = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            prompt = f.read()
+        start_time = time.perf_counter()
+        compacted, report = compact_prompt(prompt, max_chars, max_tokens)
+        report["milliseconds"] = round((time.perf_counter() - start_time) * 1000, 1)
+        report["narration_preserved"] = _narration_preserved(prompt, compacted)
+        report["timestamps_preserved"] = _timestamps_preserved(prompt, compacted)
+        report["path"] = path
+        results.append(report)
+    return results
+
+
+def main():
+    """Command-line entry point: benchmark the compactor on prompt files."""
+    parser = argparse.ArgumentParser(description="Compact Sora prompts and report the savings")
+    parser.add_argument("paths", nargs="*", help="Prompt .txt files (default: examples/*.txt)")
+    parser.add_argument("--max-chars", type=int, default=DEFAULT_MAX_CHARS)
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
+    parser.add_argument("--show", action="store_true", help="Print each compacted prompt")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                        "examples", "*.txt")))
+    if not paths:
+        raise SystemExit("❌ No prompt files found")
+
+    results = benchmark(paths, args.max_chars, args.max_tokens)
+
+    print(f"{'Prompt':40} {'Chars':>7} {'→':>1} {'Chars':>6} {'Tokens':>7} {'→':>1} {'Tokens':>6} "
+          f"{'Saved':>6} {'Dup':>4} {'Cut':>4} {'Drop':>4} {'ms':>6}  OK")
+    for result in results:
+        ok = result["within_budget"] and result["narration_preserved"] and result["timestamps_preserved"]
+        print(f"{os.path.basename(result['path'])[:40]:40} {result['original_chars']:>7} → "
+              f"{result['final_chars']:>6} {result['original_tokens']:>7} → {result['final_tokens']:>6} "
+              f"{result['reduction']:>6.0%} {result['duplicates_removed']:>4} {result['lines_shortened']:>4} "
+              f"{result['lines_dropped']:>4} {result['milliseconds']:>6}  {'✓' if ok else '✗'}")
+
+    original = sum(result["original_chars"] for result in results)
+    final = sum(result["final_chars"] for result in results)
+    print(f"\nTotal: {original} → {final} chars ({1 - final / original:.0%} smaller), "
+          f"{sum(result['original_tokens'] for result in results)} → "
+          f"{sum(result['final_tokens'] for result in results)} tokens")
+
+    if args.show:
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                print(f"\n{'='*80}\n{path}\n{'='*80}")
+                print(compact_prompt(f.read(), args.max_chars, args.max_tokens)[0])
+
+    if not all(result["narration_preserved"] and result["timestamps_preserved"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,481 @@
+"""
+End-to-end render pipeline: one-liner → concept → Sora render → download
+
+Runs concept generation (agent_system.py) and Sora rendering (generate_video.py)
+as overlapped pipeline stages, each with its own worker pool and bounded queue.
+While item N is rendering, items N+1..N+k are being scripted, and every
+finished script is submitted to Sora as soon as a render worker is free.
+
+Usage:
+    python render_pipeline.py one_liners.txt --model sora-2 --render-workers 3
+"""
+
+import os
+import sys
+import time
+import json
+import asyncio
+import argparse
+from typing import Dict, Any, List, Optional, Iterable, Callable, Awaitable
+
+from agent_system import AsyncVideoProductionPipeline, DEFAULT_PIPELINE_MODE, PIPELINE_MODES
+from http_transport import HTTPTransport, get_transport
+from video_poller import VideoJobPoller
+from job_store import VideoJobStore, get_job_store, hash_prompt
+from singleflight import AsyncSingleFlight
+from submission_limiter import SubmissionLimiter, get_submission_limiter
+from metrics import MetricsRegistry, get_metrics, print_latency_table, start_exporter_from_env
+from generate_video import (
+    MODELS,
+    DURATION,
+    SIZE,
+    get_model_config,
+    find_cached_render,
+    job_error_message,
+    record_render,
+    submit_video_job,
+    download_video
+)
+
+# Sentinel that tells a stage worker to shut down
+_STOP = object()
+
+STAGES = ("concept", "render", "download")
+
+
+class StageStats:
+    """Busy time, throughput and queue depth bookkeeping for one pipeline stage."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.busy_seconds = 0.0
+        self.completed = 0
+        self.failed = 0
+        self.queue_wait_seconds = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.depth_max = 0
+
+    def sample_depth(self, depth: int):
+        self.depth_samples += 1
+        self.depth_total += depth
+        self.depth_max = max(self.depth_max, depth)
+
+    def report(self, wall_seconds: float) -> Dict[str, Any]:
+        processed = self.completed + self.failed
+        capacity = self.workers * wall_seconds
+        return {
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "utilization": round(self.busy_seconds / capacity, 3) if capacity else 0.0,
+            "avg_queue_wait_seconds": round(self.queue_wait_seconds / processed, 2) if processed else 0.0,
+            "avg_queue_depth": round(self.depth_total / self.depth_samples, 2) if self.depth_samples else 0.0,
+            "max_queue_depth": self.depth_max
+        }
+
+
+class RenderPipeline:
+    """
+    Overlapped concept → render → download runner.
+
+    Stages:
+    1. concept: Creative Director → Scriptwriter (async OpenAI client)
+    2. render: submit to Sora and wait on the shared multi-job poller
+    3. download: fetch the finished MP4
+
+    Each stage has its own worker pool; bounded queues between stages provide
+    backpressure so scripting never runs more than a few items ahead of rendering.
+
+    Unless force_render is set, a script identical to an earlier render reuses
+    it (see generate_video.find_cached_render): a downloaded MP4 skips both
+    render and download, and a job still rendering is watched, not resubmitted.
+    Identical scripts that reach the render stage together share one lookup
+    and submission, so only one of them pays for the render.
+
+    render_one() runs the render and download stages for a single scripted
+    item outside the queues (api_server.py uses it); on_progress is called
+    with (item, job object) after every status check of an item's render.
+    Videos are saved to output_dir (default: the current directory).
+    """
+
+    def __init__(self, model: str = "sora-2",
+                 concept_workers: int = 4,
+                 render_workers: int = 2,
+                 download_workers: int = 2,
+                 render_queue_size: int = 4,
+                 duration: str = DURATION,
+                 size: str = SIZE,
+                 poller: Optional[VideoJobPoller] = None,
+                 concept_pipeline: Optional[AsyncVideoProductionPipeline] = None,
+                 transport: Optional[HTTPTransport] = None,
+                 store: Optional[VideoJobStore] = None,
+                 limiter: Optional[SubmissionLimiter] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 concept_mode: str = DEFAULT_PIPELINE_MODE,
+                 force_render: bool = False,
+                 output_dir: Optional[str] = None,
+                 on_progress: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None):
+        self.model = model
+        self.force_render = force_render
+        self.output_dir = output_dir
+        self.on_progress = on_progress
+        self.cost_per_second = get_model_config(model)["cost_per_second"]
+        self.duration = duration
+        self.size = size
+        self.render_queue_size = render_queue_size
+        self.workers = {
+            "concept": concept_workers,
+            "render": render_workers,
+            "download": download_workers
+        }
+        self.transport = transport or get_transport()
+        self.store = store or get_job_store()
+        self.limiter = limiter or get_submission_limiter()
+        self.metrics = metrics or get_metrics()
+        self.poller = poller or VideoJobPoller(transport=self.transport)
+        # A fresh job is never done within seconds, so skip the immediate first check
+        self.poller_first_check = self.poller.schedule_factory().initial_interval
+        self.concept_pipeline = concept_pipeline or AsyncVideoProductionPipeline(
+            max_concurrency=concept_workers, transport=self.transport, mode=concept_mode
+        )
+        self.stats = {name: StageStats(name, self.workers[name]) for name in STAGES}
+        self.cache_hits = {"file": 0, "in_flight": 0}
+        self._submissions = AsyncSingleFlight()
+        self._downloads = AsyncSingleFlight()
+        self.wall_seconds = 0.0
+
+    async def run(self, product_one_liners: Iterable[str],
+                  on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Push every one-liner through all stages.
+
+        Args:
+            product_one_liners: One-liners to turn into videos
+            on_result: Optional callback invoked as each item finishes (or fails)
+
+        Returns:
+            One item dictionary per one-liner, in completion order
+        """
+        queues = {
+            "concept": asyncio.Queue(maxsize=self.workers["concept"] * 2),
+            "render": asyncio.Queue(maxsize=self.render_queue_size),
+            "download": asyncio.Queue(maxsize=self.workers["download"] * 2)
+        }
+        handlers = {
+            "concept": self._make_concept,
+            "render": self._render,
+            "download": self._download
+        }
+        results = []
+
+        def finish(item: Dict[str, Any]):
+            results.append(item)
+            if on_result is not None:
+                on_result(item)
+
+        start_time = time.perf_counter()
+        monitor = asyncio.create_task(self._monitor_queues(queues))
+
+        pools = {}
+        for index, name in enumerate(STAGES):
+            outbox = queues[STAGES[index + 1]] if index + 1 < len(STAGES) else None
+            pools[name] = [
+                asyncio.create_task(self._stage_worker(name, queues[name], outbox, handlers[name], finish))
+                for _ in range(self.workers[name])
+            ]
+
+        try:
+            for index, one_liner in enumerate(product_one_liners):
+                await self._put(queues["concept"], {
+                    "index": index,
+                    "product": one_liner,
+                    "status": "pending",
+                    "timings": {}
+                })
+
+            # Drain stage by stage: a stage stops only after everything upstream has finished
+            for name in STAGES:
+                for _ in pools[name]:
+                    await queues[name].put(_STOP)
+                await asyncio.gather(*pools[name])
+        finally:
+            monitor.cancel()
+            await self.poller.close()
+            for tasks in pools.values():
+                for task in tasks:
+                    task.cancel()
+            self.wall_seconds = time.perf_counter() - start_time
+
+        return results
+
+    async def render_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Render and download one scripted item, outside the batch queues.
+
+        Args:
+            item: Dictionary with "concept" (a successful pipeline output) and "timings"
+
+        Returns:
+            The same item, with status "success" or "error"
+        """
+        for name, handler in (("render", self._render), ("download", self._download)):
+            if not await self._process(name, handler, item):
+                break
+        return item
+
+    def report(self) -> Dict[str, Any]:
+        """Per-stage utilization and queue depth from the last run, for sizing each pool."""
+        return {
+            "wall_seconds": round(self.wall_seconds, 2),
+            "stages": {name: self.stats[name].report(self.wall_seconds) for name in STAGES},
+            "connections": self.transport.stats(),
+            "polling": self.poller.stats(),
+            "submissions": self.limiter.stats(),
+            "render_cache_hits": dict(self.cache_hits),
+            "latency": self.metrics.summary()
+        }
+
+    async def _put(self, queue: asyncio.Queue, item: Dict[str, Any]):
+        item["_enqueued_at"] = time.perf_counter()
+        await queue.put(item)
+
+    async def _stage_worker(self, name: str, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue],
+                            handler: Callable[[Dict[str, Any]], Awaitable[None]],
+                            finish: Callable[[Dict[str, Any]], None]):
+        stats = self.stats[name]
+        while True:
+            item = await inbox.get()
+            if item is _STOP:
+                return
+
+            started = time.perf_counter()
+            stats.queue_wait_seconds += started - item.pop("_enqueued_at", started)
+            if not await self._process(name, handler, item) or outbox is None:
+                finish(item)
+            else:
+                await self._put(outbox, item)
+
+    async def _process(self, name: str, handler: Callable[[Dict[str, Any]], Awaitable[None]],
+                       item: Dict[str, Any]) -> bool:
+        # Run one stage on one item; False (with the item marked as an error) if it failed
+        stats = self.stats[name]
+        started = time.perf_counter()
+        try:
+            await handler(item)
+            stats.completed += 1
+        except Exception as e:
+            item["status"] = "error"
+            item["error"] = f"{name} stage failed: {e}"
+            stats.failed += 1
+        elapsed = time.perf_counter() - started
+        stats.busy_seconds += elapsed
+        item["timings"][name] = round(elapsed, 2)
+        return item["status"] != "error"
+
+    async def _monitor_queues(self, queues: Dict[str, asyncio.Queue], interval: float = 0.5):
+        while True:
+            for name, queue in queues.items():
+                self.stats[name].sample_depth(queue.qsize())
+            await asyncio.sleep(interval)
+
+    async def _make_concept(self, item: Dict[str, Any]):
+        result = await self.concept_pipeline.create_video_concept(item["product"], verbose=False)
+        item["concept"] = result
+        if result["status"] != "success":
+            # Resumable with python main.py --resume <run_id>
+            item["run_id"] = result.get("run_id")
+            raise RuntimeError(result.get("error", "concept generation failed"))
+        item["status"] = "scripted"
+
+    async def _render(self, item: Dict[str, Any]):
+        prompt = item["concept"]["final_prompt_for_video_generation"]
+        cached = job = slot = None
+        if not self.force_render:
+            # The job row is only written after the POST, so identical scripts waiting on the
+            # limiter together would each submit; coalesce them and let the others attach
+            key = (hash_prompt(prompt), self.model, self.size, str(self.duration))
+            (cached, job, slot), shared = await self._submissions.do(
+                key, lambda: self._find_or_submit(prompt)
+            )
+            if shared:
+                # Another item did the lookup and any submission: attach to the row it found or wrote
+                cached = find_cached_render(prompt, self.model, self.duration, self.size, self.store)
+                job = slot = None
+        if cached is not None:
+            await self._reuse_render(item, cached)
+            return
+        if job is None:
+            job, slot = await self._submit(prompt)
+
+        item["video_id"] = job["id"]
+        item["status"] = "rendering"
+        submitted_at = time.perf_counter()
+
+        def record(info: Dict[str, Any]):
+            self.store.update_status(job["id"], info["status"], info.get("progress"),
+                                     job_error_message(info))
+            self.limiter.heartbeat(slot)
+            self._progress(item, info)
+
+        try:
+            info = await self.poller.watch(job["id"], on_update=record, delay=self.poller_first_check)
+        finally:
+            self.limiter.release(slot)
+        record_render(self.model, self.duration, time.perf_counter() - submitted_at, info["status"])
+        if info["status"] != "completed":
+            raise RuntimeError(f"video {job['id']} {info['status']}")
+        item["status"] = "rendered"
+
+    async def _find_or_submit(self, prompt: str):
+        # (cached, None, None) for a render cache hit, (None, job, slot) for a new submission
+        cached = find_cached_render(prompt, self.model, self.duration, self.size, self.store)
+        if cached is not None:
+            return cached, None, None
+        job, slot = await self._submit(prompt)
+        return None, job, slot
+
+    async def _submit(self, prompt: str):
+        # Waits for a token and an in-flight slot (shared with other processes); 429s are retried
+        job, slot = await self.limiter.asubmit(
+            self.model,
+            lambda: submit_video_job(prompt, self.model, self.duration, self.size, self.transport)
+        )
+        self.store.record_submission(job["id"], prompt, self.model, self.size, self.duration,
+                                     cost=round(int(self.duration) * self.cost_per_second, 2),
+                                     status=job.get("status", "queued"))
+        return job, slot
+
+    async def _reuse_render(self, item: Dict[str, Any], cached: Dict[str, Any]):
+        self.cache_hits[cached["cache_hit"]] += 1
+        item["video_id"] = cached["video_id"]
+        item["cache_hit"] = cached["cache_hit"]
+        item["cost"] = 0.0
+        if cached["cache_hit"] == "in_flight":
+            # The submitting process holds the slot and records the render
+            item["status"] = "rendering"
+            def record(info: Dict[str, Any]):
+                self.store.update_status(cached["video_id"], info["status"], info.get("progress"),
+                                         job_error_message(info))
+                self._progress(item, info)
+
+            info = await self.poller.watch(cached["video_id"], on_update=record)
+            if info["status"] != "completed":
+                raise RuntimeError(f"video {cached['video_id']} {info['status']}")
+        else:
+            item["video_path"] = cached["output_path"]
+            item["size_bytes"] = os.path.getsize(cached["output_path"])
+            item["download"] = {"sha256": cached["sha256"]}
+        item["status"] = "rendered"
+
+    def _progress(self, item: Dict[str, Any], info: Dict[str, Any]):
+        item["progress"] = info.get("progress")
+        if self.on_progress is not None:
+            self.on_progress(item, info)
+
+    async def _download(self, item: Dict[str, Any]):
+        if item.get("video_path"):
+            # Served from the render cache
+            item["status"] = "success"
+            return
+        # Items attached to the same job fetch its MP4 once instead of racing on one file
+        download, _ = await self._downloads.do(
+            item["video_id"], lambda: asyncio.to_thread(self._fetch, item["video_id"])
+        )
+        item["video_path"] = download["path"]
+        item["size_bytes"] = download["bytes"]
+        item["download"] = {
+            "sha256": download["sha256"],
+            "mb_per_second": download["mb_per_second"],
+            "resumes": download["resumes"],
+            "segments": download["segments"],
+            "faststart": download.get("faststart", {}).get("status")
+        }
+        item.setdefault("cost", round(int(self.duration) * self.cost_per_second, 2))
+        item["status"] = "success"
+
+    def _fetch(self, video_id: str) -> Dict[str, Any]:
+        download = download_video(video_id, None, self.transport, output_dir=self.output_dir)
+        self.store.mark_downloaded(video_id, download["path"], download["sha256"])
+        return download
+
+
+def print_report(report: Dict[str, Any]):
+    """Print a per-stage utilization table to stderr."""
+    print("\n" + "="*80, file=sys.stderr)
+    print("RENDER PIPELINE REPORT", file=sys.stderr)
+    print("="*80, file=sys.stderr)
+    print(f"Wall time: {report['wall_seconds']}s", file=sys.stderr)
+    print(f"{'Stage':10} {'Workers':>7} {'Done':>5} {'Failed':>6} {'Util':>6} "
+          f"{'AvgWait':>8} {'AvgQ':>6} {'MaxQ':>5}", file=sys.stderr)
+    for name, stage in report["stages"].items():
+        print(f"{name:10} {stage['workers']:>7} {stage['completed']:>5} {stage['failed']:>6} "
+              f"{stage['utilization']:>6.0%} {stage['avg_queue_wait_seconds']:>7}s "
+              f"{stage['avg_queue_depth']:>6} {stage['max_queue_depth']:>5}", file=sys.stderr)
+    print_latency_table(report["latency"], file=sys.stderr)
+    submissions = report["submissions"]
+    print(f"Submissions: {submissions['acquired']} sent, {submissions['waits']} waits "
+          f"({submissions['waited_seconds']}s), {submissions['rate_limited']} rate limited", file=sys.stderr)
+    cache_hits = report["render_cache_hits"]
+    if any(cache_hits.values()):
+        print(f"Render cache: {cache_hits['file']} reused file(s), "
+              f"{cache_hits['in_flight']} attached to in-flight job(s)", file=sys.stderr)
+    for pool, counts in report["connections"].items():
+        if isinstance(counts, dict):
+            print(f"HTTP {pool}: {counts['requests']} requests, {counts['new_connections']} new connections "
+                  f"({counts['reuse_rate']:.0%} reused)", file=sys.stderr)
+    print("="*80 + "\n", file=sys.stderr)
+
+
+def main():
+    """Command-line entry point: one-liners file in, JSONL of rendered items out."""
+    parser = argparse.ArgumentParser(description="Overlapped concept → Sora render pipeline")
+    parser.add_argument("input", help="File with one product one-liner per line ('-' for stdin)")
+    parser.add_argument("--model", default="sora-2",
+                        choices=[config["name"] for config in MODELS.values()])
+    parser.add_argument("--concept-workers", type=int, default=4)
+    parser.add_argument("--render-workers", type=int, default=2)
+    parser.add_argument("--download-workers", type=int, default=2)
+    parser.add_argument("--render-queue-size", type=int, default=4,
+                        help="Finished scripts allowed to wait for a render worker")
+    parser.add_argument("--concept-mode", choices=PIPELINE_MODES, default=DEFAULT_PIPELINE_MODE,
+                        help="Concept generation mode (fast = one fused agent call)")
+    parser.add_argument("--prewarm", action="store_true",
+                        help="Open API connections before starting")
+    parser.add_argument("--force-render", action="store_true",
+                        help="Render every script, even ones identical to an earlier render")
+    args = parser.parse_args()
+    if not os.getenv("OPENAI_API_KEY"):
+        raise SystemExit("❌ OPENAI_API_KEY not found in .env file")
+
+    stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    with stream:
+        one_liners = [line.strip() for line in stream if line.strip()]
+
+    pipeline = RenderPipeline(
+        model=args.model,
+        concept_workers=args.concept_workers,
+        render_workers=args.render_workers,
+        download_workers=args.download_workers,
+        render_queue_size=args.render_queue_size,
+        concept_mode=args.concept_mode,
+        force_render=args.force_render
+    )
+
+    if args.prewarm:
+        pipeline.transport.prewarm(connections=args.render_workers)
+
+    for exporter in start_exporter_from_env():
+        print(f"Exporting metrics to {exporter}", file=sys.stderr)
+
+    def emit(item: Dict[str, Any]):
+        print(json.dumps(item, ensure_ascii=False), flush=True)
+
+    asyncio.run(pipeline.run(one_liners, on_result=emit))
+    print_report(pipeline.report())
+
+
+if __name__ == "__main__":
+    main()
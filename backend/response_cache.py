@@ -0,0 +1,223 @@
+"""
+Persistent content-addressed cache for agent LLM responses.
+
+Identical requests (same model, reasoning effort, system prompt and rendered
+user prompt) always produce the same cache key, so re-running a one-liner
+returns the stored response instantly instead of paying latency and tokens again.
+
+Layout:
+- In-memory LRU front for hot entries
+- On-disk JSON files under cache_dir, sharded by the first two hex chars of the key
+- Entries expire after ttl_seconds; the disk tier is trimmed to max_disk_bytes
+  by evicting least-recently-used files
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List
+
+DEFAULT_CACHE_DIR = os.getenv("GLIMPSE_CACHE_DIR", ".cache/responses")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600  # one week
+DEFAULT_MAX_MEMORY_ENTRIES = 256
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024  # 256 MB
+
+
+class ResponseCache:
+    """
+    Two-tier (memory + disk) cache for chat completion responses.
+
+    Values are plain dictionaries (message content and token usage), so
+    they round-trip through JSON unchanged. Safe to share between threads
+    and between the sync and async agents.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "expired": 0,
+            "evictions": 0,
+            "writes": 0
+        }
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._disk_bytes = sum(os.path.getsize(path) for path in self._disk_files())
+
+    @staticmethod
+    def make_key(model: str, reasoning_effort: str, messages: List[Dict[str, str]]) -> str:
+        """
+        Build the content address for a chat completion request.
+
+        Args:
+            model: Model name (e.g. gpt-5.1)
+            reasoning_effort: Reasoning effort sent with the request
+            messages: Chat messages (system prompt and rendered user prompt)
+
+        Returns:
+            SHA-256 hex digest identifying the request
+        """
+        material = json.dumps({
+            "model": model,
+            "reasoning_effort": reasoning_effort,
+            "messages": [[m["role"], m["content"]] for m in messages]
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._is_expired(entry):
+                    del self._memory[key]
+                    self._counters["expired"] += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["memory_hits"] += 1
+                    return entry["value"]
+
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+
+        if self._is_expired(entry):
+            self._remove_file(path)
+            with self._lock:
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+            return None
+
+        # Touch the file so disk eviction treats it as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        with self._lock:
+            self._remember(key, entry)
+            self._counters["hits"] += 1
+            self._counters["disk_hits"] += 1
+        return entry["value"]
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store value under key in both tiers."""
+        entry = {"created_at": time.time(), "value": value}
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+        path = self._path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        # Write to a temp file first so readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._remember(key, entry)
+            self._counters["writes"] += 1
+            self._disk_bytes += len(data) - previous_size
+            over_budget = self._disk_bytes > self.max_disk_bytes
+
+        if over_budget:
+            self._evict_disk()
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        for path in self._disk_files():
+            self._remove_file(path)
+        with self._lock:
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current tier sizes."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes
+            }
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        # Caller holds self._lock
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        if self.ttl_seconds is None:
+            return False
+        return time.time() - entry.get("created_at", 0) > self.ttl_seconds
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _disk_files(self) -> List[str]:
+        paths = []
+        for root, _, files in os.walk(self.cache_dir):
+            paths.extend(os.path.join(root, name) for name in files if name.endswith(".json"))
+        return paths
+
+    def _remove_file(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes -= size
+
+    def _evict_disk(self):
+        """Drop least-recently-used files until the disk tier is back under 90% of budget."""
+        target = int(self.max_disk_bytes * 0.9)
+        entries = []
+        for path in self._disk_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self._counters["evictions"] += 1
+
+        with self._lock:
+            self._disk_bytes = total
@@ -0,0 +1,141 @@
+"""
+Request coalescing ("singleflight") for identical concurrent calls.
+
+When several callers ask for the same key at the same time, only the first
+(the leader) runs the work; the others wait for it and receive the same
+result, or the same exception. The key is forgotten the moment the work
+finishes, so a call that starts afterwards always runs fresh: this shares
+in-flight work only and never serves a stored result (that is ResponseCache's
+job).
+
+SingleFlight is for threads, AsyncSingleFlight for coroutines on one event loop.
+"""
+
+import re
+import asyncio
+import threading
+import unicodedata
+from typing import Dict, Any, Callable, Awaitable, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of free text for coalescing keys (Unicode NFKC, collapsed whitespace)."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread-safe coalescing of identical concurrent calls."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the request
+            fn: Work to run if no identical call is in flight
+
+        Returns:
+            (result, shared) where shared is True for callers that joined
+            another caller's in-flight call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["leaders"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Forget the key before waking the waiters, so later calls start fresh
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
+
+
+class AsyncSingleFlight:
+    """
+    Coalescing of identical concurrent coroutine calls.
+
+    The work runs in its own task, so cancelling one caller (the leader
+    included) does not cancel it for the others; it is cancelled only once
+    every caller waiting on it has gone.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Await fn() once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the request
+            fn: Coroutine function to run if no identical call is in flight
+
+        Returns:
+            (result, shared) where shared is True for callers that joined
+            another caller's in-flight call
+        """
+        entry = self._calls.get(key)
+        shared = entry is not None
+        if shared:
+            self._stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            entry = self._calls[key] = [task, 0]
+            self._stats["leaders"] += 1
+            # Forget the key as soon as the work finishes, so later calls start fresh
+            task.add_done_callback(lambda _, key=key, entry=entry: self._forget(key, entry))
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task), shared
+        except asyncio.CancelledError:
+            if not task.done() and entry[1] == 1:
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def _forget(self, key: Hashable, entry: list):
+        if self._calls.get(key) is entry:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats, in_flight=len(self._calls))
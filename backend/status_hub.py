@@ -0,0 +1,208 @@
+"""
+Fan-out of Sora job status to many local subscribers.
+
+Any number of dashboards, users or components can watch the same video_id.
+StatusHub starts one VideoJobPoller watch per job (so each job is polled
+upstream once per interval, however many subscribers it has) and hands every
+status check to all of them. The latest status of each job is cached, so a
+new subscriber gets the current state immediately, and a job that already
+finished is answered from the cache without another upstream request.
+
+Subscribers can be callbacks, asyncio queues or async iterators (used by the
+SSE endpoint in api_server.py). The hub lives on the poller's event loop and
+must only be used from it.
+
+Usage:
+    hub = StatusHub(poller)
+    subscription = hub.subscribe(video_id, lambda info: print(info["progress"]))
+    async for info in hub.updates(video_id):
+        ...
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, AsyncIterator
+
+from video_poller import VideoJobPoller, TERMINAL_STATUSES
+
+# Jobs whose latest status is kept after nobody is watching them any more
+DEFAULT_CACHE_SIZE = 1000
+
+# Updates buffered per queue subscriber; when full the oldest is dropped (newer ones supersede it)
+DEFAULT_QUEUE_SIZE = 16
+
+
+class Subscription:
+    """One subscriber's interest in one job; close() to stop receiving updates."""
+
+    def __init__(self, hub: "StatusHub", video_id: str, callback: Callable[[Dict[str, Any]], None],
+                 queue: Optional[asyncio.Queue] = None):
+        self.video_id = video_id
+        self.callback = callback
+        # Set for queue subscribers; receives None once the job has finished
+        self.queue = queue
+        self.closed = False
+        self._hub = hub
+
+    def close(self):
+        if not self.closed:
+            self._hub._unsubscribe(self)
+
+
+class StatusHub:
+    """
+    One upstream watch per job, fanned out to every local subscriber.
+
+    Args:
+        poller: Poller that performs the status checks (default: a new one)
+        cache_size: Finished or unwatched jobs whose last status is kept
+    """
+
+    def __init__(self, poller: Optional[VideoJobPoller] = None, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.poller = poller or VideoJobPoller()
+        self.cache_size = cache_size
+        self._subscribers = {}
+        self._listeners = {}
+        self._last = OrderedDict()
+        self._stats = {
+            "subscriptions": 0,
+            "served_from_cache": 0,
+            "upstream_watches": 0,
+            "updates": 0,
+            "deliveries": 0
+        }
+
+    def last_status(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Latest known job object, without any upstream request (None if never seen)."""
+        info = self._last.get(video_id)
+        return info if info is not None else self.poller.last_status(video_id)
+
+    def subscribe(self, video_id: str, callback: Callable[[Dict[str, Any]], None]) -> Subscription:
+        """
+        Call callback with the job object after every status check of a job.
+
+        The current status, if known, is delivered right away. A job that has
+        already finished gets just that final status and no upstream request.
+        """
+        return self._add(Subscription(self, video_id, callback))
+
+    def subscribe_queue(self, video_id: str, maxsize: int = DEFAULT_QUEUE_SIZE) -> Subscription:
+        """
+        Like subscribe(), but updates are put on subscription.queue, followed by
+        None once the job has finished (or its watch failed).
+        """
+        queue = asyncio.Queue(maxsize=maxsize)
+        return self._add(Subscription(self, video_id, lambda info: _offer(queue, info), queue))
+
+    async def updates(self, video_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over a job's status updates until it finishes."""
+        subscription = self.subscribe_queue(video_id)
+        try:
+            while True:
+                info = await subscription.queue.get()
+                if info is None:
+                    return
+                yield info
+        finally:
+            subscription.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Subscription and delivery counters; compare updates with deliveries for the fan-out."""
+        return {
+            **self._stats,
+            "watched_jobs": len(self._listeners),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values())
+        }
+
+    # --- internals -----------------------------------------------------------------
+
+    def _add(self, subscription: Subscription) -> Subscription:
+        video_id = subscription.video_id
+        self._stats["subscriptions"] += 1
+        info = self.last_status(video_id)
+        if info is not None and info.get("status") in TERMINAL_STATUSES:
+            self._stats["served_from_cache"] += 1
+            self._deliver(subscription, info)
+            self._close(subscription)
+            return subscription
+
+        self._subscribers.setdefault(video_id, set()).add(subscription)
+        if video_id in self._listeners:
+            if info is not None:
+                self._deliver(subscription, info)
+        else:
+            # The poller delivers its last status (if any) to a new listener right away
+            self._watch(video_id)
+        return subscription
+
+    def _watch(self, video_id: str):
+        def listener(info: Dict[str, Any]):
+            self._publish(video_id, info)
+
+        self._listeners[video_id] = listener
+        if video_id not in self.poller.active_jobs:
+            self._stats["upstream_watches"] += 1
+        future = self.poller.watch(video_id, on_update=listener)
+        future.add_done_callback(lambda future: self._watch_done(video_id, listener, future))
+
+    def _publish(self, video_id: str, info: Dict[str, Any]):
+        self._stats["updates"] += 1
+        self._last[video_id] = info
+        self._last.move_to_end(video_id)
+        self._trim_cache()
+        for subscription in list(self._subscribers.get(video_id, ())):
+            self._deliver(subscription, info)
+
+    def _deliver(self, subscription: Subscription, info: Dict[str, Any]):
+        self._stats["deliveries"] += 1
+        try:
+            subscription.callback(info)
+        except Exception:
+            # One broken subscriber must not stop the others from being updated
+            pass
+
+    def _watch_done(self, video_id: str, listener: Callable, future: asyncio.Future):
+        if self._listeners.get(video_id) is not listener:
+            return
+        del self._listeners[video_id]
+        # Finished, failed too often, or unwatched: every subscriber is done
+        for subscription in list(self._subscribers.pop(video_id, ())):
+            self._close(subscription)
+
+    def _unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.video_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+        self._close(subscription)
+        if subscribers:
+            return
+
+        # Nobody here is interested any more: stop polling unless someone else is watching the job
+        video_id = subscription.video_id
+        self._subscribers.pop(video_id, None)
+        listener = self._listeners.pop(video_id, None)
+        if listener is not None and self.poller.remove_listener(video_id, listener) == 0:
+            self.poller.unwatch(video_id)
+
+    def _close(self, subscription: Subscription):
+        if subscription.closed:
+            return
+        subscription.closed = True
+        if subscription.queue is not None:
+            _offer(subscription.queue, None)
+
+    def _trim_cache(self):
+        excess = len(self._last) - self.cache_size
+        for video_id in list(self._last):
+            if excess <= 0:
+                break
+            if video_id not in self._listeners:
+                del self._last[video_id]
+                excess -= 1
+
+
+def _offer(queue: asyncio.Queue, item: Optional[Dict[str, Any]]):
+    # Put without blocking; a slow consumer loses its oldest update, never the newest
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
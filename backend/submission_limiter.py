@@ -0,0 +1,444 @@
+"""
+Cross-process rate limiting for Sora video submissions.
+
+SubmissionLimiter enforces, per model:
+- a requests-per-minute token bucket on POST /v1/videos
+- a cap on renders in flight at once
+
+State lives in a small SQLite database, so every generate_video.py,
+check_video.py or render_pipeline.py process on the machine draws from the
+same budget. Work over the limit waits in line instead of failing, and a 429
+blocks new submissions for every process until the server's Retry-After
+has passed.
+
+Usage:
+    limiter = get_submission_limiter()
+    job, slot = limiter.submit("sora-2", lambda: submit_video_job(prompt, "sora-2"))
+    ...poll the job...
+    limiter.release(slot)
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+from typing import Dict, Any, Optional, Tuple, Callable
+
+from metrics import get_metrics
+
+DEFAULT_DB_PATH = os.getenv("GLIMPSE_LIMITER_DB", os.path.join(".cache", "submission_limits.db"))
+
+# Requests per minute and renders in flight, per model
+DEFAULT_LIMITS = {
+    "sora-2": {"requests_per_minute": 20, "max_in_flight": 4},
+    "sora-2-pro": {"requests_per_minute": 10, "max_in_flight": 2},
+}
+
+# Token bucket capacity, in seconds of refill (how much burst is allowed)
+DEFAULT_BURST_SECONDS = 10.0
+
+# A slot with no heartbeat for this long is assumed abandoned and reclaimed
+DEFAULT_LEASE_SECONDS = 600.0
+
+# How often waiters re-check while every in-flight slot is taken
+SLOT_POLL_SECONDS = 2.0
+
+# Backoff after a 429 without a Retry-After hint: 2, 4, 8, ... seconds, capped
+MAX_PENALTY_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    model TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    refilled_at REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0,
+    strikes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS slots (
+    slot_id TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    video_id TEXT,
+    acquired_at REAL NOT NULL,
+    heartbeat_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_slots_model ON slots (model);
+"""
+
+
+def parse_limits(value: Optional[str]) -> Dict[str, Dict[str, int]]:
+    """
+    Parse limit overrides of the form "sora-2=20:4,sora-2-pro=10:2"
+    (model=requests_per_minute:max_in_flight).
+    """
+    limits = {}
+    for entry in (value or "").split(","):
+        if not entry.strip():
+            continue
+        model, _, spec = entry.strip().partition("=")
+        rpm, _, in_flight = spec.partition(":")
+        limits[model] = {"requests_per_minute": int(rpm), "max_in_flight": int(in_flight)}
+    return limits
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429
+
+
+class SubmissionLimiter:
+    """
+    Token bucket plus in-flight cap per model, shared across processes via SQLite.
+
+    Args:
+        path: SQLite database file shared by cooperating processes
+        limits: {model: {"requests_per_minute": int, "max_in_flight": int}}
+        burst_seconds: Bucket capacity in seconds of refill
+        lease_seconds: Reclaim slots without a heartbeat for this long
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH,
+                 limits: Optional[Dict[str, Dict[str, int]]] = None,
+                 burst_seconds: float = DEFAULT_BURST_SECONDS,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        self.path = path
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.burst_seconds = burst_seconds
+        self.lease_seconds = lease_seconds
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+        self._stats = {
+            "acquired": 0,
+            "released": 0,
+            "waits": 0,
+            "waited_seconds": 0.0,
+            "rate_limited": 0
+        }
+
+    # --- slots ---------------------------------------------------------------------
+
+    def try_acquire(self, model: str) -> Tuple[Optional[str], float, str]:
+        """
+        Take one request token and one in-flight slot if both are available.
+
+        Returns:
+            (slot_id, 0.0, "") on success, otherwise (None, seconds_to_wait, reason)
+        """
+        limit = self._limit(model)
+        rpm = limit["requests_per_minute"]
+        capacity = max(1.0, rpm * self.burst_seconds / 60.0)
+
+        with self._transaction() as conn:
+            now = time.time()
+            self._reclaim(conn, now)
+
+            bucket = conn.execute("SELECT * FROM buckets WHERE model = ?", (model,)).fetchone()
+            if bucket is None:
+                tokens, blocked_until = capacity, 0.0
+            else:
+                elapsed = max(now - bucket["refilled_at"], 0.0)
+                tokens = min(capacity, bucket["tokens"] + elapsed * rpm / 60.0)
+                blocked_until = bucket["blocked_until"]
+
+            if blocked_until > now:
+                return None, blocked_until - now, "rate limited by server"
+
+            in_flight = conn.execute("SELECT COUNT(*) FROM slots WHERE model = ?", (model,)).fetchone()[0]
+            if in_flight >= limit["max_in_flight"]:
+                return None, SLOT_POLL_SECONDS, f"{in_flight}/{limit['max_in_flight']} renders in flight"
+
+            if tokens < 1.0:
+                self._save_bucket(conn, model, tokens, now)
+                return None, (1.0 - tokens) * 60.0 / rpm, f"{rpm} requests/minute"
+
+            self._save_bucket(conn, model, tokens - 1.0, now)
+            slot_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO slots (slot_id, model, pid, acquired_at, heartbeat_at) VALUES (?, ?, ?, ?, ?)",
+                (slot_id, model, os.getpid(), now, now)
+            )
+
+        self._stats["acquired"] += 1
+        return slot_id, 0.0, ""
+
+    def acquire(self, model: str, timeout: Optional[float] = None,
+                on_wait: Optional[Callable[[float, str], None]] = None) -> str:
+        """
+        Block until a token and an in-flight slot are available for the model.
+
+        Args:
+            model: Sora model name
+            timeout: Give up (TimeoutError) after this many seconds
+            on_wait: Called with (seconds, reason) before each wait
+
+        Returns:
+            Slot ID to pass to attach/heartbeat/release
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            slot_id, wait, reason = self.try_acquire(model)
+            if slot_id is not None:
+                return slot_id
+            wait = self._bounded_wait(wait, deadline)
+            if on_wait is not None:
+                on_wait(wait, reason)
+            time.sleep(wait)
+
+    async def aacquire(self, model: str, timeout: Optional[float] = None,
+                       on_wait: Optional[Callable[[float, str], None]] = None) -> str:
+        """Async counterpart of acquire; waits without blocking the event loop."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            slot_id, wait, reason = await asyncio.to_thread(self.try_acquire, model)
+            if slot_id is not None:
+                return slot_id
+            wait = self._bounded_wait(wait, deadline)
+            if on_wait is not None:
+                on_wait(wait, reason)
+            await asyncio.sleep(wait)
+
+    def attach(self, slot_id: str, video_id: str):
+        """Record which video job holds a slot."""
+        with self._transaction() as conn:
+            conn.execute("UPDATE slots SET video_id = ?, heartbeat_at = ? WHERE slot_id = ?",
+                         (video_id, time.time(), slot_id))
+
+    def heartbeat(self, slot_id: Optional[str]):
+        """Keep a long-running render's slot from being reclaimed."""
+        if slot_id is None:
+            return
+        with self._transaction() as conn:
+            conn.execute("UPDATE slots SET heartbeat_at = ? WHERE slot_id = ?", (time.time(), slot_id))
+
+    def release(self, slot_id: Optional[str]):
+        """Free a slot once its render has finished (or its submission failed)."""
+        if slot_id is None:
+            return
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM slots WHERE slot_id = ?", (slot_id,))
+        self._stats["released"] += 1
+
+    # --- 429 handling --------------------------------------------------------------
+
+    def penalize(self, model: str, retry_after: Optional[float] = None) -> float:
+        """
+        Block new submissions for a model after a 429, in every process.
+
+        Args:
+            model: Sora model name
+            retry_after: Server Retry-After hint in seconds, if any
+
+        Returns:
+            Seconds submissions are blocked for
+        """
+        self._stats["rate_limited"] += 1
+        get_metrics().inc("glimpse_retries_total", stage="submit", reason="429")
+        with self._transaction() as conn:
+            now = time.time()
+            bucket = conn.execute("SELECT * FROM buckets WHERE model = ?", (model,)).fetchone()
+            strikes = (bucket["strikes"] if bucket is not None else 0) + 1
+            delay = retry_after if retry_after is not None else min(2.0 ** strikes, MAX_PENALTY_SECONDS)
+            blocked_until = max(now + delay, bucket["blocked_until"] if bucket is not None else 0.0)
+            conn.execute(
+                """
+                INSERT INTO buckets (model, tokens, refilled_at, blocked_until, strikes)
+                VALUES (?, 0, ?, ?, ?)
+                ON CONFLICT(model) DO UPDATE SET
+                    tokens = 0, refilled_at = excluded.refilled_at,
+                    blocked_until = excluded.blocked_until, strikes = excluded.strikes
+                """,
+                (model, now, blocked_until, strikes)
+            )
+        return blocked_until - now
+
+    def _clear_strikes(self, model: str):
+        with self._transaction() as conn:
+            conn.execute("UPDATE buckets SET strikes = 0 WHERE model = ?", (model,))
+
+    # --- submit helpers ------------------------------------------------------------
+
+    def submit(self, model: str, submit_fn: Callable[[], Dict[str, Any]],
+               on_wait: Optional[Callable[[float, str], None]] = None) -> Tuple[Dict[str, Any], str]:
+        """
+        Run submit_fn once a slot is free, retrying (queued, not failed) on 429.
+
+        The slot stays held after a successful submission; release it when the
+        render reaches a terminal status.
+
+        Args:
+            model: Sora model name
+            submit_fn: Performs the POST and returns the job object
+            on_wait: Called with (seconds, reason) whenever the submission has to wait
+
+        Returns:
+            (job, slot_id)
+        """
+        queued = 0.0
+        while True:
+            started = time.perf_counter()
+            slot_id = self.acquire(model, on_wait=on_wait)
+            queued += time.perf_counter() - started
+            try:
+                job = submit_fn()
+            except Exception as e:
+                self.release(slot_id)
+                if not _is_rate_limited(e):
+                    raise
+                wait = self.penalize(model, getattr(e, "retry_after", None))
+                if on_wait is not None:
+                    on_wait(wait, "HTTP 429 from server")
+                continue
+            return self._submitted(model, job, slot_id, queued)
+
+    async def asubmit(self, model: str, submit_fn: Callable[[], Dict[str, Any]],
+                      on_wait: Optional[Callable[[float, str], None]] = None) -> Tuple[Dict[str, Any], str]:
+        """Async counterpart of submit; submit_fn is a blocking call run in a thread."""
+        queued = 0.0
+        while True:
+            started = time.perf_counter()
+            slot_id = await self.aacquire(model, on_wait=on_wait)
+            queued += time.perf_counter() - started
+            try:
+                job = await asyncio.to_thread(submit_fn)
+            except Exception as e:
+                self.release(slot_id)
+                if not _is_rate_limited(e):
+                    raise
+                wait = self.penalize(model, getattr(e, "retry_after", None))
+                if on_wait is not None:
+                    on_wait(wait, "HTTP 429 from server")
+                continue
+            return self._submitted(model, job, slot_id, queued)
+
+    def _submitted(self, model: str, job: Dict[str, Any], slot_id: str,
+                   queued: float) -> Tuple[Dict[str, Any], str]:
+        # Time spent waiting for tokens/slots, excluding the submit calls themselves
+        get_metrics().observe_stage("queue_wait", queued)
+        self._clear_strikes(model)
+        if job.get("id"):
+            self.attach(slot_id, job["id"])
+        return job, slot_id
+
+    # --- metrics -------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """This process's wait/429 counters plus the shared per-model state."""
+        now = time.time()
+        with self._lock:
+            buckets = {row["model"]: row for row in self._conn.execute("SELECT * FROM buckets")}
+            in_flight = dict(self._conn.execute(
+                "SELECT model, COUNT(*) FROM slots GROUP BY model"
+            ).fetchall())
+        models = {}
+        for model, limit in self.limits.items():
+            bucket = buckets.get(model)
+            models[model] = {
+                **limit,
+                "in_flight": in_flight.get(model, 0),
+                "blocked_for_seconds": round(max(bucket["blocked_until"] - now, 0.0), 1) if bucket else 0.0
+            }
+        return {**self._stats, "waited_seconds": round(self._stats["waited_seconds"], 1), "models": models}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- internals -----------------------------------------------------------------
+
+    def _limit(self, model: str) -> Dict[str, int]:
+        limit = self.limits.get(model)
+        if limit is None:
+            raise ValueError(f"No submission limits configured for model: {model}")
+        return limit
+
+    def _bounded_wait(self, wait: float, deadline: Optional[float]) -> float:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Timed out waiting for a video submission slot")
+            wait = min(wait, remaining)
+        self._stats["waits"] += 1
+        self._stats["waited_seconds"] += wait
+        return wait
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+    def _save_bucket(self, conn: sqlite3.Connection, model: str, tokens: float, now: float):
+        conn.execute(
+            """
+            INSERT INTO buckets (model, tokens, refilled_at) VALUES (?, ?, ?)
+            ON CONFLICT(model) DO UPDATE SET tokens = excluded.tokens, refilled_at = excluded.refilled_at
+            """,
+            (model, tokens, now)
+        )
+
+    def _reclaim(self, conn: sqlite3.Connection, now: float):
+        # Slots whose owner stopped heartbeating, or whose process has exited
+        conn.execute("DELETE FROM slots WHERE heartbeat_at < ?", (now - self.lease_seconds,))
+        for row in conn.execute("SELECT slot_id, pid FROM slots").fetchall():
+            if not _process_alive(row["pid"]):
+                conn.execute("DELETE FROM slots WHERE slot_id = ?", (row["slot_id"],))
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT under the in-process lock (serializes across processes too)."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid() or os.name == "nt":
+        # On Windows os.kill(pid, 0) terminates the process; rely on the heartbeat lease there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but owned by another user
+        return True
+    return True
+
+
+_default_limiter = None
+_default_lock = threading.Lock()
+
+
+def get_submission_limiter() -> SubmissionLimiter:
+    """Return the process-wide limiter (limits overridable via GLIMPSE_SUBMIT_LIMITS)."""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = SubmissionLimiter(limits=parse_limits(os.getenv("GLIMPSE_SUBMIT_LIMITS")))
+        return _default_limiter
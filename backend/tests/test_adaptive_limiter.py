@@ -0,0 +1,35 @@
+import threading
+import time
+
+from adaptive_limiter import AdaptiveLimiter
+
+
+def test_serial_calls_do_not_grow_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=4, max_limit=64)
+    for _ in range(200):
+        limiter.call(lambda: None)
+    stats = limiter.stats()
+    assert stats["peak_in_flight"] == 1
+    assert stats["limit"] == 4
+
+
+def test_saturated_calls_grow_the_limit():
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=64)
+
+    def worker():
+        for _ in range(20):
+            limiter.call(lambda: time.sleep(0.002))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert limiter.stats()["limit"] > 2
+
+
+def test_no_headroom_while_retry_after_holds_calls_back():
+    limiter = AdaptiveLimiter(initial_limit=4)
+    assert limiter.has_headroom()
+    limiter.release(limiter.acquire(), overloaded=True, retry_after=60)
+    assert not limiter.has_headroom()
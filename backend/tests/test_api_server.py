@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from api_server import ApiServer, HTTPError
+
+
+def _read(raw: bytes):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await ApiServer(service=None)._read_request(reader)
+    return asyncio.run(run())
+
+
+def test_request_with_json_body():
+    body = b'{"product": "a teal bottle"}'
+    raw = b"POST /api/concepts HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    assert _read(raw) == ("POST", "/api/concepts", {"product": "a teal bottle"})
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5", b"1e3"])
+def test_invalid_content_length_is_a_bad_request(length):
+    with pytest.raises(HTTPError) as error:
+        _read(b"POST /api/concepts HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}")
+    assert error.value.status == 400
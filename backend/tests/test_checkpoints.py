@@ -0,0 +1,31 @@
+import time
+
+from checkpoints import CheckpointStore
+
+
+def test_completed_run_is_deleted(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.start_run("run_1", "a one-liner", "two_stage")
+    store.save_stage("run_1", "creative_director", {"status": "success"})
+    store.finish_run("run_1", "completed")
+    assert store.get_run("run_1") is None
+    assert store.load_stage("run_1", "creative_director") is None
+
+
+def test_failed_run_is_kept_until_it_expires(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    store = CheckpointStore(path)
+    store.start_run("run_1", "a one-liner", "two_stage")
+    store.save_stage("run_1", "creative_director", {"status": "success"})
+    store.finish_run("run_1", "failed", "scriptwriter", "timeout")
+    store.close()
+
+    store = CheckpointStore(path, retention_seconds=3600)
+    assert store.get_run("run_1")["stages_checkpointed"] == ["creative_director"]
+    store.close()
+
+    time.sleep(0.01)
+    store = CheckpointStore(path, retention_seconds=0)
+    assert store.get_run("run_1") is None
+    assert store.load_stage("run_1", "creative_director") is None
+
@@ -0,0 +1,41 @@
+import time
+
+from hedging import HedgePolicy
+from metrics import MetricsRegistry
+
+
+def _slow_request(calls):
+    def request():
+        calls.append(time.monotonic())
+        time.sleep(0.2)
+        return "done"
+    return request
+
+
+def test_slow_request_is_hedged_after_the_deadline():
+    calls = []
+    policy = HedgePolicy("test", initial_deadline=0.05, metrics=MetricsRegistry())
+    result, info = policy.call(_slow_request(calls))
+    assert result == "done"
+    assert info["hedged"] is True
+    assert len(calls) == 2
+
+
+def test_hedge_is_held_back_when_not_allowed():
+    calls = []
+    policy = HedgePolicy("test", initial_deadline=0.05, metrics=MetricsRegistry())
+    result, info = policy.call(_slow_request(calls), allow=lambda: False)
+    assert result == "done"
+    assert info["hedged"] is False
+    assert len(calls) == 1
+    assert policy.stats()["held_back"] == 1
+
+
+def test_zero_budget_never_hedges():
+    calls = []
+    policy = HedgePolicy("test", budget=0, initial_deadline=0.05, metrics=MetricsRegistry())
+    result, info = policy.call(_slow_request(calls))
+    assert result == "done"
+    assert info["hedged"] is False
+    assert len(calls) == 1
+    assert policy.stats()["hedge_rate"] == 0.0
@@ -0,0 +1,34 @@
+from prompt_budget import MIN_TRUNCATED_CHARS, count_tokens, serialize_spec
+
+
+def _spec(text: str):
+    return {
+        "product_name": text[:20],
+        "visual_style": text,
+        "key_scenes": [text, text, text],
+        "target_emotion": text,
+        "color_palette": text,
+    }
+
+
+def test_spec_without_spaces_terminates():
+    # CJK text has no spaces to cut at; shortening must still make progress
+    text = "这是一款智能咖啡杯能够让咖啡一直保持温暖" * 40
+    serialized, info = serialize_spec(_spec(text), token_budget=700)
+    assert info["final_tokens"] == count_tokens(serialized)
+    assert info["truncated_fields"]
+
+
+def test_long_url_is_cut_to_budget():
+    text = "https://example.com/" + "a1b2c3d4" * 300
+    serialized, info = serialize_spec({"visual_style": text}, token_budget=100)
+    assert info["final_tokens"] <= 100
+    assert info["truncated_fields"] == ["visual_style"]
+
+
+def test_unshrinkable_spec_stops_over_budget():
+    text = "无" * MIN_TRUNCATED_CHARS
+    spec = {f"field_{i}": text for i in range(30)}
+    serialized, info = serialize_spec(spec, token_budget=10)
+    assert info["final_tokens"] > 10
+    assert serialized.count("无") == 30 * MIN_TRUNCATED_CHARS
@@ -0,0 +1,19 @@
+import glob
+import os
+
+from prompt_compactor import _timestamps_preserved, benchmark
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "examples", "*.txt")))
+
+
+def test_lost_timestamp_is_detected():
+    original = "- 0.0–1.5s: wide shot\n- 1.6–3.0s: close-up\n- 3.1–5.0s: logo"
+    assert _timestamps_preserved(original, original)
+    assert not _timestamps_preserved(original, "- 0.0–1.5s: wide shot\n- 3.1–5.0s: logo")
+
+
+def test_examples_keep_every_timestamp_and_narration_line():
+    for result in benchmark(EXAMPLES, 5000, None):
+        assert result["within_budget"], result["path"]
+        assert result["narration_preserved"], result["path"]
+        assert result["timestamps_preserved"], result["path"]
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+import render_pipeline
+import video_poller
+from job_store import VideoJobStore
+from poll_schedule import AdaptivePollSchedule
+from render_pipeline import RenderPipeline
+from submission_limiter import SubmissionLimiter
+from video_poller import VideoJobPoller
+
+
+def _fast_schedule():
+    return AdaptivePollSchedule(min_interval=0.001, max_interval=0.001, initial_interval=0.001)
+
+
+def test_identical_concurrent_renders_submit_once(monkeypatch, tmp_path):
+    submitted, downloaded = [], []
+
+    def submit_video_job(prompt, model, duration, size, transport=None):
+        # Slow enough that every item reaches the render stage before the job row exists
+        time.sleep(0.2)
+        submitted.append(prompt)
+        return {"id": f"video_{len(submitted)}", "status": "queued"}
+
+    def download_video(video_id, output_path=None, transport=None, output_dir=None):
+        time.sleep(0.05)
+        downloaded.append(video_id)
+        path = tmp_path / output_dir / f"{video_id}.mp4"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(b"mp4")
+        return {"path": str(path), "bytes": 3, "sha256": "0" * 64, "mb_per_second": 1.0,
+                "resumes": 0, "segments": 1}
+
+    monkeypatch.setattr(render_pipeline, "submit_video_job", submit_video_job)
+    monkeypatch.setattr(render_pipeline, "download_video", download_video)
+    monkeypatch.setattr(video_poller, "get_video_status",
+                        lambda video_id, transport=None: {"id": video_id, "status": "completed", "progress": 100})
+
+    async def run():
+        pipeline = RenderPipeline(
+            model="sora-2", transport=object(), concept_pipeline=object(),
+            store=VideoJobStore(str(tmp_path / "jobs.db")),
+            limiter=SubmissionLimiter(str(tmp_path / "limits.db")),
+            poller=VideoJobPoller(transport=object(), schedule_factory=_fast_schedule),
+            output_dir="videos"
+        )
+        items = [{"concept": {"final_prompt_for_video_generation": "A teal bottle on a desk"},
+                  "timings": {}, "status": "scripted"} for _ in range(3)]
+        return await asyncio.gather(*(pipeline.render_one(item) for item in items)), pipeline
+
+    items, pipeline = asyncio.run(run())
+    assert [item["status"] for item in items] == ["success"] * 3
+    assert len(submitted) == 1
+    assert downloaded == ["video_1"]
+    assert {item["video_path"] for item in items} == {str(tmp_path / "videos" / "video_1.mp4")}
+    assert {item["video_id"] for item in items} == {"video_1"}
+    assert pipeline.cache_hits["in_flight"] == 2
@@ -0,0 +1,105 @@
+import asyncio
+
+import video_poller
+from generate_video import VideoAPIError
+from poll_schedule import AdaptivePollSchedule
+from video_poller import VideoJobPoller
+
+
+def _fast_schedule():
+    return AdaptivePollSchedule(min_interval=0.001, max_interval=0.001, initial_interval=0.001)
+
+
+def _statuses(monkeypatch, responses):
+    responses = iter(responses)
+
+    def get_video_status(video_id, transport=None):
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(video_poller, "get_video_status", get_video_status)
+
+
+def test_failing_callbacks_do_not_stop_polling(monkeypatch):
+    _statuses(monkeypatch, [{"status": "in_progress", "progress": 50},
+                            {"status": "completed", "progress": 100}])
+
+    def broken(info):
+        raise RuntimeError("database is locked")
+
+    async def run():
+        poller = VideoJobPoller(transport=object(), schedule_factory=_fast_schedule)
+        info = await asyncio.wait_for(poller.watch("video_1", callback=broken, on_update=broken), timeout=5)
+        return info, poller.stats()
+
+    info, stats = asyncio.run(run())
+    assert info["status"] == "completed"
+    assert stats["callback_errors"] == 3
+
+
+def test_rate_limited_polls_do_not_fail_the_job(monkeypatch):
+    rate_limited = [VideoAPIError("Failed to check video status", 429, retry_after=0.001) for _ in range(10)]
+    _statuses(monkeypatch, rate_limited + [{"status": "completed", "progress": 100}])
+
+    async def run():
+        poller = VideoJobPoller(transport=object(), max_errors=2, schedule_factory=_fast_schedule)
+        info = await asyncio.wait_for(poller.watch("video_1"), timeout=5)
+        return info, poller.stats()
+
+    info, stats = asyncio.run(run())
+    assert info["status"] == "completed"
+    assert stats["rate_limited"] == 10
+
+
+def test_repeated_server_errors_fail_the_job(monkeypatch):
+    _statuses(monkeypatch, [VideoAPIError("Failed to check video status", 500) for _ in range(10)])
+
+    async def run():
+        poller = VideoJobPoller(transport=object(), max_errors=2, schedule_factory=_fast_schedule)
+        return await asyncio.wait_for(poller.watch("video_1"), timeout=5)
+
+    try:
+        asyncio.run(run())
+    except VideoAPIError as e:
+        assert e.status_code == 500
+    else:
+        raise AssertionError("expected the job to fail")
+
+
+def test_permanent_forbidden_fails_the_job(monkeypatch):
+    monkeypatch.setattr(video_poller, "FORBIDDEN_RETRY_SECONDS", 0.001)
+    _statuses(monkeypatch, [VideoAPIError("Failed to check video status", 403) for _ in range(10)])
+
+    async def run():
+        poller = VideoJobPoller(transport=object(), max_errors=2, schedule_factory=_fast_schedule)
+        try:
+            await asyncio.wait_for(poller.watch("video_1"), timeout=5)
+        finally:
+            assert poller.stats()["active_jobs"] == 0
+
+    try:
+        asyncio.run(run())
+    except VideoAPIError as e:
+        assert e.status_code == 403
+    else:
+        raise AssertionError("expected the job to fail")
+
+
+def test_unexpected_error_fails_the_job(monkeypatch):
+    _statuses(monkeypatch, [RuntimeError("OPENAI_API_KEY not found in .env file")])
+
+    async def run():
+        poller = VideoJobPoller(transport=object(), schedule_factory=_fast_schedule)
+        try:
+            await asyncio.wait_for(poller.watch("video_1", delay=0), timeout=5)
+        finally:
+            assert poller.stats()["active_jobs"] == 0
+
+    try:
+        asyncio.run(run())
+    except RuntimeError as e:
+        assert "OPENAI_API_KEY" in str(e)
+    else:
+        raise AssertionError("expected the job to fail")
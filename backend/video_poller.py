@@ -0,0 +1,280 @@
+"""
+Multi-job Sora poller.
+
+One VideoJobPoller supervises any number of outstanding video jobs from a
+single asyncio event loop. Each job gets its own AdaptivePollSchedule
+(slow early, tighter near completion, jittered), Retry-After hints are
+honored, and a per-job future resolves when the job reaches a terminal
+status. This lets one process watch dozens of renders at once instead of
+running one blocking poll loop per render.
+
+Usage:
+    poller = VideoJobPoller()
+    info = await poller.watch(video_id)   # resolves with the final job object
+"""
+
+import sys
+import heapq
+import asyncio
+import itertools
+from typing import Dict, Any, Optional, Callable, List
+
+import requests
+
+from generate_video import VideoAPIError, get_video_status
+from http_transport import HTTPTransport, get_transport
+from poll_schedule import AdaptivePollSchedule
+from metrics import get_metrics
+
+TERMINAL_STATUSES = ("completed", "failed", "canceled")
+
+# (429s only slow polling down and never count; 403s count but are retried slowly)
+# (429s and 403s only slow polling down and never count)
+DEFAULT_MAX_ERRORS = 5
+
+# Status checks allowed in flight at once across all jobs
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+
+# Minimum wait after a 403 (organization verification can take a while to propagate)
+FORBIDDEN_RETRY_SECONDS = 10.0
+
+
+class _WatchedJob:
+    """Bookkeeping for one job tracked by the poller."""
+
+    def __init__(self, video_id: str, future: asyncio.Future, schedule: AdaptivePollSchedule):
+        self.video_id = video_id
+        self.future = future
+        self.schedule = schedule
+        self.callbacks = []
+        self.update_callbacks = []
+        self.errors = 0
+        self.polls = 0
+        self.last_info = None
+
+
+class VideoJobPoller:
+    """
+    Tracks many Sora jobs and polls each on its own adaptive schedule.
+
+    Args:
+        transport: Pooled HTTP transport used for status checks
+        max_concurrent_requests: Status checks allowed in flight at once
+        max_errors: Consecutive failures before a job's future raises
+        schedule_factory: Callable returning a fresh AdaptivePollSchedule per job
+    """
+
+    def __init__(self, transport: Optional[HTTPTransport] = None,
+                 max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+                 max_errors: int = DEFAULT_MAX_ERRORS,
+                 schedule_factory: Callable[[], AdaptivePollSchedule] = AdaptivePollSchedule):
+        self.transport = transport or get_transport()
+        self.max_concurrent_requests = max_concurrent_requests
+        self.max_errors = max_errors
+        self.schedule_factory = schedule_factory
+
+        self._jobs = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._wakeup = None
+        self._semaphore = None
+        self._runner = None
+        self._poll_tasks = set()
+        self._stats = {
+            "polls": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "completed": 0,
+            "failed": 0,
+            "callback_errors": 0
+        }
+
+    def watch(self, video_id: str,
+              callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+              on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+              delay: float = 0.0) -> asyncio.Future:
+        """
+        Start tracking a job (or attach to an already tracked one).
+
+        Must be called from within the running event loop.
+
+        Args:
+            video_id: Sora video job ID
+            callback: Called with the final job object when the job finishes
+            on_update: Called with the job object after every successful status check
+            delay: Seconds before the first status check
+
+        Returns:
+            Future resolving to the final job object (status completed, failed or canceled)
+        """
+        loop = asyncio.get_running_loop()
+        self._ensure_running(loop)
+
+        job = self._jobs.get(video_id)
+        if job is None:
+            job = _WatchedJob(video_id, loop.create_future(), self.schedule_factory())
+            self._jobs[video_id] = job
+            self._schedule(job, delay)
+
+        if callback is not None:
+            job.callbacks.append(callback)
+        if on_update is not None:
+            job.update_callbacks.append(on_update)
+            if job.last_info is not None:
+                self._notify(job, on_update, job.last_info)
+        return job.future
+
+    def unwatch(self, video_id: str):
+        """Stop tracking a job; its future is cancelled."""
+        job = self._jobs.pop(video_id, None)
+        if job is not None and not job.future.done():
+            job.future.cancel()
+
+    def remove_listener(self, video_id: str, on_update: Callable[[Dict[str, Any]], None]) -> int:
+        """
+        Detach an on_update callback from a tracked job.
+
+        Returns:
+            Callbacks the job still has (0 means nobody else is listening)
+        """
+        job = self._jobs.get(video_id)
+        if job is None:
+            return 0
+        if on_update in job.update_callbacks:
+            job.update_callbacks.remove(on_update)
+        return len(job.callbacks) + len(job.update_callbacks)
+
+    def last_status(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent job object seen for a tracked job, if any."""
+        job = self._jobs.get(video_id)
+        return job.last_info if job is not None else None
+
+    @property
+    def active_jobs(self) -> List[str]:
+        """IDs of jobs still being polled."""
+        return list(self._jobs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Poll, error and completion counters."""
+        return {**self._stats, "active_jobs": len(self._jobs)}
+
+    async def close(self):
+        """Stop polling and cancel every outstanding future."""
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+        for task in list(self._poll_tasks):
+            task.cancel()
+        for video_id in list(self._jobs):
+            self.unwatch(video_id)
+
+    def _ensure_running(self, loop: asyncio.AbstractEventLoop):
+        if self._runner is None or self._runner.done():
+            self._wakeup = asyncio.Event()
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._runner = loop.create_task(self._run())
+
+    def _schedule(self, job: _WatchedJob, delay: float):
+        due = asyncio.get_running_loop().time() + delay
+        heapq.heappush(self._heap, (due, next(self._sequence), job.video_id))
+        self._wakeup.set()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            due, _, video_id = self._heap[0]
+            delay = due - loop.time()
+            if delay > 0:
+                # Sleep until the earliest job is due, or until a new job is scheduled
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            job = self._jobs.get(video_id)
+            if job is None or job.future.done():
+                continue
+
+            task = loop.create_task(self._poll(job))
+            self._poll_tasks.add(task)
+            task.add_done_callback(self._poll_tasks.discard)
+
+    async def _poll(self, job: _WatchedJob):
+        retry_after = None
+        async with self._semaphore:
+            try:
+                info = await asyncio.to_thread(get_video_status, job.video_id, self.transport)
+            except VideoAPIError as e:
+                info = None
+                retry_after = e.retry_after
+                if e.status_code == 429:
+                    self._stats["rate_limited"] += 1
+                elif e.status_code == 403:
+                    retry_after = max(retry_after or 0.0, FORBIDDEN_RETRY_SECONDS)
+                error = e
+                # Rate limiting says "wait", not "this job is broken"; a 403 that outlasts
+                # max_errors slow retries is permanent (e.g. another org's video)
+                backing_off = e.status_code == 429
+            except (requests.RequestException, OSError) as e:
+                info = None
+                error = e
+                backing_off = False
+            except Exception as e:
+                # Not transient (e.g. no API key): fail the job now rather than kill this task
+                if self._jobs.get(job.video_id) is job:
+                    self._jobs.pop(job.video_id, None)
+                    self._stats["errors"] += 1
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                return
+
+        if self._jobs.get(job.video_id) is not job:
+            return
+
+        if info is None:
+            self._stats["errors"] += 1
+            if not backing_off:
+                job.errors += 1
+            if job.errors > self.max_errors:
+                self._jobs.pop(job.video_id, None)
+                if not job.future.done():
+                    job.future.set_exception(error)
+                return
+            reason = str(error.status_code) if isinstance(error, VideoAPIError) else "network"
+            get_metrics().inc("glimpse_retries_total", stage="poll", reason=reason)
+            self._schedule(job, job.schedule.next_interval(retry_after=retry_after))
+            return
+
+        self._stats["polls"] += 1
+        job.errors = 0
+        job.polls += 1
+        job.last_info = info
+        job.schedule.observe(info.get("progress"))
+        for on_update in list(job.update_callbacks):
+            self._notify(job, on_update, info)
+
+        if info.get("status") in TERMINAL_STATUSES:
+            self._jobs.pop(job.video_id, None)
+            self._stats["completed" if info["status"] == "completed" else "failed"] += 1
+            if not job.future.done():
+                job.future.set_result(info)
+            for callback in job.callbacks:
+                self._notify(job, callback, info)
+            return
+
+        self._schedule(job, job.schedule.next_interval())
+
+    def _notify(self, job: _WatchedJob, callback: Callable[[Dict[str, Any]], None], info: Dict[str, Any]):
+        # A failing callback (e.g. a job store write) must not stop the job from being polled
+        try:
+            callback(info)
+        except Exception as e:
+            self._stats["callback_errors"] += 1
+            print(f"⚠️  Status callback for {job.video_id} failed: {type(e).__name__}: {e}", file=sys.stderr)